@@ -0,0 +1,1348 @@
+/*
+ * Shared inline scripts, extracted by tools/extract_inline_scripts.py — do not edit.
+ * Each chunk runs only on pages that list it in this script tag's data-chunks.
+ */
+var __inlineChunks = ' ' + ((document.currentScript && document.currentScript.getAttribute('data-chunks')) || '') + ' ';
+function __inlineRun(id) { return __inlineChunks.indexOf(' ' + id + ' ') !== -1; }
+function __inlineFail(e) { setTimeout(function() { throw e; }); }
+
+// @chunk 70da7c3078
+if (__inlineRun("70da7c3078")) try {
+        (function() {
+            var btn = document.querySelector('.burger-btn');
+            var nav = document.getElementById('navMenu');
+            if (!btn || !nav) return;
+            btn.addEventListener('click', function() {
+                var open = nav.classList.toggle('nav-open');
+                btn.setAttribute('aria-expanded', open);
+                btn.textContent = open ? '\u2715' : '\u2630';
+            });
+            nav.addEventListener('click', function(e) {
+                if (e.target.tagName === 'A') {
+                    nav.classList.remove('nav-open');
+                    btn.setAttribute('aria-expanded', 'false');
+                    btn.textContent = '\u2630';
+                }
+            });
+            document.addEventListener('keydown', function(e) {
+                if (e.key === 'Escape' && nav.classList.contains('nav-open')) {
+                    nav.classList.remove('nav-open');
+                    btn.setAttribute('aria-expanded', 'false');
+                    btn.textContent = '\u2630';
+                    btn.focus();
+                }
+            });
+        })();
+    } catch (e) { __inlineFail(e); }
+
+// @chunk ca80d362d1
+if (__inlineRun("ca80d362d1")) try {
+        // Step 1: service selector
+        (function() {
+            var btns = document.querySelectorAll('.selector-btn');
+            var form = document.getElementById('bookingForm');
+            var serviceField = document.getElementById('serviceField');
+            var indicator = document.getElementById('bookingStepIndicator');
+            function trackBookingReveal(appliance) {
+                if (typeof gtag !== 'function') return;
+                var srcField = form ? form.querySelector('[name="source"]') : null;
+                var params = {
+                    appliance: appliance || '',
+                    source: srcField ? srcField.value : 'website-denver',
+                    source_page: location.pathname || '/',
+                    form_type: (form && form.getAttribute('data-form-type')) || 'website_form'
+                };
+                gtag('event', 'booking_step1_selected', params);
+                gtag('event', 'booking_form_view', params);
+            }
+            btns.forEach(function(btn) {
+                btn.addEventListener('click', function() {
+                    var formWasHidden = !form || form.style.display === 'none';
+                    btns.forEach(function(b) { b.classList.remove('selected'); });
+                    btn.classList.add('selected');
+                    serviceField.value = btn.getAttribute('data-service');
+                    if (indicator) indicator.textContent = 'Step 2 of 2 \u2014 Almost done';
+                    form.style.display = '';
+                    document.body.classList.add('booking-form-active');
+                    if (formWasHidden) trackBookingReveal(btn.getAttribute('data-service'));
+                    if (!document.getElementById('backToStep1')) {
+                        var back = document.createElement('button');
+                        back.type = 'button';
+                        back.id = 'backToStep1';
+                        back.className = 'back-to-step1';
+                        back.textContent = '\u2190 Change appliance';
+                        back.addEventListener('click', function() {
+                            form.style.display = 'none';
+                            if (indicator) indicator.textContent = 'Step 1 of 2 \u2014 Select your appliance';
+                            document.body.classList.remove('booking-form-active');
+                            back.style.display = 'none';
+                        });
+                        form.parentNode.insertBefore(back, form);
+                    } else {
+                        document.getElementById('backToStep1').style.display = '';
+                    }
+                    form.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
+                });
+            });
+        })();
+
+        (function() {
+            var submitted = false;
+            var form = document.getElementById("bookingForm");
+            var iframe = document.querySelector('iframe[name="hidden_iframe"]');
+            if (!form || !iframe) return;
+            form.addEventListener("submit", function(e) {
+                var phoneInput = form.querySelector('[name="phone"]');
+                var raw = phoneInput ? phoneInput.value : '';
+                var d = String(raw || '').replace(/\D/g, '');
+                if (d.length === 11 && d.charAt(0) === '1') d = d.substring(1);
+                var valid = d.length === 10 && !/^(\d)\1{9}$/.test(d) && /^[2-9]\d{2}[2-9]\d{6}$/.test(d);
+                if (!valid) {
+                    e.preventDefault();
+                    e.stopImmediatePropagation();
+                    var err = document.getElementById('phone-error');
+                    if (!err) {
+                        err = document.createElement('div');
+                        err.id = 'phone-error';
+                        err.style.cssText = 'color:#dc2626;font-size:0.875rem;margin-top:0.25rem;';
+                        err.textContent = 'Please enter a valid US phone number.';
+                        if (phoneInput && phoneInput.parentNode) phoneInput.parentNode.insertBefore(err, phoneInput.nextSibling);
+                    }
+                    err.style.display = 'block';
+                    if (phoneInput) phoneInput.focus();
+                    return false;
+                }
+                var existingErr = document.getElementById('phone-error');
+                if (existingErr) existingErr.style.display = 'none';
+                submitted = true;
+                var btn = form.querySelector("button[type=submit]");
+                if (btn) { btn.disabled = true; btn.innerText = "Sending..."; }
+            });
+            iframe.addEventListener("load", function() {
+                if (!submitted) return;
+                submitted = false;
+                sessionStorage.setItem('ec_name', form.querySelector('[name="name"]').value || '');
+                sessionStorage.setItem('ec_phone', form.querySelector('[name="phone"]').value || '');
+                sessionStorage.setItem('lead_submitted', '1');
+                window.location.href = '/thank-you.html';
+            });
+        })();
+
+
+        // Burger menu
+        // Inline address autocomplete (Place Autocomplete Data API). The visible
+        // #address input is the only source of truth and posts directly. Google
+        // suggestions are optional assistance; if Google is unavailable, manual
+        // typing works normally and is never blocked.
+        (function() {
+            var input = document.getElementById('address');
+            var box = document.getElementById('addressSuggestions');
+            var placeIdField = document.getElementById('place_id');
+            var zipField = document.getElementById('zip');
+            var cityField = document.getElementById('city');
+            var stateField = document.getElementById('state');
+            if (!input || !box) return;
+
+            function clearMetadata() {
+                if (placeIdField) placeIdField.value = '';
+                if (zipField) zipField.value = '';
+                if (cityField) cityField.value = '';
+                if (stateField) stateField.value = '';
+            }
+            function hideSuggestions() {
+                box.hidden = true;
+                box.innerHTML = '';
+                activeIndex = -1;
+            }
+
+            // No Google available -> input still fully functional; just no suggestions.
+            if (!(window.google && google.maps && google.maps.importLibrary)) return;
+
+            var debounceTimer = null;
+            var sessionToken = null;
+            var suggestionSeq = 0;
+            var activeIndex = -1;
+            var suppressNextInput = false;
+
+            google.maps.importLibrary('places').then(function(places) {
+                var AutocompleteSuggestion = places.AutocompleteSuggestion;
+                var AutocompleteSessionToken = places.AutocompleteSessionToken;
+                if (!AutocompleteSuggestion || !AutocompleteSessionToken) return;
+
+                function rows() {
+                    return box.querySelectorAll('.address-suggestion');
+                }
+                function setActive(i) {
+                    var r = rows();
+                    if (!r.length) { activeIndex = -1; return; }
+                    if (i < 0) i = r.length - 1;
+                    if (i >= r.length) i = 0;
+                    activeIndex = i;
+                    for (var j = 0; j < r.length; j++) {
+                        if (j === activeIndex) r[j].classList.add('active');
+                        else r[j].classList.remove('active');
+                    }
+                }
+
+                function predictionText(prediction) {
+                    try {
+                        if (prediction && prediction.text && typeof prediction.text.text === 'string') {
+                            return prediction.text.text;
+                        }
+                    } catch (e) {}
+                    return '';
+                }
+
+                async function selectSuggestion(suggestion) {
+                    var prediction = suggestion && suggestion.placePrediction;
+                    if (!prediction) return;
+                    // Invalidate any in-flight prediction requests.
+                    suggestionSeq += 1;
+                    try {
+                        var place = prediction.toPlace();
+                        await place.fetchFields({ fields: ['formattedAddress', 'addressComponents', 'id'] });
+                        suppressNextInput = true;
+                        input.value = place.formattedAddress || input.value;
+                        var comps = place.addressComponents || [];
+                        var zip = '', city = '', state = '';
+                        comps.forEach(function(c) {
+                            var t = c.types || [];
+                            if (t.indexOf('postal_code') !== -1) zip = c.longText || zip;
+                            if (t.indexOf('locality') !== -1) city = c.longText || city;
+                            if (!city && t.indexOf('sublocality_level_1') !== -1) city = c.longText || city;
+                            if (!city && t.indexOf('sublocality') !== -1) city = c.longText || city;
+                            if (t.indexOf('administrative_area_level_1') !== -1) state = c.shortText || state;
+                        });
+                        if (placeIdField) placeIdField.value = place.id || '';
+                        if (zipField) zipField.value = zip;
+                        if (cityField) cityField.value = city;
+                        if (stateField) stateField.value = state;
+                    } catch (e) {
+                        // Lookup failed; keep the user's typed text untouched.
+                    } finally {
+                        hideSuggestions();
+                        sessionToken = null; // end the billing session; fresh token on next typing
+                    }
+                }
+
+                function renderSuggestions(suggestions) {
+                    box.innerHTML = '';
+                    activeIndex = -1;
+                    if (!suggestions || !suggestions.length) { hideSuggestions(); return; }
+                    var shown = suggestions.slice(0, 5);
+                    var added = 0;
+                    shown.forEach(function(suggestion) {
+                        var prediction = suggestion && suggestion.placePrediction;
+                        if (!prediction) return;
+                        var label = predictionText(prediction);
+                        if (!label) return;
+                        var row = document.createElement('button');
+                        row.type = 'button';
+                        row.className = 'address-suggestion';
+                        row.textContent = label;
+                        // pointerdown fires before blur, covering mouse + touch.
+                        row.addEventListener('pointerdown', function(event) {
+                            event.preventDefault();
+                            selectSuggestion(suggestion);
+                        });
+                        box.appendChild(row);
+                        added += 1;
+                    });
+                    if (!added) { hideSuggestions(); return; }
+                    box.hidden = false;
+                }
+
+                async function fetchSuggestions(value) {
+                    if (!sessionToken) sessionToken = new AutocompleteSessionToken();
+                    var mySeq = ++suggestionSeq;
+                    try {
+                        var result = await AutocompleteSuggestion.fetchAutocompleteSuggestions({
+                            input: value,
+                            sessionToken: sessionToken,
+                            includedRegionCodes: ['us'],
+                            locationBias: {
+                                center: { lat: 39.7392, lng: -104.9903 },
+                                radius: 40000
+                            }
+                        });
+                        if (mySeq !== suggestionSeq) return; // stale response
+                        renderSuggestions(result && result.suggestions);
+                    } catch (e) {
+                        if (mySeq !== suggestionSeq) return;
+                        hideSuggestions(); // silent
+                    }
+                }
+
+                input.addEventListener('input', function() {
+                    if (suppressNextInput) { suppressNextInput = false; return; }
+                    // Editing invalidates any previously selected place.
+                    clearMetadata();
+                    suggestionSeq += 1;
+                    hideSuggestions();
+                    var value = input.value.trim();
+                    if (debounceTimer) clearTimeout(debounceTimer);
+                    if (value.length < 2) {
+                        if (!value) sessionToken = null;
+                        return;
+                    }
+                    debounceTimer = setTimeout(function() { fetchSuggestions(value); }, 300);
+                });
+
+                input.addEventListener('keydown', function(e) {
+                    if (box.hidden) return;
+                    if (e.key === 'ArrowDown') { e.preventDefault(); setActive(activeIndex + 1); }
+                    else if (e.key === 'ArrowUp') { e.preventDefault(); setActive(activeIndex - 1); }
+                    else if (e.key === 'Enter') {
+                        var r = rows();
+                        if (activeIndex >= 0 && r[activeIndex]) {
+                            e.preventDefault();
+                            r[activeIndex].dispatchEvent(new Event('pointerdown'));
+                        }
+                    } else if (e.key === 'Escape') {
+                        hideSuggestions();
+                    }
+                });
+
+                document.addEventListener('click', function(e) {
+                    if (e.target !== input && !box.contains(e.target)) hideSuggestions();
+                });
+            }).catch(function() {
+                // importLibrary failed; manual typing still works.
+            });
+        })();
+
+        (function() {
+            var btn = document.querySelector('.burger-btn');
+            var nav = document.getElementById('navMenu');
+            if (!btn || !nav) return;
+            btn.addEventListener('click', function() {
+                var open = nav.classList.toggle('nav-open');
+                btn.setAttribute('aria-expanded', open);
+                btn.textContent = open ? '\u2715' : '\u2630';
+            });
+            nav.addEventListener('click', function(e) {
+                if (e.target.tagName === 'A') {
+                    nav.classList.remove('nav-open');
+                    btn.setAttribute('aria-expanded', 'false');
+                    btn.textContent = '\u2630';
+                }
+            });
+            document.addEventListener('keydown', function(e) {
+                if (e.key === 'Escape' && nav.classList.contains('nav-open')) {
+                    nav.classList.remove('nav-open');
+                    btn.setAttribute('aria-expanded', 'false');
+                    btn.textContent = '\u2630';
+                    btn.focus();
+                }
+            });
+        })();
+    } catch (e) { __inlineFail(e); }
+
+// @chunk 7f5df90b59
+if (__inlineRun("7f5df90b59")) try {
+        // Step 1: service selector
+        (function() {
+            var btns = document.querySelectorAll('.selector-btn');
+            var form = document.getElementById('bookingForm');
+            var serviceField = document.getElementById('serviceField');
+            var indicator = document.getElementById('bookingStepIndicator');
+            function trackBookingReveal(appliance) {
+                if (typeof gtag !== 'function') return;
+                var srcField = form ? form.querySelector('[name="source"]') : null;
+                var params = {
+                    appliance: appliance || '',
+                    source: srcField ? srcField.value : 'website-denver',
+                    source_page: location.pathname || '/',
+                    form_type: (form && form.getAttribute('data-form-type')) || 'website_form'
+                };
+                gtag('event', 'booking_step1_selected', params);
+                gtag('event', 'booking_form_view', params);
+            }
+            btns.forEach(function(btn) {
+                btn.addEventListener('click', function() {
+                    var formWasHidden = !form || form.style.display === 'none';
+                    btns.forEach(function(b) { b.classList.remove('selected'); });
+                    btn.classList.add('selected');
+                    serviceField.value = btn.getAttribute('data-service');
+                    if (indicator) indicator.textContent = 'Step 2 of 2 \u2014 Almost done';
+                    form.style.display = '';
+                    document.body.classList.add('booking-form-active');
+                    if (formWasHidden) trackBookingReveal(btn.getAttribute('data-service'));
+                    if (!document.getElementById('backToStep1')) {
+                        var back = document.createElement('button');
+                        back.type = 'button';
+                        back.id = 'backToStep1';
+                        back.className = 'back-to-step1';
+                        back.textContent = '\u2190 Change appliance';
+                        back.addEventListener('click', function() {
+                            form.style.display = 'none';
+                            if (indicator) indicator.textContent = 'Step 1 of 2 \u2014 Select your appliance';
+                            document.body.classList.remove('booking-form-active');
+                            back.style.display = 'none';
+                        });
+                        form.parentNode.insertBefore(back, form);
+                    } else {
+                        document.getElementById('backToStep1').style.display = '';
+                    }
+                    form.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
+                });
+            });
+        })();
+
+        (function() {
+            var submitted = false;
+            var form = document.getElementById("bookingForm");
+            var iframe = document.querySelector('iframe[name="hidden_iframe"]');
+            if (!form || !iframe) return;
+            form.addEventListener("submit", function(e) {
+                var phoneInput = form.querySelector('[name="phone"]');
+                var raw = phoneInput ? phoneInput.value : '';
+                var d = String(raw || '').replace(/\D/g, '');
+                if (d.length === 11 && d.charAt(0) === '1') d = d.substring(1);
+                var valid = d.length === 10 && !/^(\d)\1{9}$/.test(d) && /^[2-9]\d{2}[2-9]\d{6}$/.test(d);
+                if (!valid) {
+                    e.preventDefault();
+                    e.stopImmediatePropagation();
+                    var err = document.getElementById('phone-error');
+                    if (!err) {
+                        err = document.createElement('div');
+                        err.id = 'phone-error';
+                        err.style.cssText = 'color:#dc2626;font-size:0.875rem;margin-top:0.25rem;';
+                        err.textContent = 'Please enter a valid US phone number.';
+                        if (phoneInput && phoneInput.parentNode) phoneInput.parentNode.insertBefore(err, phoneInput.nextSibling);
+                    }
+                    err.style.display = 'block';
+                    if (phoneInput) phoneInput.focus();
+                    return false;
+                }
+                var existingErr = document.getElementById('phone-error');
+                if (existingErr) existingErr.style.display = 'none';
+                submitted = true;
+                var btn = form.querySelector("button[type=submit]");
+                if (btn) { btn.disabled = true; btn.innerText = "Sending..."; }
+            });
+            iframe.addEventListener("load", function() {
+                if (!submitted) return;
+                submitted = false;
+                sessionStorage.setItem('ec_name', form.querySelector('[name="name"]').value || '');
+                sessionStorage.setItem('ec_phone', form.querySelector('[name="phone"]').value || '');
+                sessionStorage.setItem('lead_submitted', '1');
+                window.location.href = '/thank-you.html';
+            });
+        })();
+
+        // Gallery modal (click-to-enlarge)
+        (function() {
+            if (!document.getElementById('galleryModal')) {
+                var el = document.createElement('div');
+                el.id = 'galleryModal'; el.className = 'gallery-modal';
+                el.setAttribute('role', 'dialog'); el.setAttribute('aria-modal', 'true'); el.setAttribute('aria-label', 'Image Viewer');
+                el.innerHTML = '<div class="gallery-modal-content"><button class="gallery-modal-close" id="galleryModalClose" aria-label="Close">\u00d7<\/button><img id="galleryModalImage" src="" alt="Enlarged gallery image"><\/div>';
+                document.body.appendChild(el);
+            }
+            var modal = document.getElementById('galleryModal');
+            var modalImage = document.getElementById('galleryModalImage');
+            var closeBtn = document.getElementById('galleryModalClose');
+            if (!modal || !modalImage || !closeBtn) return;
+            var openModal = function(src) { modalImage.src = src; modal.classList.add('open'); document.body.style.overflow = 'hidden'; };
+            var closeModal = function() { modal.classList.remove('open'); document.body.style.overflow = ''; };
+            document.querySelectorAll('.gallery-item img').forEach(function(img) {
+                img.addEventListener('click', function() { openModal(this.src); });
+                img.style.cursor = 'pointer';
+            });
+            closeBtn.addEventListener('click', closeModal);
+            modal.addEventListener('click', function(e) { if (e.target === modal) closeModal(); });
+            document.addEventListener('keydown', function(e) { if (e.key === 'Escape' && modal.classList.contains('open')) closeModal(); });
+        })();
+
+        // Burger menu
+        // Inline address autocomplete (Place Autocomplete Data API). The visible
+        // #address input is the only source of truth and posts directly. Google
+        // suggestions are optional assistance; if Google is unavailable, manual
+        // typing works normally and is never blocked.
+        (function() {
+            var input = document.getElementById('address');
+            var box = document.getElementById('addressSuggestions');
+            var placeIdField = document.getElementById('place_id');
+            var zipField = document.getElementById('zip');
+            var cityField = document.getElementById('city');
+            var stateField = document.getElementById('state');
+            if (!input || !box) return;
+
+            function clearMetadata() {
+                if (placeIdField) placeIdField.value = '';
+                if (zipField) zipField.value = '';
+                if (cityField) cityField.value = '';
+                if (stateField) stateField.value = '';
+            }
+            function hideSuggestions() {
+                box.hidden = true;
+                box.innerHTML = '';
+                activeIndex = -1;
+            }
+
+            // No Google available -> input still fully functional; just no suggestions.
+            if (!(window.google && google.maps && google.maps.importLibrary)) return;
+
+            var debounceTimer = null;
+            var sessionToken = null;
+            var suggestionSeq = 0;
+            var activeIndex = -1;
+            var suppressNextInput = false;
+
+            google.maps.importLibrary('places').then(function(places) {
+                var AutocompleteSuggestion = places.AutocompleteSuggestion;
+                var AutocompleteSessionToken = places.AutocompleteSessionToken;
+                if (!AutocompleteSuggestion || !AutocompleteSessionToken) return;
+
+                function rows() {
+                    return box.querySelectorAll('.address-suggestion');
+                }
+                function setActive(i) {
+                    var r = rows();
+                    if (!r.length) { activeIndex = -1; return; }
+                    if (i < 0) i = r.length - 1;
+                    if (i >= r.length) i = 0;
+                    activeIndex = i;
+                    for (var j = 0; j < r.length; j++) {
+                        if (j === activeIndex) r[j].classList.add('active');
+                        else r[j].classList.remove('active');
+                    }
+                }
+
+                function predictionText(prediction) {
+                    try {
+                        if (prediction && prediction.text && typeof prediction.text.text === 'string') {
+                            return prediction.text.text;
+                        }
+                    } catch (e) {}
+                    return '';
+                }
+
+                async function selectSuggestion(suggestion) {
+                    var prediction = suggestion && suggestion.placePrediction;
+                    if (!prediction) return;
+                    // Invalidate any in-flight prediction requests.
+                    suggestionSeq += 1;
+                    try {
+                        var place = prediction.toPlace();
+                        await place.fetchFields({ fields: ['formattedAddress', 'addressComponents', 'id'] });
+                        suppressNextInput = true;
+                        input.value = place.formattedAddress || input.value;
+                        var comps = place.addressComponents || [];
+                        var zip = '', city = '', state = '';
+                        comps.forEach(function(c) {
+                            var t = c.types || [];
+                            if (t.indexOf('postal_code') !== -1) zip = c.longText || zip;
+                            if (t.indexOf('locality') !== -1) city = c.longText || city;
+                            if (!city && t.indexOf('sublocality_level_1') !== -1) city = c.longText || city;
+                            if (!city && t.indexOf('sublocality') !== -1) city = c.longText || city;
+                            if (t.indexOf('administrative_area_level_1') !== -1) state = c.shortText || state;
+                        });
+                        if (placeIdField) placeIdField.value = place.id || '';
+                        if (zipField) zipField.value = zip;
+                        if (cityField) cityField.value = city;
+                        if (stateField) stateField.value = state;
+                    } catch (e) {
+                        // Lookup failed; keep the user's typed text untouched.
+                    } finally {
+                        hideSuggestions();
+                        sessionToken = null; // end the billing session; fresh token on next typing
+                    }
+                }
+
+                function renderSuggestions(suggestions) {
+                    box.innerHTML = '';
+                    activeIndex = -1;
+                    if (!suggestions || !suggestions.length) { hideSuggestions(); return; }
+                    var shown = suggestions.slice(0, 5);
+                    var added = 0;
+                    shown.forEach(function(suggestion) {
+                        var prediction = suggestion && suggestion.placePrediction;
+                        if (!prediction) return;
+                        var label = predictionText(prediction);
+                        if (!label) return;
+                        var row = document.createElement('button');
+                        row.type = 'button';
+                        row.className = 'address-suggestion';
+                        row.textContent = label;
+                        // pointerdown fires before blur, covering mouse + touch.
+                        row.addEventListener('pointerdown', function(event) {
+                            event.preventDefault();
+                            selectSuggestion(suggestion);
+                        });
+                        box.appendChild(row);
+                        added += 1;
+                    });
+                    if (!added) { hideSuggestions(); return; }
+                    box.hidden = false;
+                }
+
+                async function fetchSuggestions(value) {
+                    if (!sessionToken) sessionToken = new AutocompleteSessionToken();
+                    var mySeq = ++suggestionSeq;
+                    try {
+                        var result = await AutocompleteSuggestion.fetchAutocompleteSuggestions({
+                            input: value,
+                            sessionToken: sessionToken,
+                            includedRegionCodes: ['us'],
+                            locationBias: {
+                                center: { lat: 39.7392, lng: -104.9903 },
+                                radius: 40000
+                            }
+                        });
+                        if (mySeq !== suggestionSeq) return; // stale response
+                        renderSuggestions(result && result.suggestions);
+                    } catch (e) {
+                        if (mySeq !== suggestionSeq) return;
+                        hideSuggestions(); // silent
+                    }
+                }
+
+                input.addEventListener('input', function() {
+                    if (suppressNextInput) { suppressNextInput = false; return; }
+                    // Editing invalidates any previously selected place.
+                    clearMetadata();
+                    suggestionSeq += 1;
+                    hideSuggestions();
+                    var value = input.value.trim();
+                    if (debounceTimer) clearTimeout(debounceTimer);
+                    if (value.length < 2) {
+                        if (!value) sessionToken = null;
+                        return;
+                    }
+                    debounceTimer = setTimeout(function() { fetchSuggestions(value); }, 300);
+                });
+
+                input.addEventListener('keydown', function(e) {
+                    if (box.hidden) return;
+                    if (e.key === 'ArrowDown') { e.preventDefault(); setActive(activeIndex + 1); }
+                    else if (e.key === 'ArrowUp') { e.preventDefault(); setActive(activeIndex - 1); }
+                    else if (e.key === 'Enter') {
+                        var r = rows();
+                        if (activeIndex >= 0 && r[activeIndex]) {
+                            e.preventDefault();
+                            r[activeIndex].dispatchEvent(new Event('pointerdown'));
+                        }
+                    } else if (e.key === 'Escape') {
+                        hideSuggestions();
+                    }
+                });
+
+                document.addEventListener('click', function(e) {
+                    if (e.target !== input && !box.contains(e.target)) hideSuggestions();
+                });
+            }).catch(function() {
+                // importLibrary failed; manual typing still works.
+            });
+        })();
+
+        (function() {
+            var btn = document.querySelector('.burger-btn');
+            var nav = document.getElementById('navMenu');
+            if (!btn || !nav) return;
+            btn.addEventListener('click', function() {
+                var open = nav.classList.toggle('nav-open');
+                btn.setAttribute('aria-expanded', open);
+                btn.textContent = open ? '\u2715' : '\u2630';
+            });
+            nav.addEventListener('click', function(e) {
+                if (e.target.tagName === 'A') {
+                    nav.classList.remove('nav-open');
+                    btn.setAttribute('aria-expanded', 'false');
+                    btn.textContent = '\u2630';
+                }
+            });
+            document.addEventListener('keydown', function(e) {
+                if (e.key === 'Escape' && nav.classList.contains('nav-open')) {
+                    nav.classList.remove('nav-open');
+                    btn.setAttribute('aria-expanded', 'false');
+                    btn.textContent = '\u2630';
+                    btn.focus();
+                }
+            });
+        })();
+    } catch (e) { __inlineFail(e); }
+
+// @chunk b0d5653926
+if (__inlineRun("b0d5653926")) try {
+        // Step 1: service selector
+        (function() {
+            var btns = document.querySelectorAll('.selector-btn');
+            var form = document.getElementById('bookingForm');
+            var serviceField = document.getElementById('serviceField');
+            var indicator = document.getElementById('bookingStepIndicator');
+            function trackBookingReveal(appliance) {
+                if (typeof gtag !== 'function') return;
+                var srcField = form ? form.querySelector('[name="source"]') : null;
+                var params = {
+                    appliance: appliance || '',
+                    source: srcField ? srcField.value : 'website-denver',
+                    source_page: location.pathname || '/',
+                    form_type: (form && form.getAttribute('data-form-type')) || 'website_form'
+                };
+                gtag('event', 'booking_step1_selected', params);
+                gtag('event', 'booking_form_view', params);
+            }
+            btns.forEach(function(btn) {
+                btn.addEventListener('click', function() {
+                    var formWasHidden = !form || form.style.display === 'none';
+                    btns.forEach(function(b) { b.classList.remove('selected'); });
+                    btn.classList.add('selected');
+                    serviceField.value = btn.getAttribute('data-service');
+                    if (indicator) indicator.textContent = 'Step 2 of 2 \u2014 Almost done';
+                    form.style.display = '';
+                    document.body.classList.add('booking-form-active');
+                    if (formWasHidden) trackBookingReveal(btn.getAttribute('data-service'));
+                    if (!document.getElementById('backToStep1')) {
+                        var back = document.createElement('button');
+                        back.type = 'button';
+                        back.id = 'backToStep1';
+                        back.className = 'back-to-step1';
+                        back.textContent = '\u2190 Change appliance';
+                        back.addEventListener('click', function() {
+                            form.style.display = 'none';
+                            if (indicator) indicator.textContent = 'Step 1 of 2 \u2014 Select your appliance';
+                            document.body.classList.remove('booking-form-active');
+                            back.style.display = 'none';
+                        });
+                        form.parentNode.insertBefore(back, form);
+                    } else {
+                        document.getElementById('backToStep1').style.display = '';
+                    }
+                    form.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
+                });
+            });
+        })();
+
+        (function() {
+            var submitted = false;
+            var form = document.getElementById("bookingForm");
+            var iframe = document.querySelector('iframe[name="hidden_iframe"]');
+            if (!form || !iframe) return;
+            form.addEventListener("submit", function(e) {
+                var phoneInput = form.querySelector('[name="phone"]');
+                var raw = phoneInput ? phoneInput.value : '';
+                var d = String(raw || '').replace(/\D/g, '');
+                if (d.length === 11 && d.charAt(0) === '1') d = d.substring(1);
+                var valid = d.length === 10 && !/^(\d)\1{9}$/.test(d) && /^[2-9]\d{2}[2-9]\d{6}$/.test(d);
+                if (!valid) {
+                    e.preventDefault();
+                    e.stopImmediatePropagation();
+                    var err = document.getElementById('phone-error');
+                    if (!err) {
+                        err = document.createElement('div');
+                        err.id = 'phone-error';
+                        err.style.cssText = 'color:#dc2626;font-size:0.875rem;margin-top:0.25rem;';
+                        err.textContent = 'Please enter a valid US phone number.';
+                        if (phoneInput && phoneInput.parentNode) phoneInput.parentNode.insertBefore(err, phoneInput.nextSibling);
+                    }
+                    err.style.display = 'block';
+                    if (phoneInput) phoneInput.focus();
+                    return false;
+                }
+                var existingErr = document.getElementById('phone-error');
+                if (existingErr) existingErr.style.display = 'none';
+                submitted = true;
+                var btn = form.querySelector("button[type=submit]");
+                if (btn) { btn.disabled = true; btn.innerText = "Sending..."; }
+            });
+            iframe.addEventListener("load", function() {
+                if (!submitted) return;
+                submitted = false;
+                sessionStorage.setItem('ec_name', form.querySelector('[name="name"]').value || '');
+                sessionStorage.setItem('ec_phone', form.querySelector('[name="phone"]').value || '');
+                sessionStorage.setItem('lead_submitted', '1');
+                window.location.href = '/thank-you.html';
+            });
+        })();
+
+        // Burger menu
+        // Inline address autocomplete (Place Autocomplete Data API). The visible
+        // #address input is the only source of truth and posts directly. Google
+        // suggestions are optional assistance; if Google is unavailable, manual
+        // typing works normally and is never blocked.
+        (function() {
+            var input = document.getElementById('address');
+            var box = document.getElementById('addressSuggestions');
+            var placeIdField = document.getElementById('place_id');
+            var zipField = document.getElementById('zip');
+            var cityField = document.getElementById('city');
+            var stateField = document.getElementById('state');
+            if (!input || !box) return;
+
+            function clearMetadata() {
+                if (placeIdField) placeIdField.value = '';
+                if (zipField) zipField.value = '';
+                if (cityField) cityField.value = '';
+                if (stateField) stateField.value = '';
+            }
+            function hideSuggestions() {
+                box.hidden = true;
+                box.innerHTML = '';
+                activeIndex = -1;
+            }
+
+            // No Google available -> input still fully functional; just no suggestions.
+            if (!(window.google && google.maps && google.maps.importLibrary)) return;
+
+            var debounceTimer = null;
+            var sessionToken = null;
+            var suggestionSeq = 0;
+            var activeIndex = -1;
+            var suppressNextInput = false;
+
+            google.maps.importLibrary('places').then(function(places) {
+                var AutocompleteSuggestion = places.AutocompleteSuggestion;
+                var AutocompleteSessionToken = places.AutocompleteSessionToken;
+                if (!AutocompleteSuggestion || !AutocompleteSessionToken) return;
+
+                function rows() {
+                    return box.querySelectorAll('.address-suggestion');
+                }
+                function setActive(i) {
+                    var r = rows();
+                    if (!r.length) { activeIndex = -1; return; }
+                    if (i < 0) i = r.length - 1;
+                    if (i >= r.length) i = 0;
+                    activeIndex = i;
+                    for (var j = 0; j < r.length; j++) {
+                        if (j === activeIndex) r[j].classList.add('active');
+                        else r[j].classList.remove('active');
+                    }
+                }
+
+                function predictionText(prediction) {
+                    try {
+                        if (prediction && prediction.text && typeof prediction.text.text === 'string') {
+                            return prediction.text.text;
+                        }
+                    } catch (e) {}
+                    return '';
+                }
+
+                async function selectSuggestion(suggestion) {
+                    var prediction = suggestion && suggestion.placePrediction;
+                    if (!prediction) return;
+                    // Invalidate any in-flight prediction requests.
+                    suggestionSeq += 1;
+                    try {
+                        var place = prediction.toPlace();
+                        await place.fetchFields({ fields: ['formattedAddress', 'addressComponents', 'id'] });
+                        suppressNextInput = true;
+                        input.value = place.formattedAddress || input.value;
+                        var comps = place.addressComponents || [];
+                        var zip = '', city = '', state = '';
+                        comps.forEach(function(c) {
+                            var t = c.types || [];
+                            if (t.indexOf('postal_code') !== -1) zip = c.longText || zip;
+                            if (t.indexOf('locality') !== -1) city = c.longText || city;
+                            if (!city && t.indexOf('sublocality_level_1') !== -1) city = c.longText || city;
+                            if (!city && t.indexOf('sublocality') !== -1) city = c.longText || city;
+                            if (t.indexOf('administrative_area_level_1') !== -1) state = c.shortText || state;
+                        });
+                        if (placeIdField) placeIdField.value = place.id || '';
+                        if (zipField) zipField.value = zip;
+                        if (cityField) cityField.value = city;
+                        if (stateField) stateField.value = state;
+                    } catch (e) {
+                        // Lookup failed; keep the user's typed text untouched.
+                    } finally {
+                        hideSuggestions();
+                        sessionToken = null; // end the billing session; fresh token on next typing
+                    }
+                }
+
+                function renderSuggestions(suggestions) {
+                    box.innerHTML = '';
+                    activeIndex = -1;
+                    if (!suggestions || !suggestions.length) { hideSuggestions(); return; }
+                    var shown = suggestions.slice(0, 5);
+                    var added = 0;
+                    shown.forEach(function(suggestion) {
+                        var prediction = suggestion && suggestion.placePrediction;
+                        if (!prediction) return;
+                        var label = predictionText(prediction);
+                        if (!label) return;
+                        var row = document.createElement('button');
+                        row.type = 'button';
+                        row.className = 'address-suggestion';
+                        row.textContent = label;
+                        // pointerdown fires before blur, covering mouse + touch.
+                        row.addEventListener('pointerdown', function(event) {
+                            event.preventDefault();
+                            selectSuggestion(suggestion);
+                        });
+                        box.appendChild(row);
+                        added += 1;
+                    });
+                    if (!added) { hideSuggestions(); return; }
+                    box.hidden = false;
+                }
+
+                async function fetchSuggestions(value) {
+                    if (!sessionToken) sessionToken = new AutocompleteSessionToken();
+                    var mySeq = ++suggestionSeq;
+                    try {
+                        var result = await AutocompleteSuggestion.fetchAutocompleteSuggestions({
+                            input: value,
+                            sessionToken: sessionToken,
+                            includedRegionCodes: ['us'],
+                            locationBias: {
+                                center: { lat: 39.7392, lng: -104.9903 },
+                                radius: 40000
+                            }
+                        });
+                        if (mySeq !== suggestionSeq) return; // stale response
+                        renderSuggestions(result && result.suggestions);
+                    } catch (e) {
+                        if (mySeq !== suggestionSeq) return;
+                        hideSuggestions(); // silent
+                    }
+                }
+
+                input.addEventListener('input', function() {
+                    if (suppressNextInput) { suppressNextInput = false; return; }
+                    // Editing invalidates any previously selected place.
+                    clearMetadata();
+                    suggestionSeq += 1;
+                    hideSuggestions();
+                    var value = input.value.trim();
+                    if (debounceTimer) clearTimeout(debounceTimer);
+                    if (value.length < 2) {
+                        if (!value) sessionToken = null;
+                        return;
+                    }
+                    debounceTimer = setTimeout(function() { fetchSuggestions(value); }, 300);
+                });
+
+                input.addEventListener('keydown', function(e) {
+                    if (box.hidden) return;
+                    if (e.key === 'ArrowDown') { e.preventDefault(); setActive(activeIndex + 1); }
+                    else if (e.key === 'ArrowUp') { e.preventDefault(); setActive(activeIndex - 1); }
+                    else if (e.key === 'Enter') {
+                        var r = rows();
+                        if (activeIndex >= 0 && r[activeIndex]) {
+                            e.preventDefault();
+                            r[activeIndex].dispatchEvent(new Event('pointerdown'));
+                        }
+                    } else if (e.key === 'Escape') {
+                        hideSuggestions();
+                    }
+                });
+
+                document.addEventListener('click', function(e) {
+                    if (e.target !== input && !box.contains(e.target)) hideSuggestions();
+                });
+            }).catch(function() {
+                // importLibrary failed; manual typing still works.
+            });
+        })();
+
+        (function() {
+            var btn = document.querySelector('.burger-btn');
+            var nav = document.getElementById('navMenu');
+            if (!btn || !nav) return;
+            btn.addEventListener('click', function() {
+                var open = nav.classList.toggle('nav-open');
+                btn.setAttribute('aria-expanded', open);
+                btn.textContent = open ? '\u2715' : '\u2630';
+            });
+            nav.addEventListener('click', function(e) {
+                if (e.target.tagName === 'A') {
+                    nav.classList.remove('nav-open');
+                    btn.setAttribute('aria-expanded', 'false');
+                    btn.textContent = '\u2630';
+                }
+            });
+            document.addEventListener('keydown', function(e) {
+                if (e.key === 'Escape' && nav.classList.contains('nav-open')) {
+                    nav.classList.remove('nav-open');
+                    btn.setAttribute('aria-expanded', 'false');
+                    btn.textContent = '\u2630';
+                    btn.focus();
+                }
+            });
+        })();
+    } catch (e) { __inlineFail(e); }
+
+// @chunk 91cf4e31e8
+if (__inlineRun("91cf4e31e8")) try {
+        // Step 1: service selector
+        (function() {
+            var btns = document.querySelectorAll('.selector-btn');
+            var form = document.getElementById('bookingForm');
+            var serviceField = document.getElementById('serviceField');
+            var indicator = document.getElementById('bookingStepIndicator');
+            function trackBookingReveal(appliance) {
+                if (typeof gtag !== 'function') return;
+                var srcField = form ? form.querySelector('[name="source"]') : null;
+                var params = {
+                    appliance: appliance || '',
+                    source: srcField ? srcField.value : 'website-denver',
+                    source_page: location.pathname || '/',
+                    form_type: (form && form.getAttribute('data-form-type')) || 'website_form'
+                };
+                gtag('event', 'booking_step1_selected', params);
+                gtag('event', 'booking_form_view', params);
+            }
+            btns.forEach(function(btn) {
+                btn.addEventListener('click', function() {
+                    var formWasHidden = !form || form.style.display === 'none';
+                    btns.forEach(function(b) { b.classList.remove('selected'); });
+                    btn.classList.add('selected');
+                    serviceField.value = btn.getAttribute('data-service');
+                    if (indicator) indicator.textContent = 'Step 2 of 2 \u2014 Almost done';
+                    form.style.display = '';
+                    document.body.classList.add('booking-form-active');
+                    if (formWasHidden) trackBookingReveal(btn.getAttribute('data-service'));
+                    if (!document.getElementById('backToStep1')) {
+                        var back = document.createElement('button');
+                        back.type = 'button';
+                        back.id = 'backToStep1';
+                        back.className = 'back-to-step1';
+                        back.textContent = '\u2190 Change appliance';
+                        back.addEventListener('click', function() {
+                            form.style.display = 'none';
+                            if (indicator) indicator.textContent = 'Step 1 of 2 \u2014 Select your appliance';
+                            document.body.classList.remove('booking-form-active');
+                            back.style.display = 'none';
+                        });
+                        form.parentNode.insertBefore(back, form);
+                    } else {
+                        document.getElementById('backToStep1').style.display = '';
+                    }
+                    form.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
+                });
+            });
+        })();
+
+        (function() {
+            var submitted = false;
+            var form = document.getElementById("bookingForm");
+            var iframe = document.querySelector('iframe[name="hidden_iframe"]');
+            if (!form || !iframe) return;
+            form.addEventListener("submit", function(e) {
+                var phoneInput = form.querySelector('[name="phone"]');
+                var raw = phoneInput ? phoneInput.value : '';
+                var d = String(raw || '').replace(/\D/g, '');
+                if (d.length === 11 && d.charAt(0) === '1') d = d.substring(1);
+                var valid = d.length === 10 && !/^(\d)\1{9}$/.test(d) && /^[2-9]\d{2}[2-9]\d{6}$/.test(d);
+                if (!valid) {
+                    e.preventDefault();
+                    e.stopImmediatePropagation();
+                    var err = document.getElementById('phone-error');
+                    if (!err) {
+                        err = document.createElement('div');
+                        err.id = 'phone-error';
+                        err.style.cssText = 'color:#dc2626;font-size:0.875rem;margin-top:0.25rem;';
+                        err.textContent = 'Please enter a valid US phone number.';
+                        if (phoneInput && phoneInput.parentNode) phoneInput.parentNode.insertBefore(err, phoneInput.nextSibling);
+                    }
+                    err.style.display = 'block';
+                    if (phoneInput) phoneInput.focus();
+                    return false;
+                }
+                var existingErr = document.getElementById('phone-error');
+                if (existingErr) existingErr.style.display = 'none';
+                submitted = true;
+                var btn = form.querySelector("button[type=submit]");
+                if (btn) { btn.disabled = true; btn.innerText = "Sending..."; }
+            });
+            iframe.addEventListener("load", function() {
+                if (!submitted) return;
+                submitted = false;
+                sessionStorage.setItem('ec_name', form.querySelector('[name="name"]').value || '');
+                sessionStorage.setItem('ec_phone', form.querySelector('[name="phone"]').value || '');
+                sessionStorage.setItem('lead_submitted', '1');
+                window.location.href = '/thank-you.html';
+            });
+        })();
+    
+
+        // Burger menu
+        // Inline address autocomplete (Place Autocomplete Data API). The visible
+        // #address input is the only source of truth and posts directly. Google
+        // suggestions are optional assistance; if Google is unavailable, manual
+        // typing works normally and is never blocked.
+        (function() {
+            var input = document.getElementById('address');
+            var box = document.getElementById('addressSuggestions');
+            var placeIdField = document.getElementById('place_id');
+            var zipField = document.getElementById('zip');
+            var cityField = document.getElementById('city');
+            var stateField = document.getElementById('state');
+            if (!input || !box) return;
+
+            function clearMetadata() {
+                if (placeIdField) placeIdField.value = '';
+                if (zipField) zipField.value = '';
+                if (cityField) cityField.value = '';
+                if (stateField) stateField.value = '';
+            }
+            function hideSuggestions() {
+                box.hidden = true;
+                box.innerHTML = '';
+                activeIndex = -1;
+            }
+
+            // No Google available -> input still fully functional; just no suggestions.
+            if (!(window.google && google.maps && google.maps.importLibrary)) return;
+
+            var debounceTimer = null;
+            var sessionToken = null;
+            var suggestionSeq = 0;
+            var activeIndex = -1;
+            var suppressNextInput = false;
+
+            google.maps.importLibrary('places').then(function(places) {
+                var AutocompleteSuggestion = places.AutocompleteSuggestion;
+                var AutocompleteSessionToken = places.AutocompleteSessionToken;
+                if (!AutocompleteSuggestion || !AutocompleteSessionToken) return;
+
+                function rows() {
+                    return box.querySelectorAll('.address-suggestion');
+                }
+                function setActive(i) {
+                    var r = rows();
+                    if (!r.length) { activeIndex = -1; return; }
+                    if (i < 0) i = r.length - 1;
+                    if (i >= r.length) i = 0;
+                    activeIndex = i;
+                    for (var j = 0; j < r.length; j++) {
+                        if (j === activeIndex) r[j].classList.add('active');
+                        else r[j].classList.remove('active');
+                    }
+                }
+
+                function predictionText(prediction) {
+                    try {
+                        if (prediction && prediction.text && typeof prediction.text.text === 'string') {
+                            return prediction.text.text;
+                        }
+                    } catch (e) {}
+                    return '';
+                }
+
+                async function selectSuggestion(suggestion) {
+                    var prediction = suggestion && suggestion.placePrediction;
+                    if (!prediction) return;
+                    // Invalidate any in-flight prediction requests.
+                    suggestionSeq += 1;
+                    try {
+                        var place = prediction.toPlace();
+                        await place.fetchFields({ fields: ['formattedAddress', 'addressComponents', 'id'] });
+                        suppressNextInput = true;
+                        input.value = place.formattedAddress || input.value;
+                        var comps = place.addressComponents || [];
+                        var zip = '', city = '', state = '';
+                        comps.forEach(function(c) {
+                            var t = c.types || [];
+                            if (t.indexOf('postal_code') !== -1) zip = c.longText || zip;
+                            if (t.indexOf('locality') !== -1) city = c.longText || city;
+                            if (!city && t.indexOf('sublocality_level_1') !== -1) city = c.longText || city;
+                            if (!city && t.indexOf('sublocality') !== -1) city = c.longText || city;
+                            if (t.indexOf('administrative_area_level_1') !== -1) state = c.shortText || state;
+                        });
+                        if (placeIdField) placeIdField.value = place.id || '';
+                        if (zipField) zipField.value = zip;
+                        if (cityField) cityField.value = city;
+                        if (stateField) stateField.value = state;
+                    } catch (e) {
+                        // Lookup failed; keep the user's typed text untouched.
+                    } finally {
+                        hideSuggestions();
+                        sessionToken = null; // end the billing session; fresh token on next typing
+                    }
+                }
+
+                function renderSuggestions(suggestions) {
+                    box.innerHTML = '';
+                    activeIndex = -1;
+                    if (!suggestions || !suggestions.length) { hideSuggestions(); return; }
+                    var shown = suggestions.slice(0, 5);
+                    var added = 0;
+                    shown.forEach(function(suggestion) {
+                        var prediction = suggestion && suggestion.placePrediction;
+                        if (!prediction) return;
+                        var label = predictionText(prediction);
+                        if (!label) return;
+                        var row = document.createElement('button');
+                        row.type = 'button';
+                        row.className = 'address-suggestion';
+                        row.textContent = label;
+                        // pointerdown fires before blur, covering mouse + touch.
+                        row.addEventListener('pointerdown', function(event) {
+                            event.preventDefault();
+                            selectSuggestion(suggestion);
+                        });
+                        box.appendChild(row);
+                        added += 1;
+                    });
+                    if (!added) { hideSuggestions(); return; }
+                    box.hidden = false;
+                }
+
+                async function fetchSuggestions(value) {
+                    if (!sessionToken) sessionToken = new AutocompleteSessionToken();
+                    var mySeq = ++suggestionSeq;
+                    try {
+                        var result = await AutocompleteSuggestion.fetchAutocompleteSuggestions({
+                            input: value,
+                            sessionToken: sessionToken,
+                            includedRegionCodes: ['us'],
+                            locationBias: {
+                                center: { lat: 39.7392, lng: -104.9903 },
+                                radius: 40000
+                            }
+                        });
+                        if (mySeq !== suggestionSeq) return; // stale response
+                        renderSuggestions(result && result.suggestions);
+                    } catch (e) {
+                        if (mySeq !== suggestionSeq) return;
+                        hideSuggestions(); // silent
+                    }
+                }
+
+                input.addEventListener('input', function() {
+                    if (suppressNextInput) { suppressNextInput = false; return; }
+                    // Editing invalidates any previously selected place.
+                    clearMetadata();
+                    suggestionSeq += 1;
+                    hideSuggestions();
+                    var value = input.value.trim();
+                    if (debounceTimer) clearTimeout(debounceTimer);
+                    if (value.length < 2) {
+                        if (!value) sessionToken = null;
+                        return;
+                    }
+                    debounceTimer = setTimeout(function() { fetchSuggestions(value); }, 300);
+                });
+
+                input.addEventListener('keydown', function(e) {
+                    if (box.hidden) return;
+                    if (e.key === 'ArrowDown') { e.preventDefault(); setActive(activeIndex + 1); }
+                    else if (e.key === 'ArrowUp') { e.preventDefault(); setActive(activeIndex - 1); }
+                    else if (e.key === 'Enter') {
+                        var r = rows();
+                        if (activeIndex >= 0 && r[activeIndex]) {
+                            e.preventDefault();
+                            r[activeIndex].dispatchEvent(new Event('pointerdown'));
+                        }
+                    } else if (e.key === 'Escape') {
+                        hideSuggestions();
+                    }
+                });
+
+                document.addEventListener('click', function(e) {
+                    if (e.target !== input && !box.contains(e.target)) hideSuggestions();
+                });
+            }).catch(function() {
+                // importLibrary failed; manual typing still works.
+            });
+        })();
+
+        (function() {
+            var btn = document.querySelector('.burger-btn');
+            var nav = document.getElementById('navMenu');
+            if (!btn || !nav) return;
+            btn.addEventListener('click', function() {
+                var open = nav.classList.toggle('nav-open');
+                btn.setAttribute('aria-expanded', open);
+                btn.textContent = open ? '\u2715' : '\u2630';
+            });
+            nav.addEventListener('click', function(e) {
+                if (e.target.tagName === 'A') {
+                    nav.classList.remove('nav-open');
+                    btn.setAttribute('aria-expanded', 'false');
+                    btn.textContent = '\u2630';
+                }
+            });
+            document.addEventListener('keydown', function(e) {
+                if (e.key === 'Escape' && nav.classList.contains('nav-open')) {
+                    nav.classList.remove('nav-open');
+                    btn.setAttribute('aria-expanded', 'false');
+                    btn.textContent = '\u2630';
+                    btn.focus();
+                }
+            });
+        })();
+    } catch (e) { __inlineFail(e); }
+
+// @chunk 75419ee80b
+if (__inlineRun("75419ee80b")) try {
+        // Anti-spam guard: blocks links in name/address/message and bot-filled
+        // honeypot submissions before any endpoint call. Capture-phase listeners
+        // run ahead of each page's own submit/review handlers.
+        (function() {
+            function containsBlockedLink(value) {
+                var text = String(value || '').toLowerCase();
+                return (
+                    /https?:\/\//i.test(text) ||
+                    /\bwww\./i.test(text) ||
+                    /\bt\.me\//i.test(text) ||
+                    /\btelegram\.me\//i.test(text) ||
+                    /\bbit\.ly\//i.test(text) ||
+                    /\btinyurl\.com\//i.test(text) ||
+                    /\b[a-z0-9-]+\.(com|net|org|io|biz|info|ru|xyz|top|online|site|shop|live|click|link|co)\b/i.test(text) ||
+                    /<[^>]+>/i.test(text) ||
+                    /\[[^\]]+\]\([^)]+\)/i.test(text)
+                );
+            }
+            function spamCheck(form) {
+                var hp = form.querySelector('input[name="website"]');
+                if (hp && hp.value) return { blocked: true, silent: true };
+                var names = ['name', 'address', 'message'];
+                for (var i = 0; i < names.length; i++) {
+                    var el = form.querySelector('[name="' + names[i] + '"]');
+                    if (el && containsBlockedLink(el.value)) return { blocked: true, field: el };
+                }
+                return { blocked: false };
+            }
+            function showLinkError(form, field) {
+                var err = form.querySelector('.link-error');
+                if (!err) {
+                    err = document.createElement('div');
+                    err.className = 'link-error';
+                    err.style.cssText = 'color:#dc2626;font-size:0.875rem;margin-top:0.5rem;';
+                    err.textContent = 'Links are not allowed in this form. Please remove the link and try again.';
+                    var btn = form.querySelector('button');
+                    if (btn && btn.parentNode === form) form.insertBefore(err, btn);
+                    else form.appendChild(err);
+                }
+                err.style.display = 'block';
+                if (field) {
+                    field.scrollIntoView({ behavior: 'smooth', block: 'center' });
+                    try { field.focus({ preventScroll: true }); } catch (e) { field.focus(); }
+                }
+            }
+            // Returns true when the event was blocked.
+            function guard(form, e) {
+                if (!form || !form.getAttribute) return false;
+                var action = form.getAttribute('action') || '';
+                if (action.indexOf('script.google.com') === -1) return false;
+                var res = spamCheck(form);
+                if (!res.blocked) {
+                    var err = form.querySelector('.link-error');
+                    if (err) err.style.display = 'none';
+                    return false;
+                }
+                e.preventDefault();
+                e.stopPropagation();
+                if (!res.silent) showLinkError(form, res.field);
+                return true;
+            }
+            // All standard forms submit via a native submit event.
+            document.addEventListener('submit', function(e) {
+                guard(e.target, e);
+            }, true);
+            // The book-online flow submits programmatically (no submit event):
+            // gate the Review/Confirm buttons before the modal opens instead.
+            document.addEventListener('click', function(e) {
+                var t = e.target;
+                var btn = t && t.closest ? t.closest('#reviewBtn, #confirmBookingBtn') : null;
+                if (!btn) return;
+                guard(document.getElementById('bookingForm'), e);
+            }, true);
+        })();
+    } catch (e) { __inlineFail(e); }
@@ -0,0 +1,160 @@
+/*
+ * Site search — queries the static index built by tools/build_search_index.py.
+ *
+ * Markup:
+ *   <form data-site-search>
+ *     <input type="search">
+ *     <ul class="site-search-results" hidden></ul>
+ *   </form>
+ *
+ * Fetches search-index/manifest.json once, then docs.json and only the
+ * two-character shard each query word needs. Every query word must match a
+ * term (by prefix) in a page; pages are ranked by weight × IDF.
+ */
+(function () {
+    'use strict';
+
+    var BASE = '/search-index/';
+    var MAX_RESULTS = 8;
+    var PREFIX_FACTOR = 0.6;
+
+    var manifest = null;
+    var cache = {};
+
+    function fetchJSON(name) {
+        if (!cache[name]) {
+            var version = manifest ? '?v=' + manifest.files[name] : '';
+            cache[name] = fetch(BASE + name + version, manifest ? {} : { cache: 'no-cache' })
+                .then(function (r) { return r.ok ? r.json() : null; });
+        }
+        return cache[name];
+    }
+
+    function loadManifest() {
+        return fetchJSON('manifest.json').then(function (m) {
+            manifest = m;
+            return m;
+        });
+    }
+
+    function tokenize(query, stopwords) {
+        return (query.toLowerCase().match(/[a-z0-9]+/g) || []).filter(function (t) {
+            return t.length > 1 && stopwords.indexOf(t) === -1;
+        });
+    }
+
+    // First index in sorted `terms` whose term is >= word.
+    function lowerBound(terms, word) {
+        var lo = 0, hi = terms.length;
+        while (lo < hi) {
+            var mid = (lo + hi) >> 1;
+            if (terms[mid] < word) lo = mid + 1; else hi = mid;
+        }
+        return lo;
+    }
+
+    // Best score per doc for one query word (exact term beats prefix matches).
+    function scoreWord(shard, word, totalDocs) {
+        var scores = {};
+        if (!shard) return scores;
+        for (var i = lowerBound(shard.t, word); i < shard.t.length && shard.t[i].lastIndexOf(word, 0) === 0; i++) {
+            var postings = shard.p[i];
+            var idf = Math.log(1 + totalDocs / (postings.length / 2));
+            var factor = shard.t[i] === word ? 1 : PREFIX_FACTOR;
+            for (var j = 0, doc = 0; j < postings.length; j += 2) {
+                doc += postings[j];
+                var s = postings[j + 1] * idf * factor;
+                if (!(scores[doc] >= s)) scores[doc] = s;
+            }
+        }
+        return scores;
+    }
+
+    function search(query) {
+        return loadManifest().then(function (m) {
+            if (!m) return [];
+            var words = tokenize(query, m.stopwords);
+            if (!words.length) return [];
+            var shardNames = words.map(function (w) {
+                var name = w.slice(0, m.prefix) + '.json';
+                return m.files[name] ? name : null;
+            });
+            return Promise.all([fetchJSON('docs.json')].concat(shardNames.map(function (name) {
+                return name ? fetchJSON(name) : null;
+            }))).then(function (loaded) {
+                var docs = loaded[0];
+                var total = null;
+                words.forEach(function (word, k) {
+                    var scores = scoreWord(loaded[k + 1], word, m.docs);
+                    if (total === null) {
+                        total = scores;
+                        return;
+                    }
+                    var merged = {};
+                    for (var doc in total) {
+                        if (doc in scores) merged[doc] = total[doc] + scores[doc];
+                    }
+                    total = merged;
+                });
+                return Object.keys(total)
+                    .sort(function (a, b) { return total[b] - total[a]; })
+                    .slice(0, MAX_RESULTS)
+                    .map(function (doc) { return docs[doc]; })
+                    .filter(Boolean);
+            });
+        });
+    }
+
+    function render(list, results, query) {
+        list.innerHTML = '';
+        if (!query) {
+            list.hidden = true;
+            return;
+        }
+        if (!results.length) {
+            var empty = document.createElement('li');
+            empty.className = 'site-search-empty';
+            empty.textContent = 'No pages found. Call (720) 575-8432 and we will help.';
+            list.appendChild(empty);
+        }
+        results.forEach(function (doc) {
+            var item = document.createElement('li');
+            var link = document.createElement('a');
+            link.href = doc[0];
+            link.textContent = doc[1];
+            item.appendChild(link);
+            list.appendChild(item);
+        });
+        list.hidden = false;
+    }
+
+    function bind(form) {
+        var input = form.querySelector('input[type="search"]');
+        var list = form.querySelector('.site-search-results');
+        if (!input || !list) return;
+        var timer = null;
+        var latest = 0;
+
+        function run() {
+            var query = input.value.trim();
+            var ticket = ++latest;
+            if (!query) return render(list, [], '');
+            search(query).then(function (results) {
+                if (ticket === latest) render(list, results, query);
+            });
+        }
+
+        input.addEventListener('input', function () {
+            clearTimeout(timer);
+            timer = setTimeout(run, 80);
+        });
+        input.addEventListener('focus', loadManifest, { once: true });
+        form.addEventListener('submit', function (e) {
+            e.preventDefault();
+            var first = list.querySelector('a');
+            if (first) window.location.href = first.href;
+        });
+    }
+
+    document.querySelectorAll('[data-site-search]').forEach(bind);
+})();
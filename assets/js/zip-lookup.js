@@ -0,0 +1,88 @@
+/*
+ * ZIP lookup — "Do you serve my ZIP?" widget.
+ *
+ * Binary-searches assets/data/service-zips.json (built by
+ * tools/build_zip_lookup.py); no geocoding or API call.
+ *
+ * Markup:
+ *   <form data-zip-lookup>
+ *     <input inputmode="numeric" maxlength="5">
+ *     <p class="zip-lookup-result" aria-live="polite"></p>
+ *   </form>
+ */
+(function () {
+    'use strict';
+
+    var DATA_URL = '/assets/data/service-zips.json';
+    var MESSAGES = {
+        same_day: 'Yes! We serve {place} with same-day appointments.',
+        served: 'Yes, we serve {place}, usually same or next day.',
+        call: '{place} is at the edge of our service area. Call (720) 575-8432 to confirm availability.'
+    };
+    var NOT_FOUND = 'We don\'t have {zip} on file yet. Call (720) 575-8432 and we\'ll check for you.';
+
+    var data = null;
+
+    function load() {
+        if (!data) {
+            data = fetch(DATA_URL).then(function (r) { return r.ok ? r.json() : null; });
+        }
+        return data;
+    }
+
+    function find(d, zip) {
+        var target = parseInt(zip, 10);
+        var lo = 0, hi = d.zips.length;
+        while (lo < hi) {
+            var mid = (lo + hi) >> 1;
+            if (d.zips[mid] < target) lo = mid + 1; else hi = mid;
+        }
+        if (d.zips[lo] !== target) return null;
+        return {
+            place: d.places[d.rows[lo * 3]],
+            page: d.pages[d.rows[lo * 3 + 1]],
+            status: d.status[d.rows[lo * 3 + 2]]
+        };
+    }
+
+    function show(output, zip, hit) {
+        output.textContent = '';
+        if (!hit) {
+            output.textContent = NOT_FOUND.replace('{zip}', zip);
+            output.className = 'zip-lookup-result zip-lookup-miss';
+            return;
+        }
+        output.className = 'zip-lookup-result zip-lookup-' + hit.status.replace('_', '-');
+        output.appendChild(document.createTextNode(MESSAGES[hit.status].replace('{place}', hit.place) + ' '));
+        var link = document.createElement('a');
+        link.href = hit.page;
+        link.textContent = 'See ' + hit.place.split(' (')[0] + ' repair →';
+        output.appendChild(link);
+    }
+
+    function bind(form) {
+        var input = form.querySelector('input');
+        var output = form.querySelector('.zip-lookup-result');
+        if (!input || !output) return;
+
+        function check() {
+            var zip = input.value.replace(/\D/g, '').slice(0, 5);
+            if (zip.length < 5) {
+                output.textContent = '';
+                return;
+            }
+            load().then(function (d) {
+                if (d) show(output, zip, find(d, zip));
+            });
+        }
+
+        input.addEventListener('focus', load, { once: true });
+        input.addEventListener('input', check);
+        form.addEventListener('submit', function (e) {
+            e.preventDefault();
+            check();
+        });
+    }
+
+    document.querySelectorAll('[data-zip-lookup]').forEach(bind);
+})();
@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+asset_graph.py — Which assets the site references, and which images are duplicates.
+
+assets/ has grown by copy: the same photo sits in several formats and
+folders (problems/front-load-washer-drum-repair-denver.jpg next to
+repairs/front-load-washer-drum-repair.webp), and placeholder gitkeep files
+ship with it. This builds the reference graph, {asset: {referrer: count}},
+from everything that can point at an asset: the published pages, the page
+templates and partials, styles.css and the CSS / JS under assets/. Root-
+relative, site-absolute and file-relative URLs, srcset lists and CSS url()
+all count. From the graph it proposes:
+
+  * duplicates  images whose 64-bit perceptual hash (DCT of a 32x32
+                greyscale thumbnail, computed in a process pool) is within
+                --distance bits of another's and whose aspect ratio and
+                average colour match, joined into clusters. Each cluster keeps one file — the
+                smallest in bytes that is still as wide as the page shows it
+                (DISPLAY_WIDTH, or the widest copy if none is), then WebP/AVIF
+                over PNG over JPEG — and every reference to the others is
+                rewritten to it. Byte-identical files (SVGs too) cluster regardless.
+  * unused      images nothing references, except size variants (-mobile,
+                -800w, ...) of a referenced or kept file, and gitkeep
+                placeholders in directories that hold files.
+
+Images offered as alternatives of each other (one srcset, one <picture>,
+or names that differ only by a size suffix such as -mobile / -desktop) are
+never merged. References in <meta> tags (og:image, twitter:image) and in
+typed <source> tags are left alone, since a format swap there changes what
+the consumer accepts; a file they point at is kept. KEEP_PATTERNS lists the
+files tools address by name pattern rather than by reference (the city
+banners nearest_areas.py and the city hero pick), which are never dropped or
+remapped.
+
+Dry run by default: prints the proposed mapping and the bytes it would save.
+--write rewrites the references and deletes the dropped files; run the build
+stages' --check afterwards (lcp_priority.py, page_weight.py) as usual.
+
+Requires Pillow, numpy and scipy.
+
+Usage:
+    python3 tools/asset_graph.py                     # dry run: proposed mapping + unused files
+    python3 tools/asset_graph.py --write             # rewrite references, delete dropped files
+    python3 tools/asset_graph.py --check             # exit 1 if anything would change
+    python3 tools/asset_graph.py --distance 4 --report assets.json
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import posixpath
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import quote, unquote
+
+import numpy as np
+from PIL import Image
+from scipy import sparse
+from scipy.fft import dctn
+from scipy.sparse.csgraph import connected_components
+
+from page_model import load_page, write_page
+from site_pages import REPO_ROOT, SITE_URL, TEMPLATE_PAGES, iter_site_pages
+
+ASSETS_DIR = REPO_ROOT / "assets"
+RASTER_SUFFIXES = {".webp", ".avif", ".png", ".jpg", ".jpeg", ".gif"}
+IMAGE_SUFFIXES = RASTER_SUFFIXES | {".svg", ".ico"}
+PLACEHOLDER_NAMES = {".gitkeep", "gitkeep"}
+# Preferred keeper format within a duplicate cluster when sizes tie (lower wins).
+FORMAT_RANK = {".webp": 0, ".avif": 0, ".png": 1, ".jpg": 2, ".jpeg": 2, ".gif": 3}
+
+DEFAULT_DISTANCE = 6
+# Aspect ratios further apart than this are different crops, not duplicates.
+ASPECT_TOLERANCE = 0.02
+# Average colours further apart than this (0-255, any channel) are recolours, not duplicates.
+COLOR_TOLERANCE = 16
+# Widest an in-content image is shown, in CSS px (.section-photo at the desktop breakpoint).
+# A keeper at least this wide isn't upscaled, so resolution beyond it doesn't decide.
+DISPLAY_WIDTH = 720
+
+# Files tools refer to by name pattern (nearest_areas.banner_for, the city hero), never dropped.
+KEEP_PATTERNS = [
+    "assets/images/cities banner/*-desktop.webp",
+    "assets/images/cities banner/*-mobile.webp",
+]
+
+_REF_RE = re.compile(
+    r"""(?<=[\s"'(,=])((?:https?://[^\s"'()<>,]+?|[^\s"'()<>,]*?)\.(?:webp|avif|jpe?g|png|gif|svg|ico|css|js|json))"""
+    r"""(?=[\s"'()<>,?#]|$)""",
+    re.IGNORECASE,
+)
+_VARIANT_RE = re.compile(r"<picture\b.*?</picture>|\bsrcset=\"[^\"]*\"|\bimagesrcset=\"[^\"]*\"", re.S | re.IGNORECASE)
+_PINNED_RE = re.compile(r"<meta\b[^>]*>|<source\b[^>]*\btype=[^>]*>", re.IGNORECASE)
+_SIZE_SUFFIX_RE = re.compile(r"[-_](?:mobile|desktop|tablet|small|medium|large|\d+w|\d+x\d+|@\dx)$", re.IGNORECASE)
+
+
+# ===================================================================
+# Reference graph
+# ===================================================================
+
+def reference_sources():
+    """Repo paths of every file whose references count, sorted and de-duplicated."""
+    sources = list(iter_site_pages()) + [p for p in TEMPLATE_PAGES if p.exists()]
+    sources += sorted((REPO_ROOT / "tools" / "partials").glob("*.html"))
+    sources += [REPO_ROOT / "styles.css", REPO_ROOT / "site.webmanifest"]
+    sources += sorted(ASSETS_DIR.rglob("*.css")) + sorted(ASSETS_DIR.rglob("*.js"))
+    return sorted({p for p in sources if p.exists()})
+
+
+def resolve(token, source_rel):
+    """Repo-relative path a URL in source_rel points at, or None if it's off-site or templated.
+
+    Relative URLs resolve against the source file, except in scripts, whose
+    URLs are relative to the page running them (taken as the site root).
+    A URL with a {{SLOT}} in a template is filled per page; the files it can
+    name are covered by KEEP_PATTERNS.
+    """
+    if "{{" in token:
+        return None
+    if token.lower().startswith(("http://", "https://")):
+        site = SITE_URL.split("://", 1)[1]
+        rest = token.split("://", 1)[1]
+        if not (rest == site or rest.startswith(site + "/")):
+            return None
+        token = rest[len(site):]
+    path = unquote(token)
+    if path.startswith("/"):
+        return posixpath.normpath(path.lstrip("/"))
+    base = "" if source_rel.endswith(".js") else posixpath.dirname(source_rel)
+    return posixpath.normpath(posixpath.join(base, path))
+
+
+def _inside(spans, pos):
+    return any(start <= pos < end for start, end in spans)
+
+
+def scan_source(path):
+    """References in one file: (refs, variant groups).
+
+    refs is [(start, end, token, asset rel, pinned)] for URLs under assets/;
+    each variant group is the set of assets one srcset / <picture> offers.
+    """
+    rel = path.relative_to(REPO_ROOT).as_posix()
+    text = load_page(path).html if path.suffix == ".html" else path.read_text(encoding="utf-8", errors="replace")
+    pinned = [m.span() for m in _PINNED_RE.finditer(text)]
+    refs = []
+    for m in _REF_RE.finditer(text):
+        asset = resolve(m.group(1), rel)
+        if asset and asset.startswith("assets/"):
+            refs.append((m.start(1), m.end(1), m.group(1), asset, _inside(pinned, m.start(1))))
+    groups = []
+    for m in _VARIANT_RE.finditer(text):
+        group = {asset for start, _, _, asset, _ in refs if m.start() <= start < m.end()}
+        if len(group) > 1:
+            groups.append(group)
+    return refs, groups
+
+
+def build_graph(sources):
+    """({asset: {referrer: count}}, {referrer: refs}, [variant groups], {asset: pinned referrers})."""
+    graph, refs_by_source, variants, pinned = {}, {}, [], {}
+    for path in sources:
+        rel = path.relative_to(REPO_ROOT).as_posix()
+        refs, groups = scan_source(path)
+        refs_by_source[rel] = refs
+        variants += groups
+        for _, _, _, asset, is_pinned in refs:
+            referrers = graph.setdefault(asset, {})
+            referrers[rel] = referrers.get(rel, 0) + 1
+            if is_pinned:
+                pinned.setdefault(asset, set()).add(rel)
+    return graph, refs_by_source, variants, pinned
+
+
+def asset_files():
+    """Repo-relative paths of every file under assets/, sorted."""
+    return sorted(p.relative_to(REPO_ROOT).as_posix() for p in ASSETS_DIR.rglob("*") if p.is_file())
+
+
+# ===================================================================
+# Perceptual hashing
+# ===================================================================
+
+def image_fingerprint(rel):
+    """{rel, sha1, bytes, dims, phash, color} for one image; dims / phash / color are None for vectors."""
+    path = REPO_ROOT / rel
+    data = path.read_bytes()
+    fp = {"rel": rel, "sha1": hashlib.sha1(data).hexdigest(), "bytes": len(data),
+          "dims": None, "phash": None, "color": None}
+    if path.suffix.lower() not in RASTER_SUFFIXES:
+        return fp
+    with Image.open(path) as img:
+        fp["dims"] = img.size
+        rgb = img.convert("RGB").resize((32, 32), Image.LANCZOS)
+    grey = np.asarray(rgb.convert("L"), dtype=np.float64)
+    low = dctn(grey, norm="ortho")[:8, :8].ravel()
+    bits = low > np.median(low[1:])  # the DC term only carries overall brightness
+    fp["phash"] = int(np.packbits(bits).view(">u8")[0])
+    fp["color"] = np.asarray(rgb, dtype=np.float64).reshape(-1, 3).mean(axis=0).round(1).tolist()
+    return fp
+
+
+def fingerprint_all(rels, workers=None):
+    if len(rels) < 8 or workers == 1:
+        return [image_fingerprint(rel) for rel in rels]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunk = max(len(rels) // ((workers or os.cpu_count() or 1) * 4), 1)
+        return list(pool.map(image_fingerprint, rels, chunksize=chunk))
+
+
+def hamming(h, hashes):
+    """Bits in which the 64-bit hash h differs from each of hashes."""
+    diff = h ^ hashes
+    if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+        return np.bitwise_count(diff)
+    return np.unpackbits(diff.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+def size_variant_key(rel):
+    """Directory + file stem without a size suffix: files sharing it are deliberate size variants."""
+    stem = posixpath.splitext(rel)[0]
+    return _SIZE_SUFFIX_RE.sub("", stem).lower()
+
+
+def duplicate_clusters(prints, variants, distance=DEFAULT_DISTANCE):
+    """Clusters (lists of fingerprints, 2+ each) of byte-identical or perceptually equal images."""
+    n = len(prints)
+    raster = np.array([fp["phash"] is not None for fp in prints])
+    hashes = np.array([fp["phash"] or 0 for fp in prints], dtype=np.uint64)
+    aspect = np.array([fp["dims"][0] / fp["dims"][1] if fp["dims"] else 0.0 for fp in prints])
+    color = np.array([fp["color"] or (0.0, 0.0, 0.0) for fp in prints])
+    digests = np.array([fp["sha1"] for fp in prints])
+    index = {fp["rel"]: i for i, fp in enumerate(prints)}
+    apart = {(index[a], index[b]) for group in variants for a in group for b in group
+             if a != b and a in index and b in index}
+    sized = {}
+    for i, fp in enumerate(prints):
+        sized.setdefault(size_variant_key(fp["rel"]), []).append(i)
+    apart |= {(i, j) for group in sized.values() for i in group for j in group if i != j}
+
+    rows, cols = [], []
+    for i in range(n):
+        close = hamming(hashes[i], hashes) <= distance
+        close &= raster & raster[i] & (np.abs(aspect - aspect[i]) <= ASPECT_TOLERANCE * aspect[i])
+        close &= np.abs(color - color[i]).max(axis=1) <= COLOR_TOLERANCE
+        close |= digests == digests[i]
+        for j in np.flatnonzero(close):
+            if j > i and (i, j) not in apart:
+                rows.append(i)
+                cols.append(j)
+    graph = sparse.coo_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, n))
+    _, labels = connected_components(graph, directed=False)
+    clusters = {}
+    for i, label in enumerate(labels):
+        clusters.setdefault(label, []).append(prints[i])
+    return [sorted(c, key=lambda fp: fp["rel"]) for c in clusters.values() if len(c) > 1]
+
+
+def choose_keeper(cluster, graph):
+    """The file a cluster keeps: smallest that isn't upscaled, then preferred format, then most used.
+
+    Resolution only decides when a smaller copy is narrower than DISPLAY_WIDTH
+    (or than the widest copy, if every copy is narrower).
+    """
+    def width(fp):
+        return fp["dims"][0] if fp["dims"] else 0
+    needed = min(DISPLAY_WIDTH, max(width(fp) for fp in cluster))
+
+    def rank(fp):
+        suffix = posixpath.splitext(fp["rel"])[1].lower()
+        return (width(fp) < needed, fp["bytes"], FORMAT_RANK.get(suffix, 9),
+                -sum(graph.get(fp["rel"], {}).values()), fp["rel"])
+    return min(cluster, key=rank)["rel"]
+
+
+# ===================================================================
+# Plan + apply
+# ===================================================================
+
+def _kept_by_pattern(rel):
+    return any(fnmatch.fnmatchcase(rel, pattern) for pattern in KEEP_PATTERNS)
+
+
+def _is_size_variant(rel):
+    return bool(_SIZE_SUFFIX_RE.search(posixpath.splitext(rel)[0]))
+
+
+def plan(graph, pinned, clusters, files):
+    """The proposed change: (mapping {dropped duplicate: keeper}, [unused images], [stray placeholders]).
+
+    A duplicate only pinned references point at stays on disk; its other
+    references are still rewritten to the keeper.
+    """
+    mapping = {}
+    for cluster in clusters:
+        keeper = choose_keeper(cluster, graph)
+        for fp in cluster:
+            if fp["rel"] != keeper and not _kept_by_pattern(fp["rel"]):
+                mapping[fp["rel"]] = keeper
+    # A size variant (-mobile, -800w, ...) of a file in use is picked by viewport, not dead.
+    in_use = {size_variant_key(rel) for rel in files if rel in graph or _kept_by_pattern(rel)}
+    unused = [rel for rel in files if posixpath.splitext(rel)[1].lower() in IMAGE_SUFFIXES
+              and rel not in graph and rel not in mapping and not _kept_by_pattern(rel)
+              and not (_is_size_variant(rel) and size_variant_key(rel) in in_use)]
+    strays = []
+    for rel in files:
+        if posixpath.basename(rel) in PLACEHOLDER_NAMES:
+            siblings = [f for f in files if f.startswith(posixpath.dirname(rel) + "/") and f != rel]
+            if siblings:
+                strays.append(rel)
+    return mapping, unused, strays
+
+
+def dropped_files(mapping, unused, strays, pinned):
+    """Files the plan deletes: duplicates nothing pinned needs, unused images, stray placeholders."""
+    return sorted({rel for rel in mapping if rel not in pinned} | set(unused) | set(strays))
+
+
+def rewrite_token(token, source_rel, new_asset):
+    """token re-pointed at new_asset, in the same URL form (absolute, root-relative or file-relative)."""
+    marker = token.find("/assets/")
+    if token.startswith("/") or token.lower().startswith("http"):
+        return token[:marker + 1] + quote(new_asset)
+    return quote(posixpath.relpath(new_asset, posixpath.dirname(source_rel)))
+
+
+def rewrite_source(text, source_rel, refs, mapping):
+    """text with every unpinned reference to a mapped asset rewritten. Returns (text, count)."""
+    out, last, count = [], 0, 0
+    for start, end, token, asset, is_pinned in refs:
+        if asset in mapping and not is_pinned:
+            out += [text[last:start], rewrite_token(token, source_rel, mapping[asset])]
+            last = end
+            count += 1
+    return "".join(out) + text[last:], count
+
+
+# ===================================================================
+# Main
+# ===================================================================
+
+def _kb(n):
+    return f"{n / 1024:.1f} KB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reference graph of assets/ with unused and duplicate image detection")
+    parser.add_argument("--write", action="store_true", help="Rewrite references and delete dropped files (default: dry run)")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if anything would change (implies dry run)")
+    parser.add_argument("--distance", type=int, default=DEFAULT_DISTANCE,
+                        help=f"Max perceptual-hash bit difference for duplicates (default: {DEFAULT_DISTANCE})")
+    parser.add_argument("--workers", type=int, default=None, help="Hashing processes (default: CPU count)")
+    parser.add_argument("--report", default=None, metavar="PATH", help="Write the graph and the plan as JSON")
+    args = parser.parse_args()
+    write = args.write and not args.check
+
+    print("=" * 60)
+    print("  Elevate Repair — Asset Graph")
+    print("=" * 60)
+    print(f"  Mode: {'WRITE' if write else 'DRY RUN'}")
+
+    sources = reference_sources()
+    graph, refs_by_source, variants, pinned = build_graph(sources)
+    files = asset_files()
+    sizes = {rel: (REPO_ROOT / rel).stat().st_size for rel in files}
+    images = [rel for rel in files if posixpath.splitext(rel)[1].lower() in IMAGE_SUFFIXES]
+    missing = sorted(asset for asset in graph if asset not in sizes)
+    print(f"  Sources: {len(sources)} files, {sum(len(r) for r in refs_by_source.values())} asset references")
+    print(f"  Assets:  {len(files)} files ({_kb(sum(sizes.values()))}), {len(images)} images")
+
+    prints = fingerprint_all(images, args.workers)
+    clusters = duplicate_clusters(prints, variants, args.distance)
+    mapping, unused, strays = plan(graph, pinned, clusters, files)
+    dropped = dropped_files(mapping, unused, strays, pinned)
+
+    for cluster in clusters:
+        keeper = next((mapping[fp["rel"]] for fp in cluster if fp["rel"] in mapping), None)
+        if keeper is None:
+            continue  # every other member is kept by KEEP_PATTERNS
+        print(f"\n  Duplicates → {keeper}")
+        for fp in cluster:
+            rel = fp["rel"]
+            dims = "{}x{}".format(*fp["dims"]) if fp["dims"] else "vector"
+            uses = sum(graph.get(rel, {}).values())
+            if rel == keeper:
+                action = "keep"
+            elif rel not in mapping:
+                action = "kept: named by a tool (KEEP_PATTERNS)"
+            elif rel in dropped:
+                action = "drop"
+            else:
+                action = "rewrite; file kept for <meta>/<source> references"
+            print(f"    {'=' if rel == keeper else '~'} {rel}  {dims}, {_kb(fp['bytes'])}, {uses} reference(s)  [{action}]")
+    if unused:
+        print("\n  Unused images:")
+        for rel in unused:
+            print(f"    - {rel}  {_kb(sizes[rel])}")
+    if strays:
+        print("\n  Stray placeholders:")
+        for rel in strays:
+            print(f"    - {rel}")
+    if missing:
+        print("\n  Referenced but missing:")
+        for rel in missing:
+            print(f"    ! {rel}  ({', '.join(sorted(graph[rel])[:3])}{', ...' if len(graph[rel]) > 3 else ''})")
+
+    rewritten, rewrites = [], 0
+    for source_rel, refs in refs_by_source.items():
+        if not any(asset in mapping and not is_pinned for _, _, _, asset, is_pinned in refs):
+            continue
+        path = REPO_ROOT / source_rel
+        text = load_page(path).html if path.suffix == ".html" else path.read_text(encoding="utf-8")
+        new_text, count = rewrite_source(text, source_rel, refs, mapping)
+        rewritten.append(source_rel)
+        rewrites += count
+        if write:
+            if path.suffix == ".html":
+                write_page(path, new_text)
+            else:
+                path.write_text(new_text, encoding="utf-8")
+    if write:
+        for rel in dropped:
+            (REPO_ROOT / rel).unlink()
+
+    saved = sum(sizes[rel] for rel in dropped)
+    print(f"\n  Duplicates: {len(mapping)} file(s) mapped to a keeper")
+    print(f"  References {'rewritten' if write else 'to rewrite'}: {rewrites} in {len(rewritten)} file(s)")
+    print(f"  Files {'deleted' if write else 'to delete'}: {len(dropped)} ({_kb(saved)} of {_kb(sum(sizes.values()))})")
+    if args.report:
+        report = {
+            "graph": {asset: graph[asset] for asset in sorted(graph)},
+            "unreferenced": [rel for rel in files if rel not in graph],
+            "missing": missing,
+            "clusters": [[fp["rel"] for fp in cluster] for cluster in clusters],
+            "mapping": mapping,
+            "unused": unused,
+            "strays": strays,
+            "dropped": dropped,
+            "rewritten": rewritten,
+            "bytes_saved": saved,
+        }
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n  Report written to {args.report}")
+    changed = bool(rewritten or dropped)
+    if args.check:
+        return 1 if changed else 0
+    if changed and not write:
+        print("\n  Dry run — re-run with --write to apply.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+booking_load_test.py — Async load generator for the booking form endpoint.
+
+Replays realistic #bookingForm submissions built from the live pages: each
+payload uses a real page's hidden `source` value (website-<slug>, as the
+city template's {{AREA_SLUG}} slot fills it), one of that page's service
+buttons, and an address from tools/data/service_zips.csv. Arrivals are open-loop
+(Poisson at --rate for --duration, or a --burst of simultaneous posts), so a
+slow endpoint builds a backlog the way an ad-campaign spike would.
+
+Reports offered vs achieved throughput, latency percentiles and every lost
+submission: failed requests, plus — with --reconcile against
+tools/booking_stub_server.py — requests that got a 200 but were never
+recorded.
+
+Usage:
+    python3 tools/booking_stub_server.py --port 8780 --max-concurrent 30 --max-rps 20 &
+    python3 tools/booking_load_test.py --url http://127.0.0.1:8780/exec --rate 40 --duration 30 --reconcile
+    python3 tools/booking_load_test.py --url http://127.0.0.1:8780/exec --burst 200 --source website-aurora
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import random
+import re
+import ssl
+import sys
+import time
+import uuid
+from urllib.parse import urlencode, urlsplit
+
+from page_model import load_page
+from site_pages import REPO_ROOT, iter_site_pages, page_url
+
+ZIP_DATASET = REPO_ROOT / "tools" / "data" / "service_zips.csv"
+
+STREETS = ["Colfax Ave", "Broadway", "Grant St", "Downing St", "York St", "Colorado Blvd", "Alameda Ave",
+           "Evans Ave", "Federal Blvd", "Sheridan Blvd", "Wadsworth Blvd", "Kipling St", "Quebec St",
+           "Havana St", "Arapahoe Rd", "Dry Creek Rd", "120th Ave", "Main St", "Elm St", "Maple Ave"]
+FIRST_NAMES = ["Alex", "Jordan", "Sam", "Taylor", "Chris", "Morgan", "Pat", "Jamie", "Casey", "Riley"]
+MESSAGES = ["", "", "Not working since this morning", "Making a loud noise", "Leaking onto the floor",
+            "Stopped heating", "Error code on the display", "Won't turn on"]
+
+_FORM_RE = re.compile(r'<form[^>]*id="bookingForm"[^>]*action="([^"]+)"', re.DOTALL)
+_SOURCE_RE = re.compile(r'name="source" value="([^"]+)"')
+_SERVICE_RE = re.compile(r'data-service="([^"]+)"')
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+# ===================================================================
+# Payloads
+# ===================================================================
+
+def collect_form_profiles():
+    """One profile per page with a booking form: url, action, source, services."""
+    profiles = []
+    for path in iter_site_pages():
+        html = load_page(path).html
+        form = _FORM_RE.search(html)
+        source = _SOURCE_RE.search(html)
+        if not form or not source:
+            continue
+        profiles.append({
+            "page": page_url(path),
+            "action": form.group(1),
+            "source": source.group(1),
+            "services": sorted(set(_SERVICE_RE.findall(html))) or ["Other Appliance"],
+        })
+    return profiles
+
+
+def load_addresses():
+    """(city, zip) pairs from the service-area dataset."""
+    with open(ZIP_DATASET, newline="") as f:
+        rows = csv.DictReader(line for line in f if line.strip() and not line.startswith("#"))
+        return [(row["place"].split(" (")[0].split(" / ")[0], row["zip"]) for row in rows]
+
+
+def build_payload(profile, addresses, rng, submission_id):
+    """Form fields exactly as #bookingForm posts them, tagged with a load-test id."""
+    city, zip_code = rng.choice(addresses)
+    return {
+        "website": "",  # honeypot, always empty for real visitors
+        "source": profile["source"],
+        "service": rng.choice(profile["services"]),
+        "place_id": "",
+        "zip": zip_code,
+        "city": city,
+        "state": "CO",
+        "name": f"{rng.choice(FIRST_NAMES)} Loadtest",
+        "phone": f"(720) 555-{rng.randint(100, 199):04d}",
+        "address": f"{rng.randint(100, 19999)} {rng.choice(STREETS)}, {city}, CO {zip_code}",
+        "unit": "",
+        "message": " ".join(filter(None, [rng.choice(MESSAGES), "[load test]"])),
+        "loadtest_id": submission_id,
+    }
+
+
+# ===================================================================
+# Async HTTP
+# ===================================================================
+
+async def post_form(url, fields, timeout):
+    """POST x-www-form-urlencoded fields. Returns (status, seconds to response headers)."""
+    parts = urlsplit(url)
+    https = parts.scheme == "https"
+    port = parts.port or (443 if https else 80)
+    path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    body = urlencode(fields).encode()
+
+    started = time.monotonic()
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(parts.hostname, port, ssl=ssl.create_default_context() if https else None),
+        timeout,
+    )
+    try:
+        writer.write(
+            f"POST {path} HTTP/1.1\r\nHost: {parts.netloc}\r\n"
+            f"Content-Type: application/x-www-form-urlencoded\r\nContent-Length: {len(body)}\r\n"
+            f"User-Agent: elevate-booking-load-test\r\nConnection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout - (time.monotonic() - started))
+        elapsed = time.monotonic() - started
+        if not status_line:
+            raise ConnectionError("connection closed without a response")
+        status = int(status_line.split()[1])
+        await asyncio.wait_for(reader.read(), max(timeout - elapsed, 1))
+        return status, elapsed
+    finally:
+        writer.close()
+
+
+async def fetch_json(url, timeout=10):
+    """GET a JSON document (used for reconciliation)."""
+    parts = urlsplit(url)
+    https = parts.scheme == "https"
+    reader, writer = await asyncio.open_connection(parts.hostname, parts.port or (443 if https else 80),
+                                                   ssl=ssl.create_default_context() if https else None)
+    try:
+        writer.write(f"GET {parts.path} HTTP/1.1\r\nHost: {parts.netloc}\r\nConnection: close\r\n\r\n".encode())
+        await writer.drain()
+        raw = await asyncio.wait_for(reader.read(), timeout)
+    finally:
+        writer.close()
+    head, _, body = raw.partition(b"\r\n\r\n")
+    if b"chunked" in head.lower():
+        raise ValueError("chunked responses are not supported")
+    return json.loads(body)
+
+
+# ===================================================================
+# Run + report
+# ===================================================================
+
+async def run_load(url, payloads, rate=None, duration=None, burst=None, timeout=30.0, max_connections=500, seed=None):
+    """Send payloads open-loop. Returns (results, wall_seconds)."""
+    rng = random.Random(seed)
+    slots = asyncio.Semaphore(max_connections)
+    results = []
+
+    async def send(submission_id, profile, fields):
+        result = {"id": submission_id, "source": profile["source"], "page": profile["page"],
+                  "status": None, "latency": None, "error": None}
+        async with slots:
+            try:
+                result["status"], result["latency"] = await post_form(url, fields, timeout)
+                if result["status"] >= 400:
+                    result["error"] = f"HTTP {result['status']}"
+            except asyncio.TimeoutError:
+                result["error"] = "timeout"
+            except (OSError, ConnectionError, ValueError, IndexError) as e:
+                result["error"] = f"{type(e).__name__}: {e}"
+        results.append(result)
+
+    started = time.monotonic()
+    tasks = []
+    if burst:
+        for _ in range(burst):
+            tasks.append(asyncio.ensure_future(send(*next(payloads))))
+    else:
+        deadline = started + duration
+        next_at = started
+        while next_at < deadline:
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.ensure_future(send(*next(payloads))))
+            next_at += rng.expovariate(rate)
+    await asyncio.gather(*tasks)
+    return results, time.monotonic() - started
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(results, wall, offered_rate=None, recorded_ids=None):
+    """Aggregate results into a report dict (lost = failed + accepted-but-unrecorded)."""
+    accepted = [r for r in results if r["error"] is None]
+    latencies = sorted(r["latency"] for r in accepted)
+    errors = {}
+    for r in results:
+        if r["error"]:
+            kind = r["error"].split(":")[0]
+            errors[kind] = errors.get(kind, 0) + 1
+
+    lost = [dict(r, reason=r["error"]) for r in results if r["error"]]
+    if recorded_ids is not None:
+        lost += [dict(r, reason="accepted but not recorded") for r in accepted if r["id"] not in recorded_ids]
+
+    by_source = {}
+    for r in results:
+        stats = by_source.setdefault(r["source"], {"sent": 0, "lost": 0})
+        stats["sent"] += 1
+    for r in lost:
+        by_source[r["source"]]["lost"] += 1
+
+    return {
+        "sent": len(results),
+        "accepted": len(accepted),
+        "lost": len(lost),
+        "errors": errors,
+        "wall_s": wall,
+        "offered_rps": offered_rate if offered_rate else (len(results) / wall if wall else 0.0),
+        "throughput_rps": len(accepted) / wall if wall else 0.0,
+        "latency_s": {f"p{p}": percentile(latencies, p) for p in PERCENTILES} | {
+            "max": latencies[-1] if latencies else None},
+        "reconciled": recorded_ids is not None,
+        "by_source": by_source,
+        "lost_submissions": lost,
+    }
+
+
+def print_report(report):
+    print(f"\n  Sent:        {report['sent']}")
+    print(f"  Accepted:    {report['accepted']}")
+    for kind, count in sorted(report["errors"].items(), key=lambda kv: -kv[1]):
+        print(f"    ! {kind}: {count}")
+    print(f"  Offered:     {report['offered_rps']:.1f} req/s")
+    print(f"  Throughput:  {report['throughput_rps']:.1f} accepted/s over {report['wall_s']:.1f}s")
+    latency = report["latency_s"]
+    if latency["max"] is not None:
+        print("  Latency:     " + "  ".join(f"{k} {v * 1000:.0f}ms" for k, v in latency.items()))
+    note = "" if report["reconciled"] else " (failed requests only; use --reconcile to catch silent drops)"
+    print(f"  Lost:        {report['lost']}{note}")
+    worst = sorted(((s, v) for s, v in report["by_source"].items() if v["lost"]), key=lambda kv: -kv[1]["lost"])
+    for source, stats in worst[:10]:
+        print(f"    - {source}: {stats['lost']} of {stats['sent']} lost")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Async load test for the booking form endpoint")
+    parser.add_argument("--url", required=True, help="Endpoint to POST to (e.g. the stub's /exec)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--rate", type=float, default=10.0, help="Poisson arrival rate, submissions/s (default: 10)")
+    mode.add_argument("--burst", type=int, default=None, help="Fire N submissions at once instead")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to generate load at --rate (default: 30)")
+    parser.add_argument("--source", action="append", default=None, metavar="website-SLUG",
+                        help="Only replay pages with this source value (repeatable), e.g. an ad landing city")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds (default: 30)")
+    parser.add_argument("--max-connections", type=int, default=500, help="Open sockets cap (default: 500)")
+    parser.add_argument("--reconcile", action="store_true",
+                        help="Compare against the stub's GET /submissions to find accepted-but-unrecorded posts")
+    parser.add_argument("--report", default=None, metavar="PATH", help="Write the full JSON report here")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--allow-production", action="store_true",
+                        help="Required to target script.google.com (creates real leads)")
+    args = parser.parse_args()
+
+    if "script.google.com" in args.url and not args.allow_production:
+        parser.error("refusing to load-test the production Apps Script endpoint without --allow-production")
+
+    profiles = collect_form_profiles()
+    if args.source:
+        profiles = [p for p in profiles if p["source"] in set(args.source)]
+    if not profiles:
+        print("ERROR: no booking forms matched", file=sys.stderr)
+        return 1
+    addresses = load_addresses()
+    rng = random.Random(args.seed)
+    run_id = uuid.uuid4().hex[:8]
+
+    def payloads():
+        for seq in range(1, sys.maxsize):
+            profile = rng.choice(profiles)
+            submission_id = f"{run_id}-{seq:06d}"
+            yield submission_id, profile, build_payload(profile, addresses, rng, submission_id)
+
+    sources = len({p["source"] for p in profiles})
+    plan = f"burst of {args.burst}" if args.burst else f"{args.rate:g}/s for {args.duration:g}s"
+    print("=" * 60)
+    print("  Elevate Repair — Booking Endpoint Load Test")
+    print("=" * 60)
+    print(f"  Target:   {args.url}")
+    print(f"  Load:     {plan} from {len(profiles)} page(s), {sources} source value(s)")
+    print(f"  Run id:   {run_id}")
+
+    results, wall = asyncio.run(run_load(
+        args.url, payloads(), rate=args.rate, duration=args.duration, burst=args.burst,
+        timeout=args.timeout, max_connections=args.max_connections, seed=args.seed,
+    ))
+
+    recorded = None
+    if args.reconcile:
+        parts = urlsplit(args.url)
+        listing = asyncio.run(fetch_json(f"{parts.scheme}://{parts.netloc}/submissions"))
+        recorded = {i for i in listing["ids"] if i and i.startswith(run_id)}
+
+    report = summarize(results, wall, offered_rate=None if args.burst else args.rate, recorded_ids=recorded)
+    report["run_id"] = run_id
+    print_report(report)
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n  Report written to {args.report}")
+    return 1 if report["lost"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
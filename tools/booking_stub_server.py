@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+booking_stub_server.py — Local stand-in for the booking form's Apps Script endpoint.
+
+Every page's #bookingForm POSTs (x-www-form-urlencoded) to a Google Apps
+Script /exec URL through a hidden iframe. This server accepts the same
+submissions and can be made to behave like the real endpoint under load:
+
+    --latency / --jitter    lognormal service time (median seconds, sigma)
+    --max-concurrent        executions running at once; extra requests queue
+    --queue-timeout         ...and get a 503 if they wait longer than this
+    --max-rps               token-bucket throughput cap; excess gets a 429
+    --error-rate            fraction answered with a 500
+    --drop-rate             fraction answered 200 but never recorded (silent loss)
+
+Recorded submissions can be read back for loss reconciliation:
+
+    POST /exec (or any path)   record a submission
+    GET  /submissions          {"count": n, "ids": [...]} (ids from the loadtest_id field)
+    POST /reset                clear recorded submissions
+
+Usage:
+    python3 tools/booking_stub_server.py --port 8780 --latency 0.4 --max-concurrent 30 --max-rps 20
+    python3 tools/booking_load_test.py --url http://127.0.0.1:8780/exec --rate 40 --duration 30
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+RESPONSE_HTML = b"<!DOCTYPE html><html><body>Thank you</body></html>"
+
+
+class TokenBucket:
+    """Allows `rate` events per second with bursts up to `rate` (thread-safe)."""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class BookingState:
+    """Recorded submissions plus the configured failure behaviour."""
+
+    def __init__(self, latency=0.3, jitter=0.5, max_concurrent=None, queue_timeout=10.0,
+                 max_rps=None, error_rate=0.0, drop_rate=0.0, log_path=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.slots = threading.BoundedSemaphore(max_concurrent) if max_concurrent else None
+        self.queue_timeout = queue_timeout
+        self.bucket = TokenBucket(max_rps) if max_rps else None
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.log_path = log_path
+        self.submissions = []
+        self.lock = threading.Lock()
+
+    def service_time(self):
+        if self.latency <= 0:
+            return 0.0
+        return random.lognormvariate(0, self.jitter) * self.latency if self.jitter else self.latency
+
+    def record(self, fields):
+        row = {"received_at": time.time(), **{k: v[0] for k, v in fields.items()}}
+        with self.lock:
+            self.submissions.append(row)
+            if self.log_path:
+                with open(self.log_path, "a") as f:
+                    f.write(json.dumps(row) + "\n")
+
+
+class BookingHandler(BaseHTTPRequestHandler):
+    state = None  # set by serve()
+    quiet = False
+
+    def log_message(self, fmt, *args):
+        if not self.quiet:
+            super().log_message(fmt, *args)
+
+    def _send(self, status, body, content_type="text/html; charset=utf-8"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/submissions":
+            with self.state.lock:
+                ids = [s.get("loadtest_id") for s in self.state.submissions]
+            body = json.dumps({"count": len(ids), "ids": ids}).encode()
+            return self._send(200, body, "application/json")
+        self._send(404, b"Not found")
+
+    def do_POST(self):
+        state = self.state
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length)
+
+        if self.path.rstrip("/") == "/reset":
+            with state.lock:
+                state.submissions.clear()
+            return self._send(200, b"reset")
+
+        if state.bucket and not state.bucket.take():
+            return self._send(429, b"Service invoked too many times in a short time.")
+        if state.slots and not state.slots.acquire(timeout=state.queue_timeout):
+            return self._send(503, b"Too many simultaneous invocations.")
+        try:
+            time.sleep(state.service_time())
+            if random.random() < state.error_rate:
+                return self._send(500, b"Script error")
+            fields = parse_qs(raw.decode("utf-8", errors="replace"), keep_blank_values=True)
+            if random.random() >= state.drop_rate:
+                state.record(fields)
+            self._send(200, RESPONSE_HTML)
+        finally:
+            if state.slots:
+                state.slots.release()
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+def serve(host="127.0.0.1", port=8780, quiet=True, **state_kwargs):
+    """Start the stub server (blocking)."""
+    BookingHandler.state = BookingState(**state_kwargs)
+    BookingHandler.quiet = quiet
+    server = _Server((host, port), BookingHandler)
+    print(f"Booking endpoint stub listening on http://{host}:{port}/exec")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the booking form's Apps Script endpoint")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8780)
+    parser.add_argument("--latency", type=float, default=0.3, help="Median service time in seconds (default: 0.3)")
+    parser.add_argument("--jitter", type=float, default=0.5, help="Lognormal sigma for service time (0 = fixed)")
+    parser.add_argument("--max-concurrent", type=int, default=None, help="Simultaneous executions allowed")
+    parser.add_argument("--queue-timeout", type=float, default=10.0,
+                        help="Seconds a request may wait for an execution slot before a 503 (default: 10)")
+    parser.add_argument("--max-rps", type=float, default=None, help="Requests per second before 429s")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that get a 500")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Fraction accepted with 200 but not recorded")
+    parser.add_argument("--log", default=None, metavar="PATH", help="Append recorded submissions to a JSONL file")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+    serve(args.host, args.port, quiet=not args.verbose, latency=args.latency, jitter=args.jitter,
+          max_concurrent=args.max_concurrent, queue_timeout=args.queue_timeout, max_rps=args.max_rps,
+          error_rate=args.error_rate, drop_rate=args.drop_rate, log_path=args.log)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+build_dist.py — Build the publishable site into dist/ and compute the deploy delta.
+
+The generators and build stages edit the repo root in place, which is also
+what gets deployed, so every deploy uploaded the whole tree (tools/,
+templates, request logs) and two generators could not run at once. This
+builds a separate, publish-only copy instead:
+
+  1. Collect what the site serves: the pages (site_pages.py) plus every
+     other file outside tools/, the legacy *-repair-denver/ directories
+     (301-redirected, see .htaccess and _redirects) and repo housekeeping
+     files. Dotfiles are skipped unless listed in PUBLISHED_DOTFILES.
+  2. Run the build stages in memory, in the usual order: partials
+     (build_partials.py), third-party tag deferral (defer_third_party.py),
+     LCP image priority (lcp_priority.py), speculation rules
+     (speculation_rules.py) and shared inline script extraction
+     (extract_inline_scripts.py). The repo's own files are not touched.
+  3. Lint every page (seo_lint.py); any error fails the build before the swap.
+  4. Hash every file into a manifest ({path: sha256}) and generate /sw.js,
+     whose precache entries carry those hashes (service_worker.py). The
+     build id is the hash of the manifest, so identical inputs give the
+     same build.
+  5. Write the build to .dist/tmp-*, rename it to .dist/<build id>/ and
+     atomically repoint the dist symlink at it. Readers of dist/ see either
+     the old build or the new one, never a half-written tree, and builds
+     running in parallel never share a directory.
+
+Each build directory holds site/ (what to upload) and manifest.json. The
+delta against the manifest of the last deployed build lists the files to
+upload and delete and the URLs to purge from the CDN, so a deploy only
+moves what changed. After a successful upload, --mark-deployed records the
+live build's manifest as the new baseline. The last KEEP_BUILDS builds are
+kept for rollback.
+
+Usage:
+    python3 tools/build_dist.py                       # build dist/ and print the delta
+    python3 tools/build_dist.py --delta delta.json    # also write upload/delete/purge lists
+    python3 tools/build_dist.py --mark-deployed       # record the live build as deployed
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import build_partials
+import defer_third_party
+import extract_inline_scripts
+import lcp_priority
+import seo_lint
+import service_worker
+import speculation_rules
+from page_model import load_page
+from site_pages import LEGACY_DIR_SUFFIX, REPO_ROOT, TEMPLATE_PAGES, iter_site_pages, page_url
+
+DIST_LINK = REPO_ROOT / "dist"
+BUILDS_DIR = REPO_ROOT / ".dist"
+DEPLOYED_PATH = BUILDS_DIR / "deployed.json"
+MANIFEST_VERSION = 1
+KEEP_BUILDS = 3
+
+# Top-level names that are never published.
+EXCLUDED_NAMES = {
+    "tools", "dist", "node_modules", "README.md", "requests.jsonl", "FEATURE_REQUESTS.md",
+    "test_output.txt", "bench_output.txt", "REVIEW_DIFF.patch",
+}
+EXCLUDED_SUFFIXES = {".py", ".pyc", ".mjs", ".md", ".jsonl", ".patch"}
+# Dotfiles the site needs (.htaccess: the legacy-directory 301s and clean-URL rewrites).
+PUBLISHED_DOTFILES = {".htaccess"}
+
+
+# ===================================================================
+# Collect + render
+# ===================================================================
+
+def _published(name):
+    return (not name.startswith(".") or name in PUBLISHED_DOTFILES) and name != "__pycache__"
+
+
+def source_files(root=REPO_ROOT):
+    """Repo-relative paths of every non-page file the site serves, sorted."""
+    stale_bundles = {p.relative_to(root).as_posix() for p in extract_inline_scripts.existing_bundles()}
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        top = Path(dirpath) == root
+        dirnames[:] = [d for d in dirnames if _published(d) and not (top and (
+            d in EXCLUDED_NAMES or d.endswith(LEGACY_DIR_SUFFIX)))]
+        for name in filenames:
+            if not _published(name) or Path(name).suffix in EXCLUDED_SUFFIXES or (top and name in EXCLUDED_NAMES):
+                continue
+            rel = (Path(dirpath) / name).relative_to(root).as_posix()
+            if not name.endswith(".html") and rel not in stale_bundles:
+                files.append(rel)
+    return sorted(files)
+
+
+def render_pages():
+    """Run the build stages over every page in memory. Returns ({rel: html}, bundle or None).
+
+    The templates go through the stages too, so script extraction counts the
+    same pages as the in-place build, but they aren't published.
+    """
+    partials = build_partials.load_partials()
+    site_urls = speculation_rules.site_url_set()
+    pages = {}
+    for path in [*iter_site_pages(), *TEMPLATE_PAGES]:
+        rel = path.relative_to(REPO_ROOT).as_posix()
+        html, _ = build_partials.render_partials(load_page(path).html, partials)
+        html, _ = defer_third_party.transform_page(rel, html)
+        html, _ = lcp_priority.transform_page(rel, html)
+        if path not in TEMPLATE_PAGES:
+            html, _ = speculation_rules.transform_page(rel, html, site_urls)
+        pages[rel] = html
+
+    existing_chunks = {}
+    for bundle in extract_inline_scripts.existing_bundles():
+        existing_chunks.update(extract_inline_scripts.read_bundle_chunks(bundle.read_text(encoding="utf-8")))
+    pages, name, js, _ = extract_inline_scripts.build(pages, existing_chunks)
+
+    for path in TEMPLATE_PAGES:
+        del pages[path.relative_to(REPO_ROOT).as_posix()]
+    pages = {rel: service_worker.inject_registration(html) for rel, html in pages.items()}
+    bundle = None
+    if name:
+        bundle = ((extract_inline_scripts.BUNDLE_DIR / name).relative_to(REPO_ROOT).as_posix(), js)
+    return pages, bundle
+
+
+def _lint_page(args):
+    rel, html = args
+    return rel, [f for f in seo_lint.lint_html(html, rel) if f["level"] == "error"]
+
+
+def lint_errors(pages, workers=None):
+    """{rel: error findings} for pages with lint errors."""
+    jobs = list(pages.items())
+    if len(jobs) < 8 or workers == 1:
+        results = [_lint_page(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunk = max(len(jobs) // ((workers or os.cpu_count() or 1) * 4), 1)
+            results = list(pool.map(_lint_page, jobs, chunksize=chunk))
+    return {rel: errors for rel, errors in results if errors}
+
+
+# ===================================================================
+# Manifest + delta
+# ===================================================================
+
+def file_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def build_id(files):
+    """Content id of a build: the hash of its {path: hash} map."""
+    return file_hash(json.dumps(files, sort_keys=True).encode())[:12]
+
+
+def load_manifest(path):
+    """{path: hash} from a manifest file; empty if there is none yet."""
+    if not Path(path).exists():
+        return {}
+    with open(path) as f:
+        manifest = json.load(f)
+    return manifest["files"] if manifest.get("v") == MANIFEST_VERSION else {}
+
+
+def purge_url(rel):
+    if rel.endswith(".html"):
+        return page_url(REPO_ROOT / rel)
+    return "/" + rel
+
+
+def compute_delta(deployed, current):
+    """Upload / delete / purge lists taking a site from `deployed` to `current` ({path: hash})."""
+    upload = sorted(rel for rel, h in current.items() if deployed.get(rel) != h)
+    delete = sorted(set(deployed) - set(current))
+    # New files have nothing cached at the edge; changed and deleted ones do.
+    purge = sorted({purge_url(rel) for rel in [*upload, *delete] if rel in deployed})
+    return {"upload": upload, "delete": delete, "purge": purge}
+
+
+# ===================================================================
+# Write + swap
+# ===================================================================
+
+def write_build(contents, files):
+    """Write a build to .dist/<build id>/ unless it already exists. Returns (build dir, reused)."""
+    bid = build_id(files)
+    final = BUILDS_DIR / bid
+    if final.exists():
+        return final, True
+
+    BUILDS_DIR.mkdir(exist_ok=True)
+    staging = BUILDS_DIR / f"tmp-{os.getpid()}-{time.time_ns()}"
+    try:
+        site = staging / "site"
+        for rel, data in contents.items():
+            target = site / rel
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if isinstance(data, Path):
+                shutil.copyfile(data, target)
+            else:
+                target.write_bytes(data)
+        manifest = {"v": MANIFEST_VERSION, "build": bid, "files": files}
+        with open(staging / "manifest.json", "w") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+            f.write("\n")
+        try:
+            os.rename(staging, final)
+        except OSError:
+            if not final.exists():
+                raise
+            # A parallel build with the same inputs finished first.
+            shutil.rmtree(staging)
+            return final, True
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return final, False
+
+
+def swap_live(build_dir):
+    """Atomically point dist at build_dir/site."""
+    if DIST_LINK.exists() and not DIST_LINK.is_symlink():
+        raise RuntimeError(f"{DIST_LINK.relative_to(REPO_ROOT)}/ is a real directory; remove it once")
+    tmp_link = REPO_ROOT / f".dist-link-{os.getpid()}"
+    os.symlink(Path(build_dir.relative_to(REPO_ROOT)) / "site", tmp_link)
+    os.replace(tmp_link, DIST_LINK)
+
+
+def live_build():
+    """The build directory dist currently points at, or None."""
+    if not DIST_LINK.is_symlink():
+        return None
+    return DIST_LINK.resolve().parent
+
+
+def prune_builds(keep=KEEP_BUILDS):
+    """Delete all but the newest `keep` builds, never the live or the deployed one."""
+    deployed = None
+    if DEPLOYED_PATH.exists():
+        with open(DEPLOYED_PATH) as f:
+            deployed = json.load(f).get("build")
+    protected = {live_build(), BUILDS_DIR / deployed if deployed else None}
+    builds = sorted((p for p in BUILDS_DIR.iterdir() if p.is_dir() and not p.name.startswith("tmp-")),
+                    key=lambda p: p.stat().st_mtime, reverse=True)
+    removed = []
+    for old in builds[keep:]:
+        if old not in protected:
+            shutil.rmtree(old)
+            removed.append(old.name)
+    return removed
+
+
+# ===================================================================
+# Main
+# ===================================================================
+
+def print_delta(delta):
+    print(f"  Upload: {len(delta['upload'])}  Delete: {len(delta['delete'])}  Purge: {len(delta['purge'])}")
+    for key, mark in (("upload", "+"), ("delete", "-")):
+        for rel in delta[key][:20]:
+            print(f"    {mark} {rel}")
+        if len(delta[key]) > 20:
+            print(f"    ... {len(delta[key]) - 20} more")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the publishable site into dist/ with a deploy delta")
+    parser.add_argument("--delta", default=None, metavar="PATH", help="Write upload/delete/purge lists as JSON")
+    parser.add_argument("--deployed", default=str(DEPLOYED_PATH), metavar="PATH",
+                        help="Manifest of the deployed build to diff against (default: .dist/deployed.json)")
+    parser.add_argument("--mark-deployed", action="store_true",
+                        help="Record the live build's manifest as deployed, then exit")
+    parser.add_argument("--no-lint", action="store_true", help="Publish even if seo_lint reports errors")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for linting (default: CPU count)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  Elevate Repair — Dist Build")
+    print("=" * 60)
+
+    if args.mark_deployed:
+        build_dir = live_build()
+        if build_dir is None:
+            print("  No live build — run without --mark-deployed first.")
+            return 1
+        BUILDS_DIR.mkdir(exist_ok=True)
+        shutil.copyfile(build_dir / "manifest.json", DEPLOYED_PATH)
+        print(f"  Marked build {build_dir.name} as deployed")
+        return 0
+
+    started = time.monotonic()
+    pages, bundle = render_pages()
+    contents = {rel: html.encode() for rel, html in pages.items()}
+    if bundle:
+        contents[bundle[0]] = bundle[1].encode()
+    for rel in source_files():
+        contents[rel] = REPO_ROOT / rel
+    files = {rel: file_hash(data.read_bytes() if isinstance(data, Path) else data)
+             for rel, data in sorted(contents.items())}
+    sw = service_worker.render_sw(service_worker.precache_manifest(files, pages)).encode()
+    contents[service_worker.SW_PATH] = sw
+    files = dict(sorted({**files, service_worker.SW_PATH: file_hash(sw)}.items()))
+    print(f"  Files: {len(files)} ({len(pages)} pages)  "
+          f"Size: {sum(d.stat().st_size if isinstance(d, Path) else len(d) for d in contents.values()) / 1e6:.1f} MB")
+
+    if not args.no_lint:
+        errors = lint_errors(pages, args.workers)
+        if errors:
+            print(f"\n  Lint FAILED on {len(errors)} page(s); dist/ left as it was:")
+            for rel, findings in sorted(errors.items()):
+                for f in findings:
+                    print(f"    ! {rel}:{f['line']}  [{f['rule']}] {f['message']}")
+            return 1
+
+    build_dir, reused = write_build(contents, files)
+    swap_live(build_dir)
+    pruned = prune_builds()
+    print(f"  Build: {build_dir.name} ({'unchanged, reused' if reused else 'new'})  "
+          f"Time: {time.monotonic() - started:.2f}s")
+    print(f"  dist -> {build_dir.relative_to(REPO_ROOT)}/site"
+          + (f"  (pruned {len(pruned)} old build(s))" if pruned else ""))
+
+    deployed = load_manifest(args.deployed)
+    delta = compute_delta(deployed, files)
+    print(f"\n  Delta vs {'deployed build' if deployed else 'nothing deployed yet'}:")
+    print_delta(delta)
+    if args.delta:
+        with open(args.delta, "w") as f:
+            json.dump({"build": build_dir.name, **delta}, f, indent=2)
+            f.write("\n")
+        print(f"\n  Delta written to {args.delta}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+build_partials.py — Expand shared header / nav / footer partials into every page.
+
+The header (logo, phone, mega-nav with the service-areas menu) and the site
+footer live once in tools/partials/<name>.html. Pages and the tools/
+templates mark where each one goes, and the build keeps the expanded copy
+between the markers up to date, so the served HTML stays fully static:
+
+    <!-- PARTIAL:header -->
+    <header>...</header>
+    <!-- /PARTIAL:header -->
+
+To change the nav or add a city to the footer, edit the partial and run
+this with --write; every page is re-rendered in one parallel pass.
+
+tools/.partials-cache.json keeps each page's content hash and the partial
+hashes it was rendered with, so unchanged pages are skipped without being
+parsed. --adopt wraps pages that still carry a raw <header> or
+<footer class="site-footer"> in markers (replacing their copy with the
+partial's), which is how new hand-written pages join the system.
+
+Usage:
+    python3 tools/build_partials.py                   # dry run: list pages that would change
+    python3 tools/build_partials.py --write           # re-render pages + templates
+    python3 tools/build_partials.py --adopt --write   # also wrap unmarked headers/footers
+    python3 tools/build_partials.py --check           # exit 1 if any page is out of date
+    python3 tools/build_partials.py --check --staged  # ... among pages the staged change affects
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import changed_pages
+from page_model import load_page, write_page
+from site_pages import REPO_ROOT, TEMPLATE_PAGES, iter_site_pages
+
+PARTIALS_DIR = REPO_ROOT / "tools" / "partials"
+CACHE_PATH = REPO_ROOT / "tools" / ".partials-cache.json"
+CACHE_VERSION = 1
+
+_MARKER_RE = re.compile(
+    r"<!-- PARTIAL:(?P<name>[\w-]+) -->(?P<body>.*?)<!-- /PARTIAL:(?P=name) -->", re.S
+)
+
+# Raw blocks --adopt replaces with a marked partial (first match per page).
+ADOPT_PATTERNS = {
+    "header": re.compile(r"<header>.*?</header>", re.S),
+    "footer": re.compile(r'<footer class="site-footer">.*?</footer>', re.S),
+}
+
+
+# ===================================================================
+# Partials
+# ===================================================================
+
+def load_partials(directory=PARTIALS_DIR):
+    """{name: source} for every partial, with surrounding blank lines trimmed."""
+    return {p.stem: p.read_text(encoding="utf-8").strip("\n") for p in sorted(directory.glob("*.html"))}
+
+
+def partial_hashes(partials):
+    return {name: hashlib.sha1(src.encode()).hexdigest()[:12] for name, src in partials.items()}
+
+
+def _indent_of(html, pos):
+    line_start = html.rfind("\n", 0, pos) + 1
+    prefix = html[line_start:pos]
+    return prefix if not prefix.strip() else ""
+
+
+def expand(name, source, indent):
+    """The marked block for a partial, re-indented to sit at `indent` in a page."""
+    lines = source.splitlines()
+    base = min((len(l) - len(l.lstrip()) for l in lines if l.strip()), default=0)
+    body = "\n".join(indent + l[base:] if l.strip() else "" for l in lines)
+    return f"<!-- PARTIAL:{name} -->\n{body}\n{indent}<!-- /PARTIAL:{name} -->"
+
+
+def render_partials(html, partials):
+    """Re-expand every marked partial in a page.
+
+    Returns (new_html, names used). Unknown partial names raise KeyError so
+    a typo in a marker fails the build instead of shipping stale markup.
+    """
+    used = []
+
+    def repl(m):
+        name = m.group("name")
+        if name not in partials:
+            raise KeyError(f"unknown partial {name!r}")
+        used.append(name)
+        return expand(name, partials[name], _indent_of(html, m.start()))
+
+    return _MARKER_RE.sub(repl, html), used
+
+
+def adopt_partials(html, partials):
+    """Wrap raw header/footer blocks that aren't marked yet. Returns (new_html, names adopted)."""
+    adopted = []
+    marked = {m.group("name") for m in _MARKER_RE.finditer(html)}
+    for name, pattern in ADOPT_PATTERNS.items():
+        if name in marked or name not in partials:
+            continue
+        m = pattern.search(html)
+        if not m:
+            continue
+        html = html[:m.start()] + expand(name, partials[name], _indent_of(html, m.start())) + html[m.end():]
+        adopted.append(name)
+    return html, adopted
+
+
+# ===================================================================
+# Build
+# ===================================================================
+
+def _render_file(args):
+    """Worker: render one file. Returns (rel, new_html or None if unchanged, used, adopted)."""
+    rel, partials, adopt = args
+    html = load_page(REPO_ROOT / rel).html
+    adopted = []
+    new_html = html
+    if adopt:
+        new_html, adopted = adopt_partials(new_html, partials)
+    new_html, used = render_partials(new_html, partials)
+    return rel, (new_html if new_html != html else None), used, adopted
+
+
+def load_cache():
+    if not CACHE_PATH.exists():
+        return {"version": CACHE_VERSION, "pages": {}}
+    with open(CACHE_PATH) as f:
+        cache = json.load(f)
+    return cache if cache.get("version") == CACHE_VERSION else {"version": CACHE_VERSION, "pages": {}}
+
+
+def build(paths, partials, adopt=False, write=False, workers=None, use_cache=True):
+    """Render partials into `paths`. Returns (changed rels, adopted {rel: names}, skipped count)."""
+    hashes = partial_hashes(partials)
+    cache = load_cache() if use_cache else {"version": CACHE_VERSION, "pages": {}}
+
+    todo, digests, skipped = [], {}, 0
+    for path in paths:
+        rel = path.relative_to(REPO_ROOT).as_posix()
+        digests[rel] = hashlib.sha1(load_page(path).raw).hexdigest()
+        cached = cache["pages"].get(rel)
+        if (not adopt and cached and cached["hash"] == digests[rel]
+                and all(hashes.get(n) == h for n, h in cached["partials"].items())):
+            skipped += 1
+            continue
+        todo.append(rel)
+
+    jobs = [(rel, partials, adopt) for rel in todo]
+    if len(jobs) < 8 or workers == 1:
+        results = [_render_file(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunk = max(len(jobs) // ((workers or os.cpu_count() or 1) * 4), 1)
+            results = list(pool.map(_render_file, jobs, chunksize=chunk))
+
+    changed, adopted = [], {}
+    for rel, new_html, used, names in results:
+        if names:
+            adopted[rel] = names
+        if new_html is not None:
+            changed.append(rel)
+            if not write:
+                continue
+            write_page(REPO_ROOT / rel, new_html)
+            digests[rel] = hashlib.sha1(new_html.encode()).hexdigest()
+        cache["pages"][rel] = {"hash": digests[rel], "partials": {n: hashes[n] for n in used}}
+
+    if write or not changed:
+        with open(CACHE_PATH, "w") as f:
+            json.dump(cache, f, separators=(",", ":"))
+    return changed, adopted, skipped
+
+
+# ===================================================================
+# Main
+# ===================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Expand shared header/nav/footer partials into every page")
+    parser.add_argument("--write", action="store_true", help="Rewrite pages (default: dry run)")
+    parser.add_argument("--adopt", action="store_true", help="Wrap unmarked <header>/<footer> blocks in partial markers")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if any page is out of date (implies dry run)")
+    parser.add_argument("--force", action="store_true", help="Ignore the cache and render every page")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    changed_pages.add_arguments(parser)
+    args = parser.parse_args()
+
+    partials = load_partials()
+    if not partials:
+        print(f"No partials found in {PARTIALS_DIR.relative_to(REPO_ROOT)}/")
+        return 1
+    paths = changed_pages.select(args, [*iter_site_pages(), *TEMPLATE_PAGES])
+    write = args.write and not args.check
+
+    print("=" * 60)
+    print("  Elevate Repair — Partials Build")
+    print("=" * 60)
+    print(f"  Mode:     {'WRITE' if write else 'DRY RUN'}")
+    print(f"  Partials: {', '.join(f'{n} ({h})' for n, h in partial_hashes(partials).items())}")
+
+    changed, adopted, skipped = build(paths, partials, adopt=args.adopt, write=write,
+                                      workers=args.workers, use_cache=not args.force)
+
+    print(f"  Files:    {len(paths)}, {changed_pages.scope_label(args)} ({skipped} unchanged per cache)")
+    for rel in changed:
+        extra = f"  [adopted {', '.join(adopted[rel])}]" if rel in adopted else ""
+        print(f"    ~ {rel}{extra}")
+    print(f"\n  {'Rewritten' if write else 'Out of date'}: {len(changed)}")
+    if args.check:
+        return 1 if changed else 0
+    if changed and not write:
+        print("  Dry run — re-run with --write to apply.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+build_search_index.py — Prebuilt, prefix-sharded site search index.
+
+Extracts the title, H1 and visible body text of every published page and
+writes a static inverted index that assets/js/site-search.js queries in the
+browser, with no backend:
+
+    search-index/manifest.json   doc count, stopwords + content hash of every file below
+    search-index/docs.json       [[url, title], ...] indexed by doc id
+    search-index/<xx>.json       terms starting with "xx" and their postings
+
+A shard is {"t": [sorted terms], "p": [postings]}, where each posting list
+is a flat [doc_delta, weight, doc_delta, weight, ...] array: doc ids are
+ascending and stored as the gap from the previous id. Weights count title
+and H1 occurrences TITLE_WEIGHT / H1_WEIGHT times and body occurrences up
+to BODY_TF_CAP. The loader fetches only
+the two-character shard each query word needs and matches terms by prefix.
+
+Builds are incremental. tools/.search-index-cache.json keeps each page's
+content hash and extracted terms, so only changed pages are re-parsed; doc
+ids are stable across builds (freed ids are reused), so an edit only
+rewrites the shards whose postings actually changed.
+
+Usage:
+    python3 tools/build_search_index.py           # build / update the index
+    python3 tools/build_search_index.py --force   # ignore the cache, rebuild everything
+    python3 tools/build_search_index.py --check   # exit 1 if the index is out of date
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from collections import Counter
+
+from page_model import load_page
+from site_pages import REPO_ROOT, iter_site_pages, page_url
+
+INDEX_DIR = REPO_ROOT / "search-index"
+CACHE_PATH = REPO_ROOT / "tools" / ".search-index-cache.json"
+INDEX_VERSION = 2
+
+SHARD_PREFIX_LEN = 2
+TITLE_WEIGHT = 5
+H1_WEIGHT = 3
+# Body occurrences saturate so long pages don't outrank pages *about* a term.
+BODY_TF_CAP = 3
+MAX_WEIGHT = 255
+
+STOPWORDS = set("""
+a an and are as at be but by can do does for from has have how i if in into is it its may
+more most no not of on or our so than that the their them then there these they this to
+too up us was we were what when where which who why will with you your
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+# ===================================================================
+# Extraction
+# ===================================================================
+
+def tokenize(text):
+    """Lowercase word tokens with stopwords and one-letter words removed."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def extract_text(page):
+    """Return the (title, h1, body) text of a Page (page_model.py), whitespace-normalised."""
+    return page.title, page.h1, page.body_text
+
+
+def extract_page(page):
+    """Return (title, {term: weight}) for one Page."""
+    title, h1, body = extract_text(page)
+    # Drop the " | Elevate Repair" style suffix from the displayed title.
+    display_title = re.split(r"\s+[|–—-]\s+Elevate", title)[0].strip() or title
+
+    weights = Counter()
+    for token in tokenize(title):
+        weights[token] += TITLE_WEIGHT
+    for token in tokenize(h1):
+        weights[token] += H1_WEIGHT
+    for token, count in Counter(tokenize(body)).items():
+        weights[token] += min(count, BODY_TF_CAP)
+    return display_title, {term: min(w, MAX_WEIGHT) for term, w in weights.items()}
+
+
+# ===================================================================
+# Index build
+# ===================================================================
+
+def load_cache(force=False):
+    if force or not CACHE_PATH.exists():
+        return {"version": INDEX_VERSION, "pages": {}, "ids": {}}
+    with open(CACHE_PATH) as f:
+        cache = json.load(f)
+    if cache.get("version") != INDEX_VERSION:
+        return {"version": INDEX_VERSION, "pages": {}, "ids": {}}
+    return cache
+
+
+def collect_pages(cache):
+    """Extract every published page, reusing cached terms for unchanged content.
+
+    Returns (pages, parsed_count) where pages maps relpath -> cache record.
+    """
+    pages = {}
+    parsed = 0
+    for path in iter_site_pages():
+        rel = path.relative_to(REPO_ROOT).as_posix()
+        page = load_page(path)
+        digest = hashlib.sha1(page.raw).hexdigest()
+        cached = cache["pages"].get(rel)
+        if cached and cached["hash"] == digest:
+            pages[rel] = cached
+            continue
+        parsed += 1
+        if page.noindex:
+            pages[rel] = {"hash": digest, "skip": True}
+            continue
+        title, terms = extract_page(page)
+        pages[rel] = {"hash": digest, "url": page_url(path), "title": title, "terms": terms}
+    return pages, parsed
+
+
+def assign_ids(pages, previous_ids):
+    """Keep each page's previous doc id; give new pages the lowest free ids."""
+    live = [rel for rel, record in pages.items() if not record.get("skip")]
+    ids = {rel: previous_ids[rel] for rel in live if rel in previous_ids}
+    used = set(ids.values())
+    free = (i for i in range(len(live) + len(used) + 1) if i not in used)
+    for rel in live:
+        if rel not in ids:
+            ids[rel] = next(free)
+    return ids
+
+
+def build_shards(pages, ids):
+    """Return {shard_key: {"t": terms, "p": postings}} from extracted terms."""
+    postings = {}
+    for rel, doc_id in ids.items():
+        for term, weight in pages[rel]["terms"].items():
+            postings.setdefault(term, []).append((doc_id, weight))
+
+    shards = {}
+    for term in sorted(postings):
+        shard = shards.setdefault(term[:SHARD_PREFIX_LEN], {"t": [], "p": []})
+        flat, previous = [], 0
+        for doc_id, weight in sorted(postings[term]):
+            flat += [doc_id - previous, weight]
+            previous = doc_id
+        shard["t"].append(term)
+        shard["p"].append(flat)
+    return shards
+
+
+def _serialize(obj):
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def _write_if_changed(path, text):
+    """Write text to path unless it already has exactly that content. Returns True if written."""
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return False
+    path.write_text(text, encoding="utf-8")
+    return True
+
+
+def build_index(force=False, check=False):
+    """Build or update the index. Returns a stats dict."""
+    cache = load_cache(force)
+    pages, parsed = collect_pages(cache)
+    ids = assign_ids(pages, cache.get("ids", {}))
+
+    docs = [None] * (max(ids.values()) + 1 if ids else 0)
+    for rel, doc_id in ids.items():
+        docs[doc_id] = [pages[rel]["url"], pages[rel]["title"]]
+
+    files = {"docs.json": _serialize(docs)}
+    for key, shard in build_shards(pages, ids).items():
+        files[f"{key}.json"] = _serialize(shard)
+    manifest = {
+        "version": INDEX_VERSION,
+        "docs": len(ids),
+        "prefix": SHARD_PREFIX_LEN,
+        "stopwords": sorted(STOPWORDS),
+        "files": {name: hashlib.sha1(text.encode()).hexdigest()[:10] for name, text in sorted(files.items())},
+    }
+    files["manifest.json"] = _serialize(manifest)
+
+    existing = {p.name for p in INDEX_DIR.glob("*.json")} if INDEX_DIR.exists() else set()
+    stale = sorted(existing - set(files))
+    stats = {"pages": len(ids), "parsed": parsed, "written": [], "removed": stale,
+             "unchanged": 0, "bytes": sum(len(t.encode()) for t in files.values()), "shards": len(files) - 2}
+
+    if check:
+        for name, text in files.items():
+            path = INDEX_DIR / name
+            if not path.exists() or path.read_text(encoding="utf-8") != text:
+                stats["written"].append(name)
+        return stats
+
+    INDEX_DIR.mkdir(exist_ok=True)
+    for name, text in sorted(files.items()):
+        if _write_if_changed(INDEX_DIR / name, text):
+            stats["written"].append(name)
+        else:
+            stats["unchanged"] += 1
+    for name in stale:
+        (INDEX_DIR / name).unlink()
+
+    with open(CACHE_PATH, "w") as f:
+        json.dump({"version": INDEX_VERSION, "pages": pages, "ids": ids}, f, separators=(",", ":"))
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the prefix-sharded client-side search index")
+    parser.add_argument("--force", action="store_true", help="Ignore the build cache and re-parse every page")
+    parser.add_argument("--check", action="store_true", help="Don't write; exit 1 if the index is out of date")
+    args = parser.parse_args()
+
+    stats = build_index(force=args.force, check=args.check)
+    print(f"  Pages indexed:  {stats['pages']} ({stats['parsed']} file(s) re-parsed, the rest from cache)")
+    print(f"  Shards:         {stats['shards']}")
+    print(f"  Index size:     {stats['bytes'] / 1024:.1f} KB in {INDEX_DIR.relative_to(REPO_ROOT)}/")
+
+    if args.check:
+        stale = stats["written"] + stats["removed"]
+        if stale:
+            print(f"  OUT OF DATE: {len(stale)} file(s) differ — run tools/build_search_index.py")
+            return 1
+        print("  Index is up to date")
+        return 0
+
+    print(f"  Written:        {len(stats['written'])} file(s), {stats['unchanged']} unchanged, "
+          f"{len(stats['removed'])} removed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
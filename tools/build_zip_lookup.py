@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+build_zip_lookup.py — Compile the ZIP → service-area dataset into a lookup file.
+
+Reads tools/data/service_zips.csv (zip, place, page, status) and writes
+assets/data/service-zips.json, a few KB of parallel sorted arrays that
+assets/js/zip-lookup.js binary-searches in the browser — no geocoding call:
+
+    {"v": 1,
+     "status": ["same_day", "served", "call"],
+     "pages":  ["/", "/arvada", ...],
+     "places": ["Arvada", ...],
+     "zips":   [80002, 80003, ...],             ascending
+     "rows":   [place, page, status, ...]}     3 indexes per zip, same order
+
+Every page must be a published page (tools/site_pages.py), so a renamed or
+removed area page fails the build instead of producing a dead link.
+
+Usage:
+    python3 tools/build_zip_lookup.py          # compile the lookup file
+    python3 tools/build_zip_lookup.py --check  # exit 1 if it is out of date
+    python3 tools/build_zip_lookup.py 80206    # look up a ZIP from the dataset
+"""
+
+import argparse
+import csv
+import json
+import re
+import sys
+
+from site_pages import REPO_ROOT, iter_site_pages, page_url
+
+DATASET = REPO_ROOT / "tools" / "data" / "service_zips.csv"
+OUTPUT = REPO_ROOT / "assets" / "data" / "service-zips.json"
+LOOKUP_VERSION = 1
+
+STATUSES = ["same_day", "served", "call"]
+
+
+def load_dataset(path=DATASET):
+    """Read and validate the dataset. Returns rows sorted by ZIP.
+
+    Raises ValueError listing every bad row (bad ZIP, duplicate, unknown
+    status, page that isn't published).
+    """
+    published = {page_url(p) for p in iter_site_pages()}
+    with open(path, newline="") as f:
+        lines = [line for line in f if line.strip() and not line.startswith("#")]
+
+    rows, errors, seen = [], [], set()
+    for line_no, row in enumerate(csv.DictReader(lines), 2):
+        zip_code, page, status = row["zip"].strip(), row["page"].strip(), row["status"].strip()
+        if not re.fullmatch(r"\d{5}", zip_code):
+            errors.append(f"{zip_code!r}: not a 5-digit ZIP")
+        elif zip_code in seen:
+            errors.append(f"{zip_code}: listed more than once")
+        if status not in STATUSES:
+            errors.append(f"{zip_code}: unknown status {status!r} (expected one of {STATUSES})")
+        if page not in published:
+            errors.append(f"{zip_code}: page {page} is not a published page")
+        seen.add(zip_code)
+        rows.append({"zip": int(zip_code) if zip_code.isdigit() else 0, "place": row["place"].strip(),
+                     "page": page, "status": status})
+
+    if errors:
+        raise ValueError(f"{path.name}: {len(errors)} problem(s):\n  " + "\n  ".join(errors))
+    return sorted(rows, key=lambda r: r["zip"])
+
+
+def compile_lookup(rows):
+    """Build the compact lookup object from validated rows."""
+    pages = sorted({r["page"] for r in rows})
+    places = sorted({r["place"] for r in rows})
+    page_index = {p: i for i, p in enumerate(pages)}
+    place_index = {p: i for i, p in enumerate(places)}
+
+    flat = []
+    for r in rows:
+        flat += [place_index[r["place"]], page_index[r["page"]], STATUSES.index(r["status"])]
+    return {
+        "v": LOOKUP_VERSION,
+        "status": STATUSES,
+        "pages": pages,
+        "places": places,
+        "zips": [r["zip"] for r in rows],
+        "rows": flat,
+    }
+
+
+def lookup(compiled, zip_code):
+    """Binary-search a compiled lookup (mirrors zip-lookup.js). Returns a dict or None."""
+    zips, target = compiled["zips"], int(zip_code)
+    lo, hi = 0, len(zips)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if zips[mid] < target:
+            lo = mid + 1
+        else:
+            hi = mid
+    if lo == len(zips) or zips[lo] != target:
+        return None
+    place, page, status = compiled["rows"][lo * 3:lo * 3 + 3]
+    return {"zip": f"{target:05d}", "place": compiled["places"][place],
+            "page": compiled["pages"][page], "status": compiled["status"][status]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the ZIP -> service-area lookup file")
+    parser.add_argument("zip", nargs="?", help="Look up one ZIP instead of writing the file")
+    parser.add_argument("--check", action="store_true", help="Don't write; exit 1 if the output is out of date")
+    args = parser.parse_args()
+
+    try:
+        rows = load_dataset()
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    compiled = compile_lookup(rows)
+
+    if args.zip:
+        found = lookup(compiled, args.zip) if args.zip.isdigit() else None
+        print(json.dumps(found, indent=2) if found else f"{args.zip}: not in the service-area dataset")
+        return 0 if found else 1
+
+    text = json.dumps(compiled, separators=(",", ":"), ensure_ascii=False) + "\n"
+    current = OUTPUT.read_text(encoding="utf-8") if OUTPUT.exists() else None
+    print(f"  ZIPs: {len(rows)}, pages: {len(compiled['pages'])}, size: {len(text.encode()) / 1024:.1f} KB")
+
+    if args.check:
+        if current != text:
+            print(f"  OUT OF DATE: {OUTPUT.relative_to(REPO_ROOT)} — run tools/build_zip_lookup.py")
+            return 1
+        print("  Lookup file is up to date")
+        return 0
+
+    if current == text:
+        print(f"  Unchanged: {OUTPUT.relative_to(REPO_ROOT)}")
+        return 0
+    OUTPUT.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT.write_text(text, encoding="utf-8")
+    print(f"  Wrote {OUTPUT.relative_to(REPO_ROOT)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
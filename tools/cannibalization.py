@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+cannibalization.py — Find pages (and plan entries) competing for the same search intent.
+
+City problem pages, the Denver appliance hubs and brand pages all target the
+same appliance problems, and the plan mixes near-synonymous problems, so two
+pages can end up splitting one query. This builds sparse TF-IDF vectors for
+every published page and reports the pages whose intent overlaps:
+
+    headline   title + H1 terms (what the page says it is about)
+    body       visible body text, sublinear term frequency
+
+Pages only compete when they serve the same location and appliance (a
+Lakewood page doesn't compete with its Aurora twin, and "washer leaking"
+doesn't compete with "dishwasher leaking"), so place names are taken out of
+the vectors and used as a hard filter instead. Within that, the score is
+HEADLINE_WEIGHT * headline cosine + the rest * body cosine, computed as
+blocked sparse matrix products with numpy / scipy; the top-k neighbours of
+each page above --threshold are joined into clusters.
+
+--plan checks plan entries before any tokens are spent on them: each entry's
+headline (the title the generator will target) is compared against the
+published pages and the entries before it. generate_seo_pages.py runs the
+same check with --check-cannibalization.
+
+Requires numpy and scipy.
+
+Usage:
+    python3 tools/cannibalization.py                          # clusters across the published site
+    python3 tools/cannibalization.py --threshold 0.4 --top-k 10
+    python3 tools/cannibalization.py --json cannibalization.json
+    python3 tools/cannibalization.py --plan tools/seo_plan_authority_150.json   # exit 1 on conflicts
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from build_search_index import extract_text, tokenize
+from locations import load_locations
+from page_model import load_page
+from site_pages import REPO_ROOT, iter_site_pages, page_url
+
+HEADLINE_WEIGHT = 0.6
+DEFAULT_THRESHOLD = 0.5
+DEFAULT_PLAN_THRESHOLD = 0.75
+DEFAULT_TOP_K = 5
+# Rows of the similarity matrix computed per sparse product.
+BLOCK_ROWS = 512
+
+# Unlocated pages (hub guides, policies) serve the home market.
+DEFAULT_LOCATION = "denver"
+
+# Appliance -> phrases that put a page about it.
+APPLIANCES = {
+    "washer": ("washer", "washing machine"),
+    "dryer": ("dryer",),
+    "dishwasher": ("dishwasher",),
+    "refrigerator": ("refrigerator", "fridge", "freezer", "ice maker", "water dispenser"),
+    "oven": ("oven", "stove", "range", "burner", "cooktop"),
+}
+_APPLIANCE_RES = {name: re.compile(r"\b(?:%s)s?\b" % "|".join(phrases)) for name, phrases in APPLIANCES.items()}
+_IN_PLACE_RE = re.compile(r"\bin ([A-Z][\w'.]*(?: [A-Z][\w'.]*)*)")
+_SUFFIXES = ("ing", "ed", "es", "s")
+
+
+# ===================================================================
+# Documents
+# ===================================================================
+
+def load_places():
+    """Lowercase names of the cities and neighborhoods in the locations dataset, longest first."""
+    places = {DEFAULT_LOCATION} | {loc["name"].lower() for loc in load_locations()}
+    return sorted(places, key=len, reverse=True)
+
+
+def _stem(token):
+    for suffix in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            return token[:-len(suffix)]
+    return token
+
+
+def terms(text, exclude=()):
+    """Stemmed tokens of text, minus `exclude` (stemmed place-name tokens)."""
+    return [t for t in map(_stem, tokenize(text)) if t not in exclude]
+
+
+def locate(headline, place_re):
+    """Location a page targets: the first known place in its title/H1, else an "in <Place>" phrase."""
+    m = place_re.search(headline.lower())
+    if m:
+        return m.group(0)
+    m = _IN_PLACE_RE.search(headline)
+    return m.group(1).lower() if m else DEFAULT_LOCATION
+
+
+def appliances_of(headline):
+    """Appliances named in a title/H1 (empty for general pages)."""
+    lowered = headline.lower()
+    return frozenset(name for name, rx in _APPLIANCE_RES.items() if rx.search(lowered))
+
+
+def page_documents(places):
+    """One document per indexable published page."""
+    place_re = re.compile(r"\b(?:%s)\b" % "|".join(map(re.escape, places)))
+    docs = []
+    for path in iter_site_pages():
+        page = load_page(path)
+        if page.noindex:
+            continue
+        title, h1, body = extract_text(page)
+        headline = f"{title} {h1}"
+        docs.append({
+            "id": path.relative_to(REPO_ROOT).as_posix(),
+            "url": page_url(path),
+            "title": title,
+            "h1": h1,
+            "location": locate(headline, place_re),
+            "appliances": appliances_of(headline),
+            "headline": headline,
+            "body": body,
+        })
+    return docs
+
+
+def plan_headline(entry):
+    """The title/H1 a plan entry will be generated for."""
+    brand = f"{entry['brand']} " if entry.get("brand") else ""
+    return f"{brand}{entry['category']} {entry['problem']} Repair in {entry['city']}"
+
+
+def plan_documents(plan):
+    docs = []
+    for entry in plan:
+        headline = plan_headline(entry)
+        docs.append({
+            "id": entry["output_filename"],
+            "location": entry["city"].lower(),
+            "appliances": appliances_of(headline),
+            "headline": headline,
+            "body": "",
+        })
+    return docs
+
+
+# ===================================================================
+# Vectors + neighbours
+# ===================================================================
+
+def tfidf_matrix(term_counts):
+    """L2-normalised sparse TF-IDF rows for a list of {term: tf} dicts."""
+    vocab, rows, cols, vals = {}, [], [], []
+    for i, counts in enumerate(term_counts):
+        for term, tf in counts.items():
+            rows.append(i)
+            cols.append(vocab.setdefault(term, len(vocab)))
+            vals.append(tf)
+    m = sparse.csr_matrix((vals, (rows, cols)), shape=(len(term_counts), len(vocab)), dtype=np.float64)
+    df = np.bincount(m.indices, minlength=m.shape[1])
+    idf = np.log((1 + m.shape[0]) / (1 + df)) + 1
+    m = m @ sparse.diags(idf)
+    norms = np.sqrt(np.asarray(m.multiply(m).sum(axis=1))).ravel()
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms) @ m
+
+
+def vectorize(docs, places):
+    """(headline matrix, body matrix) for docs."""
+    exclude = {_stem(t) for place in places for t in tokenize(place)}
+    headline = [Counter(terms(d["headline"], exclude)) for d in docs]
+    body = [{t: 1 + np.log(n) for t, n in Counter(terms(d["body"], exclude)).items()} for d in docs]
+    return tfidf_matrix(headline), tfidf_matrix(body)
+
+
+def facets(docs):
+    """(location ids, appliance bitmasks) as arrays for vectorized compatibility masks."""
+    location_ids = {}
+    locations = np.array([location_ids.setdefault(d["location"], len(location_ids)) for d in docs])
+    bits = {name: 1 << i for i, name in enumerate(APPLIANCES)}
+    masks = np.array([sum(bits[a] for a in d["appliances"]) for d in docs])
+    return locations, masks
+
+
+def compatible(loc_a, mask_a, loc_b, mask_b):
+    """Boolean matrix: rows of a and b that could compete (same location, overlapping appliances)."""
+    same_place = loc_a[:, None] == loc_b[None, :]
+    shared = (mask_a[:, None] & mask_b[None, :]) != 0
+    both_general = (mask_a[:, None] == 0) & (mask_b[None, :] == 0)
+    return same_place & (shared | both_general)
+
+
+def similarity(headline, body, start, stop, weight=HEADLINE_WEIGHT):
+    """Dense (stop - start, n) block of weighted headline + body cosine similarity."""
+    sim = weight * (headline[start:stop] @ headline.T).toarray()
+    sim += (1 - weight) * (body[start:stop] @ body.T).toarray()
+    return sim
+
+
+def top_k(n, k, score_block):
+    """Top-k columns of every row of an n x n score matrix, itself excluded.
+
+    score_block(start, stop) returns the dense rows start..stop; they are
+    requested BLOCK_ROWS at a time so memory stays at BLOCK_ROWS x n.
+    Returns (indices, scores), each shaped (n, k) and sorted by score.
+    """
+    k = min(k, n - 1)
+    indices = np.zeros((n, k), dtype=np.int64)
+    scores = np.zeros((n, k))
+    for start in range(0, n, BLOCK_ROWS):
+        stop = min(start + BLOCK_ROWS, n)
+        sim = score_block(start, stop)
+        rows = np.arange(stop - start)
+        sim[rows, rows + start] = -np.inf
+        part = np.argpartition(-sim, k - 1, axis=1)[:, :k]
+        part_scores = np.take_along_axis(sim, part, axis=1)
+        order = np.argsort(-part_scores, axis=1)
+        indices[start:stop] = np.take_along_axis(part, order, axis=1)
+        scores[start:stop] = np.take_along_axis(part_scores, order, axis=1)
+    return indices, scores
+
+
+def clusters(docs, indices, scores, threshold):
+    """Connected groups of docs joined by neighbour links at or above threshold.
+
+    Returns [{"pages", "location", "appliances", "pairs": [(a, b, score)]}],
+    largest first.
+    """
+    n = len(docs)
+    hits = scores >= threshold
+    rows = np.repeat(np.arange(n), indices.shape[1])[hits.ravel()]
+    cols = indices.ravel()[hits.ravel()]
+    graph = sparse.coo_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, n))
+    _, labels = connected_components(graph, directed=False)
+
+    pairs = {}
+    for i, j, s in zip(rows, cols, scores[hits]):
+        key = (min(i, j), max(i, j))
+        pairs[key] = max(pairs.get(key, 0), float(s))
+    groups = {}
+    for (i, j), s in pairs.items():
+        groups.setdefault(labels[i], []).append((docs[i]["id"], docs[j]["id"], round(s, 3)))
+
+    result = []
+    for label, group_pairs in groups.items():
+        members = np.flatnonzero(labels == label)
+        result.append({
+            "pages": sorted(docs[i]["id"] for i in members),
+            "location": docs[members[0]]["location"],
+            "appliances": sorted(frozenset().union(*(docs[i]["appliances"] for i in members))),
+            "pairs": sorted(group_pairs, key=lambda p: -p[2]),
+        })
+    return sorted(result, key=lambda c: (-len(c["pages"]), -c["pairs"][0][2]))
+
+
+# ===================================================================
+# Analyses
+# ===================================================================
+
+def analyze_site(threshold=DEFAULT_THRESHOLD, top_k_count=DEFAULT_TOP_K):
+    """(docs, clusters, neighbours) for the published site."""
+    places = load_places()
+    docs = page_documents(places)
+    headline, body = vectorize(docs, places)
+    locations, masks = facets(docs)
+
+    def score_block(start, stop):
+        sim = similarity(headline, body, start, stop)
+        sim[~compatible(locations[start:stop], masks[start:stop], locations, masks)] = 0
+        return sim
+
+    indices, scores = top_k(len(docs), top_k_count, score_block)
+    neighbours = {
+        d["id"]: [(docs[j]["id"], round(float(s), 3)) for j, s in zip(indices[i], scores[i]) if s > 0]
+        for i, d in enumerate(docs)
+    }
+    return docs, clusters(docs, indices, scores, threshold), neighbours
+
+
+def check_plan(plan, threshold=DEFAULT_PLAN_THRESHOLD):
+    """Plan entries whose headline competes with a published page or an earlier entry.
+
+    Only headlines are compared (entries have no body yet), so the default
+    threshold is higher than for pages. An entry's own output file is not
+    counted against it. Returns {output_filename: (competitor, score)}.
+    """
+    places = load_places()
+    pages = page_documents(places)
+    entries = plan_documents(plan)
+    docs = pages + entries
+    headline, _ = vectorize(docs, places)
+    locations, masks = facets(docs)
+
+    sim = (headline[len(pages):] @ headline.T).toarray()
+    sim[~compatible(locations[len(pages):], masks[len(pages):], locations, masks)] = 0
+    conflicts = {}
+    for i, entry in enumerate(entries):
+        row = sim[i, :len(pages) + i]  # published pages + earlier entries only
+        own = [j for j, d in enumerate(docs[:len(pages) + i]) if d["id"] == entry["id"]]
+        row[own] = 0
+        if row.size and row.max() >= threshold:
+            j = int(row.argmax())
+            conflicts[entry["id"]] = (docs[j]["id"], round(float(row[j]), 3))
+    return conflicts
+
+
+# ===================================================================
+# Main
+# ===================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Find pages and plan entries competing for the same search intent")
+    parser.add_argument("--plan", default=None, metavar="PATH",
+                        help="Check plan entries against the site and each other instead (exit 1 on conflicts)")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help=f"Similarity that counts as competing (default: {DEFAULT_THRESHOLD} for pages, "
+                             f"{DEFAULT_PLAN_THRESHOLD} for --plan headlines)")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help=f"Neighbours per page (default: {DEFAULT_TOP_K})")
+    parser.add_argument("--json", default=None, metavar="PATH", help="Write clusters and neighbours as JSON")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  Elevate Repair — Keyword Cannibalization")
+    print("=" * 60)
+
+    if args.plan:
+        with open(args.plan) as f:
+            plan = json.load(f)
+        threshold = DEFAULT_PLAN_THRESHOLD if args.threshold is None else args.threshold
+        conflicts = check_plan(plan, threshold)
+        print(f"  Plan entries: {len(plan)}  (threshold {threshold})")
+        for filename, (competitor, score) in conflicts.items():
+            print(f"    ! {filename}  competes with {competitor}  ({score:.2f})")
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump({k: {"competitor": c, "score": s} for k, (c, s) in conflicts.items()}, f, indent=2)
+        print(f"\n  Conflicts: {len(conflicts)}")
+        return 1 if conflicts else 0
+
+    threshold = DEFAULT_THRESHOLD if args.threshold is None else args.threshold
+    docs, groups, neighbours = analyze_site(threshold, args.top_k)
+    print(f"  Pages: {len(docs)}  (threshold {threshold}, top {args.top_k} neighbours each)")
+    for group in groups:
+        appliances = ", ".join(group["appliances"]) or "general"
+        print(f"\n  [{group['location']} / {appliances}] {len(group['pages'])} pages")
+        for a, b, score in group["pairs"]:
+            print(f"    {score:.2f}  {a}  <->  {b}")
+    print(f"\n  Clusters: {len(groups)} ({sum(len(g['pages']) for g in groups)} pages)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"threshold": threshold, "clusters": groups, "neighbours": neighbours}, f, indent=2)
+        print(f"  Written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+changed_pages.py — Limit the fixer, linters and validators to changed pages.
+
+Every page tool normally walks the whole site. With --since <ref> or
+--staged they only look at the pages a change can affect:
+
+  * pages that were themselves added or modified, and
+  * the reverse dependencies of changed build inputs:
+      tools/partials/<name>.html       pages with a <!-- PARTIAL:<name> --> block
+      tools/data/related-links.json    pages with a <!-- RELATED_LINKS --> block
+      tools/data/nearest-areas.json    pages with an <!-- AREA_CARDS:... --> block
+      tools/template_city_base.html    pages generated from it (<!-- SEO_BODY --> block)
+      tools/data/locations.csv         (same)
+      tools/problem-page-template.html the pages listed in tools/pages-batch.json
+      tools/pages-batch.json           (same)
+      styles.css, assets/...           pages that reference the file
+
+The changed file list comes from git plumbing: `git diff-index --cached HEAD`
+for --staged (what a pre-commit hook sees), or `git diff-index <ref>` plus
+untracked files for --since (everything that differs from <ref> in the
+working tree). Pass a merge base as the ref (e.g. `$(git merge-base main HEAD)`)
+to check a branch. Deleted pages are dropped; deleted inputs still mark
+their dependents.
+
+Tools call add_arguments(parser) and then select(args, paths), which
+returns `paths` unchanged when neither flag is given.
+
+Usage:
+    python3 tools/changed_pages.py --staged          # list pages affected by the staged change
+    python3 tools/changed_pages.py --since main      # ... by everything that differs from main
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from urllib.parse import quote
+
+from page_model import load_page
+from site_pages import REPO_ROOT, TEMPLATE_PAGES, iter_site_pages
+
+PARTIALS_PREFIX = "tools/partials/"
+RELATED_DATA = "tools/data/related-links.json"
+NEAREST_DATA = "tools/data/nearest-areas.json"
+CITY_TEMPLATE = "tools/template_city_base.html"
+LOCATIONS_DATA = "tools/data/locations.csv"
+PROBLEM_INPUTS = {"tools/problem-page-template.html", "tools/pages-batch.json"}
+
+# Changed files under these prefixes are build inputs or tooling, never assets a page links to.
+NON_ASSET_PREFIXES = ("tools/", "search-index/", ".")
+
+
+# ===================================================================
+# Git
+# ===================================================================
+
+def _git(*args, check=True):
+    result = subprocess.run(["git", *args], cwd=REPO_ROOT, capture_output=True, text=True)
+    if check and result.returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)}: {result.stderr.strip()}")
+    return [name for name in result.stdout.split("\0") if name]
+
+
+def changed_files(since=None, staged=False):
+    """Repo-relative paths changed in the index (staged) or since a ref, sorted."""
+    if staged:
+        return sorted(_git("diff-index", "--cached", "--name-only", "--no-renames", "-z", "HEAD"))
+    # diff-index trusts the index's stat data; refresh it so touched-but-unchanged files drop out.
+    _git("update-index", "-q", "--refresh", check=False)
+    names = _git("diff-index", "--name-only", "--no-renames", "-z", since, "--")
+    names += _git("ls-files", "--others", "--exclude-standard", "-z")
+    return sorted(set(names))
+
+
+# ===================================================================
+# Reverse dependencies
+# ===================================================================
+
+def _problem_pages():
+    """Pages generate-problem-pages.mjs writes from pages-batch.json."""
+    batch = json.loads((REPO_ROOT / "tools" / "pages-batch.json").read_text(encoding="utf-8"))
+    return {f"{page['dir']}/{page['fileName']}" for page in batch.get("pages", [])}
+
+
+def dependency_tests(files):
+    """Checks (rel, html) -> bool for pages that depend on one of `files`."""
+    files = set(files)
+    tests = []
+
+    partials = {f[len(PARTIALS_PREFIX):-len(".html")] for f in files
+                if f.startswith(PARTIALS_PREFIX) and f.endswith(".html")}
+    if partials:
+        markers = [f"<!-- PARTIAL:{name} -->" for name in sorted(partials)]
+        tests.append(lambda rel, html: any(m in html for m in markers))
+    if RELATED_DATA in files:
+        tests.append(lambda rel, html: "<!-- RELATED_LINKS -->" in html)
+    if NEAREST_DATA in files:
+        tests.append(lambda rel, html: "<!-- AREA_CARDS:" in html)
+    if CITY_TEMPLATE in files or LOCATIONS_DATA in files:
+        tests.append(lambda rel, html: "<!-- SEO_BODY -->" in html)
+    if files & PROBLEM_INPUTS:
+        problem_pages = _problem_pages()
+        tests.append(lambda rel, html: rel in problem_pages)
+
+    assets = [f for f in files if not f.endswith(".html") and not f.startswith(NON_ASSET_PREFIXES)]
+    if assets:
+        # Pages link to assets URL-encoded ("cities%20banner/"); git reports the raw path.
+        forms = {form for f in assets for form in (f, quote(f))}
+        asset_re = re.compile(r"""["'(]/(?:%s)[?#"')]""" % "|".join(map(re.escape, sorted(forms))))
+        tests.append(lambda rel, html: asset_re.search(html) is not None)
+    return tests
+
+
+def affected(paths, files):
+    """The subset of `paths` that changed or depend on a changed file, in order."""
+    files = set(files)
+    tests = dependency_tests(files)
+    selected = []
+    for path in paths:
+        if not path.exists():
+            continue
+        rel = path.relative_to(REPO_ROOT).as_posix()
+        if rel in files or (tests and any(t(rel, load_page(path).html) for t in tests)):
+            selected.append(path)
+    return selected
+
+
+# ===================================================================
+# CLI integration
+# ===================================================================
+
+def add_arguments(parser):
+    """Register the mutually exclusive --since / --staged flags on a tool's parser."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--since", metavar="REF",
+                       help="Only pages changed since a git ref, plus pages depending on changed templates")
+    group.add_argument("--staged", action="store_true",
+                       help="Only pages affected by the staged change (for pre-commit hooks)")
+
+
+def scope_label(args):
+    """Human description of the selected scope, for tool banners."""
+    if args.staged:
+        return "staged changes"
+    if args.since:
+        return f"changes since {args.since}"
+    return "all pages"
+
+
+def select(args, paths):
+    """Narrow `paths` to the changed set when --since/--staged was given."""
+    if not (args.since or args.staged):
+        return list(paths)
+    return affected(paths, _changed_or_exit(args))
+
+
+def _changed_or_exit(args):
+    try:
+        return changed_files(since=args.since, staged=args.staged)
+    except RuntimeError as e:
+        sys.exit(f"ERROR: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List pages affected by a git change")
+    add_arguments(parser)
+    args = parser.parse_args()
+    if not (args.since or args.staged):
+        parser.error("one of --since REF or --staged is required")
+
+    files = _changed_or_exit(args)
+    pages = affected([*iter_site_pages(), *TEMPLATE_PAGES], files)
+    print(f"{len(files)} changed files, {len(pages)} affected pages ({scope_label(args)})", file=sys.stderr)
+    for path in pages:
+        print(path.relative_to(REPO_ROOT).as_posix())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+defer_third_party.py — Load gtag.js and Microsoft Clarity after interaction or idle.
+
+Every page (and both tools/ templates) loads the Google Ads / GA4 gtag.js
+and the Clarity bootstrap in <head>, where they compete with first paint on
+mobile. This stage replaces the two blocks with one small inline loader:
+
+    - dataLayer, gtag() and the js/config calls still run immediately, so
+      every gtag('event', ...) a page fires before the library arrives is
+      queued in dataLayer and sent once gtag.js loads
+    - window.clarity gets the same queueing stub Clarity's bootstrap sets
+    - both scripts are injected on the first pointerdown / keydown /
+      touchstart / scroll, or when the browser is idle after load
+
+Conversion pages (CONVERSION_PAGES) keep the original tags: the thank-you
+page fires the Ads conversion on load and a visitor may leave before idle.
+The booking form's own gtag events happen after a pointerdown or keydown,
+which has already started the load.
+
+Already-deferred pages carry DEFERRED_MARKER and are left alone, so the
+stage can run repeatedly. The per-page report lists what changed.
+
+Usage:
+    python3 tools/defer_third_party.py                    # dry run: report only
+    python3 tools/defer_third_party.py --write            # rewrite pages + templates
+    python3 tools/defer_third_party.py --report defer.json
+    python3 tools/defer_third_party.py index.html brands.html
+    python3 tools/defer_third_party.py --staged --write   # only files the staged change affects
+"""
+
+import argparse
+import json
+import re
+import sys
+
+import changed_pages
+from page_model import load_page, write_page
+from site_pages import REPO_ROOT, TEMPLATE_PAGES, iter_site_pages
+
+# Pages whose tags must load immediately (relative to REPO_ROOT).
+CONVERSION_PAGES = {"thank-you.html"}
+
+DEFERRED_MARKER = "<!-- DEFERRED_TAGS -->"
+
+_GTAG_RE = re.compile(
+    r'(?P<indent>[ \t]*)<script async src="(?P<src>https://www\.googletagmanager\.com/gtag/js\?id=[^"]+)"></script>'
+    r'\s*<script>(?P<body>.*?)</script>[ \t]*\n?',
+    re.S,
+)
+_CLARITY_RE = re.compile(
+    r'[ \t]*(?:<!-- Microsoft Clarity -->\s*)?<script type="text/javascript">\s*'
+    r'\(function\(c,l,a,r,i,t,y\).*?\}\)\(window, document, "clarity", "script", "(?P<id>[^"]+)"\);\s*'
+    r'</script>[ \t]*\n?',
+    re.S,
+)
+
+CLARITY_SRC = "https://www.clarity.ms/tag/{id}"
+
+LOADER = """{indent}{marker}
+{indent}<script>
+{body}
+{indent}    window.clarity = window.clarity || function(){{(window.clarity.q = window.clarity.q || []).push(arguments)}};
+{indent}    (function(w, d){{
+{indent}        var srcs = {srcs};
+{indent}        var events = ["pointerdown", "keydown", "touchstart", "scroll"];
+{indent}        var done = false;
+{indent}        function load(){{
+{indent}            if (done) return;
+{indent}            done = true;
+{indent}            srcs.forEach(function(s){{ var t = d.createElement("script"); t.async = true; t.src = s; d.head.appendChild(t); }});
+{indent}        }}
+{indent}        events.forEach(function(e){{ w.addEventListener(e, load, {{capture: true, passive: true, once: true}}); }});
+{indent}        w.addEventListener("load", function(){{
+{indent}            if (w.requestIdleCallback) w.requestIdleCallback(load, {{timeout: 4000}}); else setTimeout(load, 3000);
+{indent}        }});
+{indent}    }})(window, document);
+{indent}</script>
+"""
+
+
+# ===================================================================
+# Transform
+# ===================================================================
+
+def defer_tags(html):
+    """Replace the gtag + Clarity blocks with the deferred loader.
+
+    Returns (new_html, tags) where tags names what was moved; html is
+    returned unchanged with tags == [] when there is nothing to do.
+    """
+    if DEFERRED_MARKER in html:
+        return html, []
+    gtag = _GTAG_RE.search(html)
+    if not gtag:
+        return html, []
+
+    srcs, tags = [gtag.group("src")], ["gtag"]
+    html_wo_clarity = html
+    clarity = _CLARITY_RE.search(html, gtag.end())
+    if clarity:
+        srcs.append(CLARITY_SRC.format(id=clarity.group("id")))
+        tags.append("clarity")
+        html_wo_clarity = html[:clarity.start()] + html[clarity.end():]
+
+    indent = gtag.group("indent")
+    body = gtag.group("body").strip("\n").rstrip()
+    loader = LOADER.format(indent=indent, marker=DEFERRED_MARKER, body=body,
+                           srcs=json.dumps(srcs))
+    return html_wo_clarity[:gtag.start()] + loader + html_wo_clarity[gtag.end():], tags
+
+
+def transform_page(rel_path, html):
+    """Apply the stage to one page. Returns (new_html, report_entry)."""
+    entry = {"page": rel_path, "tags": [], "bytes_before": len(html.encode()), "bytes_after": None}
+    if rel_path in CONVERSION_PAGES:
+        entry["action"] = "skipped: conversion page"
+        return html, entry
+    if DEFERRED_MARKER in html:
+        entry["action"] = "already deferred"
+        return html, entry
+    new_html, tags = defer_tags(html)
+    entry["tags"] = tags
+    entry["action"] = "deferred" if tags else "no tags found"
+    entry["bytes_after"] = len(new_html.encode())
+    return new_html, entry
+
+
+# ===================================================================
+# Main
+# ===================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Defer gtag.js and Clarity until interaction or idle")
+    parser.add_argument("pages", nargs="*", help="Pages to process (default: every page plus the tools/ templates)")
+    parser.add_argument("--write", action="store_true", help="Rewrite files (default: dry run)")
+    parser.add_argument("--report", default=None, metavar="PATH", help="Write the per-page report as JSON")
+    changed_pages.add_arguments(parser)
+    args = parser.parse_args()
+
+    paths = [REPO_ROOT / p for p in args.pages] if args.pages else [*iter_site_pages(), *TEMPLATE_PAGES]
+    paths = changed_pages.select(args, paths)
+
+    print("=" * 60)
+    print("  Elevate Repair — Third-Party Tag Deferral")
+    print("=" * 60)
+    print(f"  Mode: {'WRITE' if args.write else 'DRY RUN'}")
+
+    report, counts = [], {}
+    for path in paths:
+        rel = path.resolve().relative_to(REPO_ROOT).as_posix()
+        html = load_page(path).html
+        new_html, entry = transform_page(rel, html)
+        report.append(entry)
+        counts[entry["action"]] = counts.get(entry["action"], 0) + 1
+        if entry["action"] == "deferred":
+            if args.write:
+                write_page(path, new_html)
+            print(f"    ~ {rel}  [{', '.join(entry['tags'])}]  "
+                  f"{entry['bytes_after'] - entry['bytes_before']:+d} B")
+        elif entry["action"] != "already deferred":
+            print(f"    - {rel}  ({entry['action']})")
+
+    print(f"\n  Files: {len(report)}")
+    for action, n in sorted(counts.items()):
+        print(f"    {action:26s} {n}")
+    if counts.get("deferred") and not args.write:
+        print("\n  Dry run — re-run with --write to apply.")
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n  Report written to {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+extract_inline_scripts.py — Move inline scripts shared across pages into one cached bundle.
+
+The booking-step handlers, the anti-spam guard and the burger-menu script
+are pasted inline into hundreds of pages, so every navigation re-downloads
+and re-parses them. This stage hashes every inline <script> in <body>
+across the site (plus the tools/ templates), and any script that appears
+verbatim on at least MIN_PAGES files becomes a chunk of one fingerprinted
+bundle:
+
+    assets/js/shared-inline.<hash>.js
+
+Each page's copies are replaced by a single deferred reference that names
+the chunks the page used; the bundle runs only those, in page order:
+
+    <script defer src="/assets/js/shared-inline.<hash>.js" data-chunks="75419ee80b ..."></script>
+
+Deferred scripts run after parsing but before DOMContentLoaded, which is
+when trailing inline scripts ran anyway. To keep execution order, a chunk
+is only extracted when every inline or blocking script after it on the page
+is extracted too, and a page whose deferred scripts come before its first
+chunk is left alone. <head> scripts (the tag loader, the Maps bootstrap)
+stay inline. Chunks run inside an if/try block, so scripts with top-level
+let/const/class or a "use strict" prologue, and anything touching
+document.currentScript or document.write, are never extracted. A chunk
+that throws reports the error without stopping the chunks after it.
+
+Re-running is safe: pages are first restored from the bundle they
+reference, then extracted again, so the result only changes when the
+shared scripts do. --write removes bundles no page references any more.
+
+Usage:
+    python3 tools/extract_inline_scripts.py                 # dry run: report only
+    python3 tools/extract_inline_scripts.py --write         # rewrite pages + templates, write the bundle
+    python3 tools/extract_inline_scripts.py --report scripts.json
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import re
+import sys
+from collections import Counter
+
+from page_model import load_page, write_page
+from site_pages import REPO_ROOT, TEMPLATE_PAGES, iter_site_pages
+
+BUNDLE_DIR = REPO_ROOT / "assets" / "js"
+BUNDLE_GLOB = "shared-inline.*.js"
+BUNDLE_NAME = "shared-inline.{hash}.js"
+BUNDLE_URL = "/assets/js/{name}"
+
+# Scripts must appear verbatim on at least this many files to be extracted.
+MIN_PAGES = 3
+
+JS_TYPES = {"text/javascript", "application/javascript"}
+
+_SCRIPT_RE = re.compile(r"<script(?P<attrs>\s[^>]*)?>(?P<raw>.*?)</script>", re.S | re.I)
+_REF_RE = re.compile(
+    r'<script defer src="/assets/js/shared-inline\.[0-9a-f]+\.js" data-chunks="(?P<ids>[0-9a-f ]*)"></script>'
+)
+_CHUNK_RE = re.compile(
+    r'^// @chunk (?P<id>[0-9a-f]+)\n'
+    r'if \(__inlineRun\("(?P=id)"\)\) try \{(?P<raw>.*?)\} catch \(e\) \{ __inlineFail\(e\); \}$',
+    re.S | re.M,
+)
+_ATTR_RE = re.compile(r'([\w-]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|(\S+)))?')
+_UNSAFE_RE = re.compile(r"document\.(?:currentScript|write)|^\s*['\"]use strict['\"]")
+_TOP_LEVEL_DECL_RE = re.compile(r"^(?:let|const|class)\b")
+
+BUNDLE_HEADER = """/*
+ * Shared inline scripts, extracted by tools/extract_inline_scripts.py — do not edit.
+ * Each chunk runs only on pages that list it in this script tag's data-chunks.
+ */
+var __inlineChunks = ' ' + ((document.currentScript && document.currentScript.getAttribute('data-chunks')) || '') + ' ';
+function __inlineRun(id) { return __inlineChunks.indexOf(' ' + id + ' ') !== -1; }
+function __inlineFail(e) { setTimeout(function() { throw e; }); }
+"""
+CHUNK_TEMPLATE = '\n// @chunk {id}\nif (__inlineRun("{id}")) try {{{raw}}} catch (e) {{ __inlineFail(e); }}\n'
+
+
+# ===================================================================
+# Scripts on a page
+# ===================================================================
+
+def chunk_id(raw):
+    return hashlib.sha1(raw.strip().encode()).hexdigest()[:10]
+
+
+def _attrs(text):
+    return {m.group(1).lower(): next((g for g in m.groups()[1:] if g is not None), "")
+            for m in _ATTR_RE.finditer(text or "")}
+
+
+def _classify(attrs):
+    """'inline' (plain inline JS), 'ordered' (defer/module src), 'blocking' (sync src), or 'other'."""
+    a = _attrs(attrs)
+    kind = a.get("type", "text/javascript").lower()
+    if "src" in a:
+        if "async" in a:
+            return "other"
+        return "ordered" if "defer" in a or kind == "module" else "blocking"
+    if set(a) - {"type"} or kind not in JS_TYPES:
+        return "other"
+    return "inline"
+
+
+def body_scripts(html):
+    """(match, kind) for every <script> after </head>."""
+    start = html.find("</head>")
+    return [(m, _classify(m.group("attrs"))) for m in _SCRIPT_RE.finditer(html, max(start, 0))]
+
+
+def is_extractable(raw):
+    """False for scripts whose meaning would change inside the bundle's if/try block."""
+    if _UNSAFE_RE.search(raw):
+        return False
+    lines = raw.strip("\n").splitlines()
+    indents = [len(l) - len(l.lstrip()) for l in lines if l.strip()]
+    base = min(indents, default=0)
+    return not any(_TOP_LEVEL_DECL_RE.match(l.strip()) for l in lines
+                   if l.strip() and len(l) - len(l.lstrip()) == base)
+
+
+def inline_raws(html):
+    """Raw bodies of the extractable inline scripts in <body>."""
+    return [m.group("raw") for m, kind in body_scripts(html) if kind == "inline" and is_extractable(m.group("raw"))]
+
+
+# ===================================================================
+# Restore / extract
+# ===================================================================
+
+def read_bundle_chunks(js):
+    """{chunk id: raw script body} from a bundle's source."""
+    return {m.group("id"): m.group("raw") for m in _CHUNK_RE.finditer(js)}
+
+
+def restore_scripts(html, chunks):
+    """Expand a bundle reference back into inline scripts. Unknown ids raise KeyError."""
+    m = _REF_RE.search(html)
+    if not m:
+        return html
+    line_start = html.rfind("\n", 0, m.start()) + 1
+    indent = html[line_start:m.start()] if not html[line_start:m.start()].strip() else ""
+    scripts = [f"<script>{chunks[i]}</script>" for i in m.group("ids").split()]
+    return html[:m.start()] + f"\n{indent}".join(scripts) + html[m.end():]
+
+
+def _line_span(html, start, end):
+    """Widen [start, end) to whole lines when the tag sits alone on its line(s)."""
+    line_start = html.rfind("\n", 0, start) + 1
+    line_end = html.find("\n", end)
+    line_end = len(html) if line_end == -1 else line_end
+    if html[line_start:start].strip() or html[end:line_end].strip():
+        return start, end
+    return line_start, min(line_end + 1, len(html))
+
+
+def plan_extraction(html, shared):
+    """Matches to extract from one page, in page order (see module docstring for the rules)."""
+    scripts = body_scripts(html)
+    extract, ok = [], True
+    for m, kind in reversed(scripts):
+        if kind == "inline" and ok and chunk_id(m.group("raw")) in shared:
+            extract.append(m)
+        elif kind in ("inline", "blocking"):
+            ok = False
+    extract.reverse()
+    if extract and any(_classify(m.group("attrs")) == "ordered"
+                       for m in _SCRIPT_RE.finditer(html, 0, extract[0].start())):
+        return []
+    return extract
+
+
+def extract_scripts(html, shared, bundle_url):
+    """Replace a page's shared inline scripts with one bundle reference.
+
+    Returns (new_html, chunk ids in page order).
+    """
+    extract = plan_extraction(html, shared)
+    if not extract:
+        return html, []
+    ids = [chunk_id(m.group("raw")) for m in extract]
+    ref = f'<script defer src="{bundle_url}" data-chunks="{" ".join(ids)}"></script>'
+    out, pos = [], 0
+    for i, m in enumerate(extract):
+        if i == 0:
+            out.append(html[pos:m.start()])
+            out.append(ref)
+            pos = m.end()
+        else:
+            start, end = _line_span(html, m.start(), m.end())
+            out.append(html[pos:start])
+            pos = end
+    out.append(html[pos:])
+    return "".join(out), ids
+
+
+# ===================================================================
+# Bundle
+# ===================================================================
+
+def bundle_order(sequences):
+    """Order chunks so every page's sequence is a subsequence, or raise ValueError on a cycle."""
+    first_seen, after = {}, {}
+    for seq in sequences:
+        for i, cid in enumerate(seq):
+            first_seen.setdefault(cid, len(first_seen))
+            after.setdefault(cid, set()).update(seq[i + 1:])
+    indegree = Counter(c for succ in after.values() for c in succ)
+    ready = sorted((c for c in first_seen if not indegree[c]), key=first_seen.get)
+    order = []
+    while ready:
+        cid = ready.pop(0)
+        order.append(cid)
+        for nxt in sorted(after[cid], key=first_seen.get):
+            indegree[nxt] -= 1
+            if not indegree[nxt]:
+                ready.append(nxt)
+        ready.sort(key=first_seen.get)
+    if len(order) != len(first_seen):
+        raise ValueError(f"chunk order conflicts between pages: {sorted(set(first_seen) - set(order))}")
+    return order
+
+
+def render_bundle(order, chunks):
+    """(file name, source) for the bundle holding `order` chunks."""
+    js = BUNDLE_HEADER + "".join(CHUNK_TEMPLATE.format(id=cid, raw=chunks[cid]) for cid in order)
+    name = BUNDLE_NAME.format(hash=hashlib.sha1(js.encode()).hexdigest()[:10])
+    return name, js
+
+
+def build(pages, existing_chunks, min_pages=MIN_PAGES):
+    """Run the stage over {rel path: html}.
+
+    existing_chunks maps chunk ids to raw bodies from bundles already on
+    disk (used to restore pages first). Returns (new_pages, bundle name,
+    bundle source, per-page report); the name is None when nothing is shared.
+    """
+    restored = {rel: restore_scripts(html, existing_chunks) for rel, html in pages.items()}
+
+    counts, chunks = Counter(), {}
+    for html in restored.values():
+        for raw in inline_raws(html):
+            cid = chunk_id(raw)
+            counts[cid] += 1
+            chunks.setdefault(cid, raw)
+    shared = {cid for cid, n in counts.items() if n >= min_pages}
+
+    while True:
+        placeholder = BUNDLE_URL.format(name=BUNDLE_NAME.format(hash="0" * 10))
+        extracted = {rel: extract_scripts(html, shared, placeholder) for rel, html in restored.items()}
+        try:
+            order = bundle_order([ids for _, ids in extracted.values() if ids])
+            break
+        except ValueError:
+            # Conflicting orders: keep the least-shared chunk inline and re-plan.
+            shared.discard(min(shared, key=lambda c: (counts[c], c)))
+
+    if not order:
+        report = [_report_entry(rel, restored[rel], restored[rel], [], restored[rel] != pages[rel])
+                  for rel in pages]
+        return restored, None, None, report
+
+    name, js = render_bundle(order, chunks)
+    url = BUNDLE_URL.format(name=name)
+    new_pages, report = {}, []
+    for rel, (html, ids) in extracted.items():
+        new_pages[rel] = html.replace(placeholder, url)
+        report.append(_report_entry(rel, restored[rel], new_pages[rel], ids, new_pages[rel] != pages[rel]))
+    return new_pages, name, js, report
+
+
+def _report_entry(rel, inline_html, new_html, ids, changed):
+    """Sizes are measured against the page with every script inline."""
+    before, after = len(inline_html.encode()), len(new_html.encode())
+    return {"page": rel, "chunks": ids, "bytes_before": before, "bytes_after": after,
+            "bytes_saved": before - after, "changed": changed}
+
+
+def existing_bundles():
+    return sorted(BUNDLE_DIR.glob(BUNDLE_GLOB))
+
+
+# ===================================================================
+# Main
+# ===================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract inline scripts shared across pages into one bundle")
+    parser.add_argument("--write", action="store_true", help="Rewrite pages and write the bundle (default: dry run)")
+    parser.add_argument("--min-pages", type=int, default=MIN_PAGES,
+                        help=f"Pages a script must appear on to be extracted (default: {MIN_PAGES})")
+    parser.add_argument("--report", default=None, metavar="PATH", help="Write the per-page report as JSON")
+    args = parser.parse_args()
+
+    paths = [*iter_site_pages(), *TEMPLATE_PAGES]
+    pages = {p.relative_to(REPO_ROOT).as_posix(): load_page(p).html for p in paths}
+    old_bundles = existing_bundles()
+    existing_chunks = {}
+    for bundle in old_bundles:
+        existing_chunks.update(read_bundle_chunks(bundle.read_text(encoding="utf-8")))
+
+    new_pages, name, js, report = build(pages, existing_chunks, args.min_pages)
+
+    print("=" * 60)
+    print("  Elevate Repair — Shared Inline Script Extraction")
+    print("=" * 60)
+    print(f"  Mode:  {'WRITE' if args.write else 'DRY RUN'}")
+    print(f"  Files: {len(pages)}")
+    if not name:
+        print("\n  No inline scripts shared by enough pages.")
+    else:
+        used = Counter(cid for r in report for cid in r["chunks"])
+        bundle_bytes = len(js.encode())
+        print(f"\n  Bundle: assets/js/{name}  "
+              f"({bundle_bytes / 1024:.1f} KB, {len(gzip.compress(js.encode())) / 1024:.1f} KB gzip)")
+        for cid, n in used.most_common():
+            first_line = read_bundle_chunks(js)[cid].strip().splitlines()[0][:60]
+            print(f"    {cid}  {n:4d} pages  {first_line}")
+
+        saved = sum(r["bytes_saved"] for r in report)
+        print(f"\n  Saved per page (top 10 of {sum(1 for r in report if r['chunks'])}):")
+        for r in sorted(report, key=lambda r: -r["bytes_saved"])[:10]:
+            print(f"    {r['bytes_saved']:8,d} B  {r['page']}")
+        print(f"\n  Site-wide: {saved:,d} B of inline script removed; "
+              f"the bundle ({bundle_bytes:,d} B) downloads once and stays cached")
+
+    changed = [rel for rel, html in new_pages.items() if html != pages[rel]]
+    stale = [b for b in old_bundles if b.name != name]
+    print(f"\n  Files to rewrite: {len(changed)}; stale bundles: {len(stale)}")
+
+    if args.write:
+        if name:
+            (BUNDLE_DIR / name).write_text(js, encoding="utf-8")
+        for rel in changed:
+            write_page(REPO_ROOT / rel, new_pages[rel])
+        for bundle in stale:
+            bundle.unlink()
+        print("  Written.")
+    elif changed or stale:
+        print("  Dry run — re-run with --write to apply.")
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({"bundle": name, "bundle_bytes": len(js.encode()) if js else 0, "pages": report}, f, indent=2)
+        print(f"\n  Report written to {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
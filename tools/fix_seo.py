@@ -4,8 +4,19 @@ SEO fixes:
 1. BreadcrumbList schema fixes on all problem pages
 2. Title / og:title formula fix on all problem pages  
 3. Shorten 24 long meta descriptions
+
+Usage:
+    python3 tools/fix_seo.py                  # fix every problem page
+    python3 tools/fix_seo.py --staged         # only pages the staged change affects
+    python3 tools/fix_seo.py --since main     # only pages changed since main
 """
 import re, json, os, glob
+import argparse
+from pathlib import Path
+
+import changed_pages
+import locations
+from page_model import load_page, write_page
 
 BASE = "https://elevaterepair.com"
 
@@ -23,13 +34,8 @@ HUB_NAMES = {
     "refrigerator": "Refrigerator Repair",
     "washer":       "Washer Repair",
 }
-CITY_INFO = {
-    "aurora":          ("Aurora",          f"{BASE}/aurora"),
-    "arvada":          ("Arvada",          f"{BASE}/arvada"),
-    "highlands-ranch": ("Highlands Ranch", f"{BASE}/highlands-ranch"),
-    "lakewood":        ("Lakewood",        f"{BASE}/lakewood"),
-    "westminster":     ("Westminster",     f"{BASE}/westminster"),
-}
+# Tier 2 cities have their own problem pages (tools/data/locations.csv).
+CITY_INFO = {loc["slug"]: (loc["name"], f"{BASE}{loc['page']}") for loc in locations.cities(tier=2)}
 BRANDS = ["bosch","lg","miele","samsung","sub-zero","thermador","viking","whirlpool"]
 
 # ── helpers ──────────────────────────────────────────────────────────────────
@@ -55,11 +61,6 @@ def classify(fname):
             return "city_problem", None, (city_slug, city_name, city_url), get_appliance(base)
     return None, None, None, None
 
-def get_h1(content):
-    m = re.search(r'<h1[^>]*>(.*?)</h1>', content, re.DOTALL)
-    if not m: return ""
-    return re.sub(r'<[^>]+>', '', m.group(1)).strip()
-
 def h1_to_page_label(h1):
     """Strip 'Repair in City' suffix, fix 'Shaking Vibrating' → 'Shaking & Vibrating'."""
     label = re.sub(r'\s+Repair in .+$', '', h1).strip()
@@ -69,13 +70,12 @@ def h1_to_page_label(h1):
 
 # ── 1. Breadcrumb fix ────────────────────────────────────────────────────────
 
-def fix_breadcrumb(content, page_type, brand, city_info, appliance):
+def fix_breadcrumb(content, h1, page_type, brand, city_info, appliance):
     if not appliance or appliance not in HUBS:
         return content, False
 
     hub_url  = HUBS[appliance]
     hub_name = HUB_NAMES[appliance]
-    h1       = get_h1(content)
     page_label = h1_to_page_label(h1) if h1 else "Repair"
 
     def replace_block(match):
@@ -130,7 +130,7 @@ def fix_breadcrumb(content, page_type, brand, city_info, appliance):
 
 # ── 2. Title / og:title fix ──────────────────────────────────────────────────
 
-CITY_NAMES_RE = "Denver|Aurora|Arvada|Highlands Ranch|Lakewood|Westminster"
+CITY_NAMES_RE = "|".join(re.escape(loc["name"]) for loc in locations.cities() if loc["tier"] <= 2)
 
 def fix_title(content):
     changed = False
@@ -234,6 +234,10 @@ def fix_meta_desc(content, relpath):
 # ── main ─────────────────────────────────────────────────────────────────────
 
 def main():
+    parser = argparse.ArgumentParser(description="Fix breadcrumbs, titles and meta descriptions on problem pages")
+    changed_pages.add_arguments(parser)
+    args = parser.parse_args()
+
     root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     
     # All problem pages: Denver (40) + city (103) + brand+city (10)
@@ -252,6 +256,8 @@ def main():
     examples = {"bc": [], "title": [], "desc": []}
 
     all_files = list(set(candidates + subdir_files))
+    all_files = [str(p) for p in changed_pages.select(args, [Path(f) for f in sorted(all_files)])]
+    print(f"Scope: {len(all_files)} files ({changed_pages.scope_label(args)})")
 
     for fpath in sorted(all_files):
         relpath = os.path.relpath(fpath, root).replace("\\", "/")
@@ -260,8 +266,8 @@ def main():
         if not os.path.exists(fpath):
             continue
 
-        with open(fpath, encoding="utf-8") as f:
-            original = f.read()
+        page = load_page(fpath)
+        original = page.html
 
         content = original
         file_changed = False
@@ -269,7 +275,7 @@ def main():
         # 1. Breadcrumb
         page_type, brand, city_info, appliance = classify(fpath)
         if page_type:
-            content, bc_changed = fix_breadcrumb(content, page_type, brand, city_info, appliance)
+            content, bc_changed = fix_breadcrumb(content, page.h1, page_type, brand, city_info, appliance)
             if bc_changed:
                 stats["bc_fixed"] += 1
                 file_changed = True
@@ -298,8 +304,7 @@ def main():
 
         if file_changed:
             stats["files_changed"] += 1
-            with open(fpath, "w", encoding="utf-8") as f:
-                f.write(content)
+            write_page(fpath, content)
 
     print(f"\n=== FIX COMPLETE ===")
     print(f"Files changed:            {stats['files_changed']}")
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+generate_area_pages.py — Render the city and neighborhood pages from the locations dataset.
+
+Every row of tools/data/locations.csv (see locations.py) is an area page.
+This renders each one from tools/template_city_base.html:
+
+  * the {{SLOT}} placeholders get the location's name, slug, place and URL,
+    plus a title and meta description derived from them;
+  * the marker blocks (SEO_H1, SEO_INTRO, SEO_BODY, RELATED_LINKS) keep the
+    page's current content, so copy written into a generated page survives
+    a re-render; a new page starts with the template's default copy;
+  * the area cards come from tools/data/nearest-areas.json
+    (nearest_areas.py), and the speculation rules are recomputed
+    (speculation_rules.py).
+
+Only pages the generator owns are written: new pages, and pages that already
+carry a <!-- SEO_BODY --> block. Hand-maintained area pages (no SEO_BODY
+block) are reported and left alone. New pages are appended to sitemap.xml.
+Run nearest_areas.py --write first when rows were added, so the new areas
+have cards, and related_links.py --write afterwards to fill the new pages'
+related-links block.
+
+Pages render in worker processes, so adding a batch of suburbs is one data
+edit and one run.
+
+Usage:
+    python3 tools/generate_area_pages.py                      # dry run: list pages that would change
+    python3 tools/generate_area_pages.py --write              # write pages + sitemap.xml
+    python3 tools/generate_area_pages.py --check              # exit 1 if any generated page is out of date
+    python3 tools/generate_area_pages.py parker castle-rock --write
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from html import escape
+
+import locations
+import nearest_areas
+import speculation_rules
+from page_model import load_page, write_page
+from seo_lint import TITLE_MAX
+from site_pages import REPO_ROOT, SITE_URL
+
+DEFAULT_TEMPLATE = REPO_ROOT / "tools" / "template_city_base.html"
+SITEMAP_PATH = REPO_ROOT / "sitemap.xml"
+SITEMAP_PRIORITY = "0.8"
+
+OWNED_MARKER = "<!-- SEO_BODY -->"
+# Blocks whose content belongs to the page, not the template.
+CARRIED_BLOCKS = [
+    ("<!-- SEO_H1 -->", "<!-- /SEO_H1 -->"),
+    ("<!-- SEO_INTRO -->", "<!-- /SEO_INTRO -->"),
+    ("<!-- SEO_BODY -->", "<!-- /SEO_BODY -->"),
+    ("<!-- RELATED_LINKS -->", "<!-- /RELATED_LINKS -->"),
+]
+
+_TITLE_RE = re.compile(r"<title>(.*?)</title>", re.S)
+_DESCRIPTION_RE = re.compile(r'<meta name="description" content="([^"]*)"')
+
+
+# ===================================================================
+# Render
+# ===================================================================
+
+def default_title(loc):
+    title = f"Appliance Repair in {loc['place']}, CO | Elevate Repair"
+    if len(title) > TITLE_MAX:
+        title = f"Appliance Repair in {loc['name']} | Elevate Repair"
+    return escape(title)
+
+
+def default_description(loc):
+    return escape(f"{loc['name']} appliance repair by Elevate Repair. Same-day service, upfront pricing, "
+                  "60-day warranty. Fridges, washers, dryers, dishwashers, ovens.")
+
+
+def _block_span(html, open_marker, close_marker):
+    """(start, end) of the content between a marker pair, or None."""
+    start = html.find(open_marker)
+    end = html.find(close_marker, start + len(open_marker)) if start >= 0 else -1
+    return (start + len(open_marker), end) if end >= 0 else None
+
+
+def carry_blocks(html, old_html):
+    """Copy the CARRIED_BLOCKS content of old_html into html."""
+    for open_marker, close_marker in CARRIED_BLOCKS:
+        old, new = _block_span(old_html, open_marker, close_marker), _block_span(html, open_marker, close_marker)
+        if old and new:
+            html = html[:new[0]] + old_html[old[0]:old[1]] + html[new[1]:]
+    return html
+
+
+def render_page(job, template_html, site_urls, nearest):
+    """Render one location. Returns (rel, new_html or None, action, error)."""
+    loc, old_html = job
+    rel = locations.page_file(loc).relative_to(REPO_ROOT).as_posix()
+    if old_html is not None and OWNED_MARKER not in old_html:
+        return rel, None, "hand-maintained", None
+
+    values = locations.slot_values(loc)
+    if old_html is None:
+        html = template_html
+        values["SEO_TITLE"], values["SEO_META_DESCRIPTION"] = default_title(loc), default_description(loc)
+    else:
+        html = carry_blocks(template_html, old_html)
+        title, description = _TITLE_RE.search(old_html), _DESCRIPTION_RE.search(old_html)
+        values["SEO_TITLE"] = title.group(1) if title else default_title(loc)
+        values["SEO_META_DESCRIPTION"] = description.group(1) if description else default_description(loc)
+    html = nearest_areas.render_page(locations.fill_slots(html, values), nearest)
+
+    unfilled = locations.unfilled_slots(html)
+    if unfilled:
+        return rel, None, "error", f"unfilled slots: {', '.join(unfilled)}"
+    html, _ = speculation_rules.transform_page(rel, html, site_urls)
+    if old_html is None:
+        return rel, html, "created", None
+    return rel, html, "up to date" if html == old_html else "updated", None
+
+
+def render_all(rows, template_html, site_urls, nearest, workers=None):
+    """[(loc, rel, new_html or None, action, error)] for the given locations."""
+    jobs = []
+    for loc in rows:
+        path = locations.page_file(loc)
+        jobs.append((loc, load_page(path).html if path.exists() else None))
+    worker = partial(render_page, template_html=template_html, site_urls=site_urls, nearest=nearest)
+    if len(jobs) < 8 or workers == 1:
+        results = [worker(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunk = max(len(jobs) // ((workers or os.cpu_count() or 1) * 4), 1)
+            results = list(pool.map(worker, jobs, chunksize=chunk))
+    return [(loc, *result) for (loc, _), result in zip(jobs, results)]
+
+
+# ===================================================================
+# Sitemap
+# ===================================================================
+
+def add_to_sitemap(urls):
+    """Append clean URLs missing from sitemap.xml before </urlset>. Returns how many were added."""
+    sitemap = SITEMAP_PATH.read_text(encoding="utf-8")
+    today = time.strftime("%Y-%m-%d")
+    entries = [f"  <url>\n    <loc>{SITE_URL}{url}</loc>\n    <lastmod>{today}</lastmod>\n"
+               f"    <changefreq>monthly</changefreq>\n    <priority>{SITEMAP_PRIORITY}</priority>\n  </url>\n"
+               for url in urls if f"<loc>{SITE_URL}{url}</loc>" not in sitemap]
+    if entries and "</urlset>" in sitemap:
+        SITEMAP_PATH.write_text(sitemap.replace("</urlset>", "".join(entries) + "</urlset>", 1), encoding="utf-8")
+        return len(entries)
+    return 0
+
+
+# ===================================================================
+# Main
+# ===================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the area pages from tools/data/locations.csv")
+    parser.add_argument("slugs", nargs="*", help="Locations to render (default: every row of the dataset)")
+    parser.add_argument("--template", default=str(DEFAULT_TEMPLATE), help="City page template")
+    parser.add_argument("--write", action="store_true", help="Write pages and sitemap.xml (default: dry run)")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if any page is missing or out of date (implies dry run)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--report", default=None, metavar="PATH", help="Write the per-page report as JSON")
+    args = parser.parse_args()
+    write = args.write and not args.check
+
+    try:
+        rows = locations.load_locations()
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    if args.slugs:
+        known = locations.by_slug(rows)
+        unknown = [s for s in args.slugs if s not in known]
+        if unknown:
+            print(f"ERROR: not in {locations.DATASET.name}: {', '.join(unknown)}", file=sys.stderr)
+            return 1
+        rows = [known[s] for s in args.slugs]
+    with open(args.template, encoding="utf-8") as f:
+        template_html = f.read()
+
+    print("=" * 60)
+    print("  Elevate Repair — Area Pages")
+    print("=" * 60)
+    print(f"  Mode: {'WRITE' if write else 'DRY RUN'}")
+    print(f"  Locations: {len(rows)}")
+
+    site_urls = speculation_rules.site_url_set() | {loc["page"] for loc in rows}
+    data = nearest_areas.load_data()
+    nearest = nearest_areas.nearest_for(data) if data else {}
+    missing = [loc["slug"] for loc in rows if loc["slug"] not in nearest]
+    if missing:
+        print(f"  No area cards yet for {len(missing)} location(s) — run tools/nearest_areas.py --write first")
+    results = render_all(rows, template_html, site_urls, nearest, args.workers)
+
+    report, counts, created = [], {}, []
+    for loc, rel, html, action, error in results:
+        report.append({"slug": loc["slug"], "page": rel, "action": action, **({"error": error} if error else {})})
+        counts[action] = counts.get(action, 0) + 1
+        if error:
+            print(f"    ! {rel}  {error}")
+        elif action in ("created", "updated"):
+            if write:
+                write_page(REPO_ROOT / rel, html)
+            print(f"    {'+' if action == 'created' else '~'} {rel}")
+            if action == "created":
+                created.append(loc["page"])
+
+    print(f"\n  Pages: {len(report)}")
+    for action, n in sorted(counts.items()):
+        print(f"    {action:26s} {n}")
+    if write and created:
+        print(f"  Sitemap: {add_to_sitemap(created)} URL(s) added")
+        print("  Next: python3 tools/related_links.py --write")
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n  Report written to {args.report}")
+    if counts.get("error"):
+        return 1
+    changed = counts.get("created", 0) + counts.get("updated", 0)
+    if args.check:
+        return 1 if changed else 0
+    if changed and not write:
+        print("\n  Dry run — re-run with --write to apply.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
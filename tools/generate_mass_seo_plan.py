@@ -25,6 +25,8 @@ import sys
 from collections import OrderedDict
 from pathlib import Path
 
+import locations
+
 # ---------------------------------------------------------------------------
 # Auto-detect repository root
 # ---------------------------------------------------------------------------
@@ -38,7 +40,7 @@ REPO_ROOT = SCRIPT_DIR.parent
 # ---------------------------------------------------------------------------
 # Tier 1: Denver — full cluster (8 problems per appliance, all 5 appliances)
 # ---------------------------------------------------------------------------
-DENVER = {"name": "Denver", "slug": "denver", "tier": 1}
+DENVER = next({"name": c["name"], "slug": c["slug"], "tier": 1} for c in locations.cities(tier=1))
 
 DENVER_APPLIANCE_PROBLEMS = OrderedDict([
     ("Washer", {
@@ -115,14 +117,9 @@ DENVER_APPLIANCE_PROBLEMS = OrderedDict([
 
 # ---------------------------------------------------------------------------
 # Tier 2: High-income cities — 4 appliances × 5 problems (NO oven)
+# The cities are the tier 2 rows of tools/data/locations.csv.
 # ---------------------------------------------------------------------------
-TIER2_CITIES = [
-    {"name": "Aurora",            "slug": "aurora",            "tier": 2},
-    {"name": "Highlands Ranch",   "slug": "highlands-ranch",   "tier": 2},
-    {"name": "Lakewood",          "slug": "lakewood",          "tier": 2},
-    {"name": "Arvada",            "slug": "arvada",            "tier": 2},
-    {"name": "Westminster",       "slug": "westminster",       "tier": 2},
-]
+TIER2_CITIES = [{"name": c["name"], "slug": c["slug"], "tier": 2} for c in locations.cities(tier=2)]
 
 TIER2_APPLIANCE_PROBLEMS = OrderedDict([
     ("Washer", {
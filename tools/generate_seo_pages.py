@@ -8,6 +8,25 @@ Uses a template with marker blocks for content injection.
 Usage:
     python3 tools/generate_seo_pages.py --plan tools/seo_plan_top20.json --template tools/template_city_base.html --limit 20 --dry-run
     python3 tools/generate_seo_pages.py --plan tools/seo_plan_top20.json --template tools/template_city_base.html --limit 20
+    python3 tools/generate_seo_pages.py --plan tools/seo_plan_authority_150.json --template tools/template_city_base.html --limit 150 --dry-run --concurrency 4 --rpm 30
+    python3 tools/generate_seo_pages.py --plan tools/seo_plan_authority_150.json --template tools/template_city_base.html --limit 150 --budget 5.00 --concurrency 4
+    python3 tools/generate_seo_pages.py --plan tools/seo_plan_authority_150.json --template tools/template_city_base.html --limit 150 --batch
+    python3 tools/generate_seo_pages.py --plan tools/seo_plan_authority_150.json --template tools/template_city_base.html --limit 150 --prompt-layout cached --concurrency 4
+    python3 tools/generate_seo_pages.py --plan tools/seo_plan_authority_150.json --template tools/template_city_base.html --limit 150 --siblings 5 --concurrency 2
+    python3 tools/generate_seo_pages.py --plan tools/seo_plan_authority_150.json --template tools/template_city_base.html --limit 150 --concurrency 4 --max-repairs 3
+    python3 tools/generate_seo_pages.py --plan tools/seo_plan_authority_150.json --template tools/template_city_base.html --limit 150 --dry-run --check-cannibalization
+    python3 tools/generate_seo_pages.py --plan tools/seo_plan_authority_150.json --staged
+    python3 tools/generate_seo_pages.py --plan tools/seo_plan_authority_150.json --since main
+
+--since / --staged generate nothing: they re-run validation and duplicate
+detection on the plan's pages that changed (tools/changed_pages.py).
+
+Synchronous requests are hedged (tools/llm_hedge.py): one still unanswered at
+the run's p95 response time gets a duplicate, up to --hedge-budget of extra
+requests and within --concurrency, --rpm and --budget, and the summary
+reports the tail latency that saved.
+
+Set OPENAI_BASE_URL to target a proxy or the local stand-in (tools/openai_stub_server.py).
 """
 
 import argparse
@@ -16,29 +35,52 @@ import json
 import os
 import re
 import sys
+import threading
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from html import escape
 from pathlib import Path
 
+import changed_pages
+import llm_batch
+import llm_budget
+import llm_hedge
+import locations
+import nearest_areas
+import prompt_layout
+import related_links
+import speculation_rules
+from page_model import Page, load_page, write_page
+from site_pages import iter_site_pages, page_url
+
 REPO_ROOT = Path(__file__).resolve().parent.parent
 
+# Override to point at a proxy or a local stand-in (tools/openai_stub_server.py).
+OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL", "https://api.openai.com/v1").rstrip("/")
+
 # Required marker pairs in the template
 REQUIRED_MARKERS = [
-    ("<!-- SEO_TITLE -->", "<!-- /SEO_TITLE -->"),
-    ("<!-- SEO_META_DESCRIPTION -->", "<!-- /SEO_META_DESCRIPTION -->"),
     ("<!-- SEO_H1 -->", "<!-- /SEO_H1 -->"),
     ("<!-- SEO_INTRO -->", "<!-- /SEO_INTRO -->"),
     ("<!-- SEO_BODY -->", "<!-- /SEO_BODY -->"),
 ]
 
+# Required {{SLOT}} placeholders: head text plus the city slots (tools/locations.py)
+REQUIRED_SLOTS = ["SEO_TITLE", "SEO_META_DESCRIPTION", "PAGE_URL", "AREA_NAME", "AREA_SLUG"]
+
 
 def validate_template(template_content):
-    """Validate that all required markers exist in the template. Exit if any are missing."""
+    """Validate that all required markers and slots exist in the template. Exit if any are missing."""
     missing = []
     for open_marker, close_marker in REQUIRED_MARKERS:
         if open_marker not in template_content:
             missing.append(open_marker)
         if close_marker not in template_content:
             missing.append(close_marker)
+    slots = set(locations.unfilled_slots(template_content))
+    missing += [f"{{{{{slot}}}}}" for slot in REQUIRED_SLOTS if slot not in slots]
     if missing:
         print("ERROR: Template is missing required markers:", file=sys.stderr)
         for m in missing:
@@ -85,7 +127,102 @@ def build_prompt(prompt_template, entry):
     return result
 
 
-def call_openai(prompt, model="gpt-4o", timeout=180, max_retries=2):
+SYSTEM_PROMPT = (
+    "You are an expert SEO content writer for a local appliance repair company. "
+    "Write unique, helpful, accurate content. Follow the output format exactly. "
+    "Do not wrap output in code fences. Output raw text and HTML as instructed."
+)
+
+MAX_COMPLETION_TOKENS = 3000
+
+# page_prompt.txt asks for a 900-1200 word BODY.
+BODY_WORDS_MIN, BODY_WORDS_MAX = 900, 1200
+
+# Follow-up requests allowed per page when its response fails parsing or validation.
+DEFAULT_MAX_REPAIRS = 2
+
+REPAIR_PROMPT = """Your previous response for this page could not be published:
+{problems}
+
+Rewrite the complete page for {city} ({category} / {problem}), fixing the problems above and
+keeping everything else that was fine. Respond in the same TITLE/DESCRIPTION/H1/INTRO/BODY format.
+"""
+
+# Sibling mode packs several pages into one completion; the model's output
+# ceiling (16k tokens for gpt-4o) caps how many fit.
+MAX_OUTPUT_TOKENS = 16384
+MAX_SIBLINGS = MAX_OUTPUT_TOKENS // MAX_COMPLETION_TOKENS
+
+SIBLING_INSTRUCTIONS = """This request covers {count} sibling pages. Apply the instructions above to each page
+separately, using that page's details below. Each page must be written independently: do not
+reuse sentences or paragraphs between pages.
+
+Instead of the TITLE/DESCRIPTION/H1/INTRO/BODY text format, respond with one JSON object:
+{{"pages": [{{"id": "<page id>", "title": "...", "description": "...", "h1": "...", "intro": "...", "body": "<raw HTML>"}}]}}
+with exactly one object per page, in the order given, using each page's id verbatim.
+"""
+
+SIBLING_DETAILS = """PAGE {index} DETAILS (id: {id}):
+- City: {city}
+- Parent page: {parent_page}
+- Appliance: {category}
+- Problem: {problem}
+"""
+
+# Batch jobs are guaranteed to finish within their 24h completion window.
+BATCH_COMPLETION_WINDOW_S = 24 * 3600
+
+
+def build_messages(prompt, followup=None):
+    """Build the chat messages for one page prompt.
+
+    `followup` is a (previous response, repair prompt) pair: the earlier
+    answer is replayed as the assistant turn and the repair prompt follows it.
+    """
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+    if followup:
+        previous, repair_prompt = followup
+        messages += [
+            {"role": "assistant", "content": previous},
+            {"role": "user", "content": repair_prompt},
+        ]
+    return messages
+
+
+def build_chat_payload(prompt, model="gpt-4o", max_tokens=MAX_COMPLETION_TOKENS, json_mode=False, followup=None):
+    """Build the Chat Completions request body for one page prompt."""
+    payload = {
+        "model": model,
+        "messages": build_messages(prompt, followup),
+        "temperature": 0.75,
+        "max_tokens": max_tokens,
+    }
+    if json_mode:
+        payload["response_format"] = {"type": "json_object"}
+    return payload
+
+
+def build_sibling_prompt(prompt_template, entries):
+    """Build one prompt asking for every entry's page in a single JSON response.
+
+    The shared instructions come from prompt_layout.compile_layout(), so the
+    per-page details are the only part that differs between siblings.
+    """
+    _, prefix = prompt_layout.compile_layout(prompt_template)
+    details = "\n".join(
+        SIBLING_DETAILS.format(index=i, id=entry["output_filename"], city=entry["city"],
+                               parent_page=entry["parent_page"], category=entry["category"],
+                               problem=entry["problem"])
+        for i, entry in enumerate(entries, 1)
+    )
+    return prefix + SIBLING_INSTRUCTIONS.format(count=len(entries)) + "\n" + details
+
+
+def call_openai(prompt, model="gpt-4o", timeout=180, max_retries=2, return_usage=False,
+                max_tokens=MAX_COMPLETION_TOKENS, json_mode=False, followup=None, hedger=None):
     """Call OpenAI Chat Completions API with retry logic.
 
     Args:
@@ -93,8 +230,13 @@ def call_openai(prompt, model="gpt-4o", timeout=180, max_retries=2):
         model: OpenAI model ID.
         timeout: Request timeout in seconds (default 180).
         max_retries: Number of retries on timeout/connection errors (default 2).
+        return_usage: Also return the API `usage` object (default False).
+        max_tokens: Completion token cap (default MAX_COMPLETION_TOKENS).
+        json_mode: Request a JSON object response (default False).
+        followup: (previous response, repair prompt) to continue the conversation with.
+        hedger: llm_hedge.Hedger to duplicate straggling requests with (default: no hedging).
 
-    Returns the assistant message content.
+    Returns the assistant message content, or (content, usage) if return_usage.
     """
     import requests
 
@@ -106,35 +248,36 @@ def call_openai(prompt, model="gpt-4o", timeout=180, max_retries=2):
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json",
     }
-    payload = {
-        "model": model,
-        "messages": [
-            {
-                "role": "system",
-                "content": (
-                    "You are an expert SEO content writer for a local appliance repair company. "
-                    "Write unique, helpful, accurate content. Follow the output format exactly. "
-                    "Do not wrap output in code fences. Output raw text and HTML as instructed."
-                ),
-            },
-            {"role": "user", "content": prompt},
-        ],
-        "temperature": 0.75,
-        "max_tokens": 3000,
-    }
-
+    payload = build_chat_payload(prompt, model, max_tokens=max_tokens, json_mode=json_mode, followup=followup)
+
+    def send():
+        """POST once. Returns (response JSON, seconds until the whole response arrived)."""
+        started = time.monotonic()
+        resp = requests.post(
+            f"{OPENAI_BASE_URL}/chat/completions",
+            headers=headers,
+            json=payload,
+            timeout=timeout,
+        )
+        resp.raise_for_status()
+        return resp.json(), time.monotonic() - started
+
+    def projected_cost():
+        """What a duplicate may cost: the prompt plus a completion of max_tokens."""
+        return llm_budget.estimate_entry(payload["messages"], model, max_tokens)["cost"]
+
+    kind = f"{model}/{'siblings' if json_mode else 'page'}{'/repair' if followup else ''}"
     last_exception = None
     for attempt in range(1 + max_retries):
         try:
-            resp = requests.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=timeout,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            return data["choices"][0]["message"]["content"]
+            if hedger:
+                data = hedger.run(send, kind, usage_of=lambda d: d.get("usage"), projected_cost=projected_cost)
+            else:
+                data, _ = send()
+            content = data["choices"][0]["message"]["content"]
+            if return_usage:
+                return content, data.get("usage") or {}
+            return content
         except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
             last_exception = e
             if attempt < max_retries:
@@ -145,8 +288,20 @@ def call_openai(prompt, model="gpt-4o", timeout=180, max_retries=2):
                 raise last_exception
 
 
-def parse_openai_response(response_text):
-    """Parse the structured response into title, description, h1, intro, body."""
+SECTION_KEYS = ("title", "description", "h1", "intro", "body")
+
+
+def parse_openai_response(response_text, ids=None):
+    """Parse the structured response into title, description, h1, intro, body.
+
+    With `ids`, the response is a sibling-mode JSON object ({"pages": [...]})
+    and the result maps each id to its own sections dict. Pages that are
+    missing or malformed come back with empty sections, so each sibling can
+    be validated (and retried) on its own.
+    """
+    if ids is not None:
+        return _parse_sibling_response(response_text, ids)
+
     sections = {}
 
     # Extract each labeled section
@@ -168,6 +323,24 @@ def parse_openai_response(response_text):
     return sections
 
 
+def _parse_sibling_response(response_text, ids):
+    """Split a sibling-mode JSON response into {id: sections}."""
+    parsed = {page_id: dict.fromkeys(SECTION_KEYS, "") for page_id in ids}
+    text = re.sub(r"^```(?:json)?\s*|\s*```$", "", response_text.strip())
+    try:
+        pages = json.loads(text).get("pages")
+    except (ValueError, AttributeError):
+        return parsed
+    if not isinstance(pages, list):
+        return parsed
+
+    for page in pages:
+        if not isinstance(page, dict) or page.get("id") not in parsed:
+            continue
+        parsed[page["id"]] = {k: str(page.get(k) or "").strip() for k in SECTION_KEYS}
+    return parsed
+
+
 def replace_marker_block(html, open_marker, close_marker, new_content):
     """Replace content between marker comments, preserving the markers themselves."""
     pattern = re.escape(open_marker) + r".*?" + re.escape(close_marker)
@@ -175,53 +348,27 @@ def replace_marker_block(html, open_marker, close_marker, new_content):
     return re.sub(pattern, replacement, html, count=1, flags=re.DOTALL)
 
 
-def replace_city_references(html, target_city, target_slug):
-    """Replace Cherry Creek references outside of nav/header/footer with target city.
+def area_slots(entry):
+    """{slot: value} for an entry's city, from the locations dataset when it is listed there.
 
-    This handles section headings, mid-CTA text, form headings, hidden field values,
-    and other city-specific text in the template that falls outside the marker blocks.
+    The canonical / og:url slot points at the page being generated.
     """
-    # Replace the visible city name in non-nav, non-footer sections
-    # These are the hardcoded Cherry Creek references in the template body
-    replacements = [
-        # Services section heading
-        ("Appliance Repair Services in Cherry Creek", f"Appliance Repair Services in {target_city}"),
-        # Services section intro
-        ("We cover Cherry Creek North, Cherry Creek South, and all surrounding blocks between University Boulevard and Colorado Boulevard.",
-         f"We provide full appliance repair coverage throughout {target_city} and surrounding neighborhoods."),
-        # Mid CTA
-        ("Same-day appointments available in Cherry Creek.", f"Same-day appointments available in {target_city}."),
-        # Form section heading
-        ("Schedule Appliance Repair in Cherry Creek", f"Schedule Appliance Repair in {target_city}"),
-        # Form hidden field
-        ('value="website-cherry-creek"', f'value="website-{target_slug}"'),
-        # Area cards heading
-        ("Appliance Repair Near Cherry Creek", f"Appliance Repair Near {target_city}"),
-        # Brands heading
-        ("Appliance Brands We Service in Cherry Creek", f"Appliance Brands We Service in {target_city}"),
-        # Final CTA heading
-        ("Need Appliance Repair in Cherry Creek?", f"Need Appliance Repair in {target_city}?"),
-    ]
+    loc = locations.by_slug().get(entry["city_slug"]) or {"name": entry["city"], "slug": entry["city_slug"], "page": "/"}
+    return locations.slot_values(loc, page_url(REPO_ROOT / entry["output_filename"]))
 
-    for old, new in replacements:
-        html = html.replace(old, new)
 
-    return html
+@lru_cache(maxsize=None)
+def nearest_cards():
+    """{slug: cards} for the <!-- AREA_CARDS --> block, from nearest-areas.json (computed if not built yet)."""
+    data = nearest_areas.load_data() or nearest_areas.compute(locations.load_locations())
+    return nearest_areas.nearest_for(data)
 
 
 def inject_content(template_html, sections, entry):
-    """Inject parsed content into the template using marker blocks, then fix city refs."""
+    """Inject parsed content into the template's marker blocks, then fill its slots and area cards."""
     html = template_html
 
     # 1. Replace marker blocks
-    html = replace_marker_block(
-        html, "<!-- SEO_TITLE -->", "<!-- /SEO_TITLE -->",
-        sections.get("title", "")
-    )
-    html = replace_marker_block(
-        html, "<!-- SEO_META_DESCRIPTION -->", "<!-- /SEO_META_DESCRIPTION -->",
-        sections.get("description", "")
-    )
     html = replace_marker_block(
         html, "<!-- SEO_H1 -->", "<!-- /SEO_H1 -->",
         f'<h1>{sections.get("h1", "")}</h1>'
@@ -235,14 +382,16 @@ def inject_content(template_html, sections, entry):
         f'\n            <div class="content-body">\n{sections.get("body", "")}\n            </div>\n            '
     )
 
-    # 2. Replace city references outside markers
-    html = replace_city_references(html, entry["city"], entry["city_slug"])
+    # 2. Fill the head and city slots
+    slots = area_slots(entry)
+    slots["SEO_TITLE"] = escape(sections.get("title", ""))
+    slots["SEO_META_DESCRIPTION"] = escape(sections.get("description", ""))
+    return nearest_areas.render_page(locations.fill_slots(html, slots), nearest_cards())
 
-    return html
 
-
-def validate_output(html, entry):
-    """Validate generated HTML for common issues. Returns list of error strings."""
+def validate_output(page, entry):
+    """Validate a generated Page (page_model.py) for common issues. Returns list of error strings."""
+    html = page.html
     errors = []
 
     # Check for Cherry Creek leakage
@@ -252,8 +401,9 @@ def validate_output(html, entry):
         main_match = re.search(r"</header>(.*)<footer", html, re.DOTALL)
         if main_match:
             main_content = main_match.group(1)
-            # Exclude nav links that reference cherry-creek.html
-            cleaned = re.sub(r'href="/cherry-creek\.html"', "", main_content)
+            # Exclude nav links that reference cherry-creek.html, and the nearby-area cards
+            cleaned = re.sub(r"<!-- AREA_CARDS:[a-z0-9-]+ -->.*?<!-- /AREA_CARDS -->", "", main_content, flags=re.S)
+            cleaned = re.sub(r'href="/cherry-creek\.html"', "", cleaned)
             if "Cherry Creek" in cleaned:
                 errors.append(f"Cherry Creek reference found in {entry['city']} page content")
 
@@ -261,37 +411,54 @@ def validate_output(html, entry):
     if "<<<<<<" in html or "=======" in html and ">>>>>>>" in html:
         errors.append("Merge conflict markers detected")
 
-    # Check that markers are present (template integrity)
+    # Check that markers are present and every slot was filled (template integrity)
     for open_marker, _ in REQUIRED_MARKERS:
         if open_marker not in html:
             errors.append(f"Missing marker: {open_marker}")
+    for slot in locations.unfilled_slots(html):
+        errors.append(f"Unfilled slot: {{{{{slot}}}}}")
 
     return errors
 
 
-def check_duplicates(created_files):
-    """Check for duplicate paragraphs across generated files."""
+def paragraph_hashes_of(body_html):
+    """Yield (md5, text) for each body paragraph long enough to count as content."""
+    for para in re.findall(r"<p>(.*?)</p>", body_html, re.DOTALL):
+        clean = re.sub(r"<[^>]+>", "", para).strip()
+        if len(clean) < 80:
+            continue  # Skip short paragraphs (CTAs, links, etc.)
+        yield hashlib.md5(clean.encode()).hexdigest(), clean
+
+
+def _seo_body(filepath):
+    """The SEO_BODY section of a generated file, or None."""
+    return load_page(filepath).marker("SEO_BODY")
+
+
+def check_duplicates(created_files, existing_files=()):
+    """Check for duplicate paragraphs across generated files.
+
+    Paragraphs of `existing_files` are indexed first, so each created file is
+    also checked against them; duplicates among existing files aren't reported.
+    """
     paragraph_hashes = {}  # hash -> (filename, paragraph_text)
     duplicates = []
 
-    for filepath in created_files:
-        with open(filepath, "r") as f:
-            content = f.read()
+    created = {str(f) for f in created_files}
+    for filepath in existing_files:
+        if str(filepath) in created:
+            continue
+        body = _seo_body(filepath)
+        for h, clean in paragraph_hashes_of(body or ""):
+            paragraph_hashes.setdefault(h, (str(filepath), clean))
 
+    for filepath in created_files:
         # Extract paragraphs from the SEO_BODY section only
-        body_match = re.search(r"<!-- SEO_BODY -->(.+?)<!-- /SEO_BODY -->", content, re.DOTALL)
-        if not body_match:
+        body = _seo_body(filepath)
+        if body is None:
             continue
 
-        paragraphs = re.findall(r"<p>(.*?)</p>", body_match.group(1), re.DOTALL)
-
-        for para in paragraphs:
-            clean = re.sub(r"<[^>]+>", "", para).strip()
-            if len(clean) < 80:
-                continue  # Skip short paragraphs (CTAs, links, etc.)
-
-            h = hashlib.md5(clean.encode()).hexdigest()
-
+        for h, clean in paragraph_hashes_of(body):
             if h in paragraph_hashes:
                 other_file = paragraph_hashes[h][0]
                 if other_file != str(filepath):
@@ -306,6 +473,32 @@ def check_duplicates(created_files):
     return duplicates
 
 
+def validate_changed(plan, args):
+    """Validate the plan's pages that changed (--since / --staged). Returns an exit code."""
+    by_path = {REPO_ROOT / entry["output_filename"]: entry for entry in plan}
+    paths = changed_pages.select(args, sorted(by_path))
+    print(f"\n  Validating {len(paths)} changed page(s) ({changed_pages.scope_label(args)})...")
+
+    failed = 0
+    for path in paths:
+        errors = validate_output(load_page(path), by_path[path])
+        if errors:
+            failed += 1
+            print(f"    ! {path.relative_to(REPO_ROOT)}")
+            for error in errors:
+                print(f"        {error}")
+
+    generated = [p for p in iter_site_pages() if "SEO_BODY" in load_page(p).markers]
+    duplicates = check_duplicates(paths, generated)
+    if duplicates:
+        print(f"  WARNING: {len(duplicates)} duplicate paragraph(s) found:")
+        for dup in duplicates[:10]:
+            print(f"    {Path(dup['file1']).name} <-> {Path(dup['file2']).name}")
+            print(f"      \"{dup['paragraph_preview']}\"")
+    print(f"\n  {failed} page(s) failed validation, {len(duplicates)} duplicate paragraph(s)")
+    return 1 if failed or duplicates else 0
+
+
 def update_sitemap(created_files):
     """Append new URLs to sitemap.xml (append-only, before </urlset>)."""
     sitemap_path = REPO_ROOT / "sitemap.xml"
@@ -350,16 +543,490 @@ def update_sitemap(created_files):
     print(f"  Appended {len(new_entries)} new URLs to sitemap.xml")
 
 
+class RateLimiter:
+    """Keep at most `concurrency` requests in flight and space launches at least 60/rpm seconds apart.
+
+    run_concurrent() takes a slot with wait() once free() says there is one;
+    hedged duplicates (llm_hedge.py) only take one with try_acquire() if it
+    is available right now. Every slot taken is given back with release().
+    """
+
+    def __init__(self, rpm, concurrency=None):
+        self.interval = 60.0 / rpm if rpm else 0.0
+        self.concurrency = concurrency
+        self.next_launch = 0.0
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def free(self):
+        with self._lock:
+            return self.concurrency is None or self.in_flight < self.concurrency
+
+    def wait(self):
+        """Take a slot, sleeping until the next launch is allowed."""
+        with self._lock:
+            now = time.monotonic()
+            launch = max(now, self.next_launch)
+            self.next_launch = launch + self.interval
+            self.in_flight += 1
+        if launch > now:
+            time.sleep(launch - now)
+
+    def try_acquire(self):
+        """Take a slot if one is free and a launch is allowed now. Returns True on success."""
+        with self._lock:
+            now = time.monotonic()
+            if (self.concurrency is not None and self.in_flight >= self.concurrency) or now < self.next_launch:
+                return False
+            self.next_launch = now + self.interval
+            self.in_flight += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+
+
+def generate_page(entry, prompt_template, template_html, model, repair=None, hedger=None):
+    """Generate, validate and write one page.
+
+    Returns a result dict with "status" ("created" or "error"), the API
+    "usage", and either "path"/"word_count" or "error". Pass the failed
+    result of an earlier attempt as `repair` to send a targeted follow-up
+    (see build_repair_prompt) instead of starting over. `hedger` is passed
+    on to call_openai().
+    """
+    prompt = build_prompt(prompt_template, entry)
+    followup = (repair["response"], build_repair_prompt(entry, repair["failures"])) if repair else None
+    started = time.monotonic()
+    response_text, usage = call_openai(prompt, model=model, return_usage=True, followup=followup,
+                                       hedger=hedger)
+    elapsed = time.monotonic() - started
+    result = finish_page(entry, response_text, usage, template_html)
+    result["elapsed"] = elapsed
+    return result
+
+
+def finish_page(entry, response_text, usage, template_html, sections=None):
+    """Parse a model response, inject it into the template, validate and write it.
+
+    Pass already-parsed `sections` (sibling mode) instead of response_text.
+    """
+    filename = entry["output_filename"]
+    output_path = REPO_ROOT / filename
+
+    if sections is None:
+        sections = parse_openai_response(response_text)
+
+    def failed(failures):
+        result = {"status": "error", "file": filename, "usage": usage,
+                  "error": "; ".join(failures), "failures": failures}
+        if response_text is not None:
+            result["response"] = response_text
+        return result
+
+    # Check parsing
+    missing_sections = [k for k in SECTION_KEYS if not sections.get(k)]
+    if missing_sections:
+        return failed([f"Missing sections: {missing_sections}"])
+
+    # Inject into template
+    html = inject_content(template_html, sections, entry)
+
+    # Validate
+    validation_errors = validate_output(Page.from_html(html, output_path), entry)
+    word_count = len(re.sub(r"<[^>]+>", "", sections["body"]).split())
+    if not BODY_WORDS_MIN <= word_count <= BODY_WORDS_MAX:
+        validation_errors.append(f"Body is {word_count} words (want {BODY_WORDS_MIN}-{BODY_WORDS_MAX})")
+    if validation_errors:
+        return failed(validation_errors)
+
+    # Write file
+    write_page(output_path, html)
+
+    return {"status": "created", "file": filename, "usage": usage,
+            "path": str(output_path), "word_count": word_count}
+
+
+def build_repair_prompt(entry, failures):
+    """Follow-up prompt that names each failure of the previous response and how to fix it."""
+    problems = []
+    for failure in failures:
+        missing = re.match(r"Missing sections: \[(.*)\]", failure)
+        words = re.match(r"Body is (\d+) words", failure)
+        if missing:
+            names = ", ".join(name.strip(" '").upper() for name in missing.group(1).split(","))
+            problems.append(f"- These sections were missing or empty: {names}. Start each section with its label "
+                            f"(TITLE:, DESCRIPTION:, H1:, INTRO:, BODY:) on its own line, in that order.")
+        elif "Cherry Creek" in failure:
+            problems.append(f"- The page mentions Cherry Creek, but it is about {entry['city']}. "
+                            f"Remove every reference to Cherry Creek.")
+        elif words:
+            count = int(words.group(1))
+            fix = (f"expand it with more specific detail about {entry['problem'].lower()}"
+                   if count < BODY_WORDS_MIN else "tighten it without dropping any section")
+            problems.append(f"- The BODY is {count} words; it must be {BODY_WORDS_MIN}-{BODY_WORDS_MAX} words, "
+                            f"so {fix}.")
+        else:
+            problems.append(f"- {failure}")
+    return REPAIR_PROMPT.format(problems="\n".join(problems), city=entry["city"],
+                                category=entry["category"], problem=entry["problem"])
+
+
+def make_repairer(prompt_template, template_html, model, max_repairs=DEFAULT_MAX_REPAIRS, hedger=None):
+    """Retry hook for run_concurrent(): re-queue a failed page with a targeted follow-up.
+
+    Only parse/validation failures that came with a response are repaired
+    (API errors already have their own retries), at most `max_repairs`
+    times per page.
+    """
+    repairs = {}
+
+    def retry(label, entry, est, result):
+        filename = entry["output_filename"]
+        if not result.get("failures") or "response" not in result or repairs.get(filename, 0) >= max_repairs:
+            return None
+        repairs[filename] = repairs.get(filename, 0) + 1
+        print(f"{label} — REPAIR {repairs[filename]}/{max_repairs} ({result['error']})", flush=True)
+        # The follow-up replays the failed draft and the feedback, so it costs more than the first attempt.
+        followup = (result["response"], build_repair_prompt(entry, result["failures"]))
+        messages = build_messages(build_prompt(prompt_template, entry), followup)
+        repair_est = llm_budget.estimate_entry(messages, model, est["output_tokens"], cached_tokens=est["cached_tokens"])
+        return (lambda e: generate_page(e, prompt_template, template_html, model, repair=result, hedger=hedger),
+                repair_est)
+
+    return retry
+
+
+def generate_sibling_pages(items, prompt_template, template_html, model, max_attempts=2, hedger=None):
+    """Generate several sibling pages (same city + appliance) from one JSON completion.
+
+    `items` are (label, entry, estimate) work items. Every page is validated
+    on its own; a page that fails parsing, validate_output() or shares a
+    paragraph with an earlier sibling is retried together with the other
+    failures, up to `max_attempts` requests in total. Returns a group result
+    whose "usage" is summed over all requests and whose "pages" holds the
+    per-page (label, entry, result) triples.
+    """
+    pending = list(items)
+    pages = {}
+    usage_total = {}
+    elapsed = 0.0
+    seen_paragraphs = {}
+
+    for attempt in range(1, max_attempts + 1):
+        entries = [entry for _, entry, _ in pending]
+        ids = [entry["output_filename"] for entry in entries]
+        started = time.monotonic()
+        try:
+            response_text, usage = call_openai(
+                build_sibling_prompt(prompt_template, entries), model=model, return_usage=True,
+                max_tokens=min(MAX_COMPLETION_TOKENS * len(entries), MAX_OUTPUT_TOKENS), json_mode=True,
+                hedger=hedger,
+            )
+        except Exception as e:
+            for label, entry, _ in pending:
+                pages[entry["output_filename"]] = (label, entry, {"status": "error", "file": entry["output_filename"],
+                                                                  "usage": None, "error": str(e)})
+            break
+        finally:
+            elapsed += time.monotonic() - started
+        _add_usage(usage_total, usage)
+
+        parsed = parse_openai_response(response_text, ids=ids)
+        failed = []
+        for label, entry, est in pending:
+            filename = entry["output_filename"]
+            sections = parsed[filename]
+            shared = [seen_paragraphs[h] for h, _ in paragraph_hashes_of(sections["body"]) if h in seen_paragraphs]
+            if shared:
+                result = {"status": "error", "file": filename, "usage": None,
+                          "error": f"Duplicate paragraph shared with sibling {shared[0]}"}
+            else:
+                result = finish_page(entry, None, None, template_html, sections=sections)
+            if result["status"] == "created":
+                seen_paragraphs.update((h, filename) for h, _ in paragraph_hashes_of(sections["body"]))
+            else:
+                failed.append((label, entry, est))
+            pages[filename] = (label, entry, result)
+
+        if failed and attempt < max_attempts:
+            print(f"  Retrying {len(failed)} of {len(pending)} sibling page(s): "
+                  f"{', '.join(e['output_filename'] for _, e, _ in failed)}", flush=True)
+        pending = failed
+        if not pending:
+            break
+
+    return {"status": "group", "usage": usage_total or None, "elapsed": elapsed,
+            "pages": [pages[entry["output_filename"]] for _, entry, _ in items]}
+
+
+def _add_usage(total, usage):
+    """Accumulate an API usage object into `total` (in place)."""
+    for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+        total[key] = total.get(key, 0) + (usage or {}).get(key, 0)
+    cached = ((usage or {}).get("prompt_tokens_details") or {}).get("cached_tokens", 0) or 0
+    details = total.setdefault("prompt_tokens_details", {"cached_tokens": 0})
+    details["cached_tokens"] += cached
+
+
+def group_siblings(work, size, prompt_template, model, batch=False):
+    """Chunk (label, entry, estimate) work into sibling groups of up to `size`.
+
+    Siblings share city and appliance (prompt_layout.cache_group_key); groups
+    keep the order in which their first entry appears. Each group becomes
+    one (label, items, estimate) work item, estimated from its sibling prompt.
+    """
+    buckets = {}
+    for item in work:
+        buckets.setdefault(prompt_layout.cache_group_key(item[1]), []).append(item)
+
+    groups = []
+    for items in buckets.values():
+        for start in range(0, len(items), size):
+            chunk = items[start:start + size]
+            est = llm_budget.estimate_entry(
+                build_messages(build_sibling_prompt(prompt_template, [i[1] for i in chunk])), model,
+                sum(i[2]["output_tokens"] for i in chunk), batch=batch,
+            )
+            label = chunk[0][0] if len(chunk) == 1 else f"{chunk[0][0]} (+{len(chunk) - 1} siblings)"
+            groups.append((label, chunk, est))
+    return groups
+
+
+def run_batch(work, prompt_template, template_html, model, batch_dir, resume_batch_id=None,
+              poll_interval=30):
+    """Run the plan through the Batch API instead of one request per page.
+
+    Serializes every prompt into a batch-request JSONL (custom_id = output
+    filename), uploads it, polls until the batch finishes, then streams the
+    result file back through finish_page(). Yields (label, entry, result).
+    """
+    by_id = {entry["output_filename"]: (label, entry) for label, entry, _ in work}
+
+    if resume_batch_id:
+        batch_id = resume_batch_id
+        print(f"  Resuming batch {batch_id}")
+    else:
+        batch_dir.mkdir(parents=True, exist_ok=True)
+        batch_path = batch_dir / f"batch-{time.strftime('%Y%m%d-%H%M%S')}.jsonl"
+        requests_written = llm_batch.write_batch_file(batch_path, (
+            (entry["output_filename"], build_chat_payload(build_prompt(prompt_template, entry), model))
+            for _, entry, _ in work
+        ))
+        print(f"  Wrote {requests_written} requests to {batch_path.relative_to(REPO_ROOT)}")
+        file_id = llm_batch.upload_batch_file(batch_path)
+        batch_id = llm_batch.create_batch(file_id)["id"]
+        print(f"  Submitted batch {batch_id} (resume with --resume-batch {batch_id})")
+
+    batch = llm_batch.poll_batch(batch_id, interval=poll_interval)
+    if batch["status"] != "completed":
+        raise RuntimeError(f"Batch {batch_id} ended with status '{batch['status']}'")
+
+    seen = set()
+    for custom_id, response_text, usage, error in llm_batch.iter_batch_results(batch):
+        if custom_id not in by_id:
+            print(f"  WARNING: unexpected custom_id in batch output: {custom_id}")
+            continue
+        seen.add(custom_id)
+        label, entry = by_id[custom_id]
+        if error:
+            yield label, entry, {"status": "error", "file": custom_id, "usage": usage, "error": error}
+        else:
+            yield label, entry, finish_page(entry, response_text, usage, template_html)
+
+    for custom_id in by_id.keys() - seen:
+        label, entry = by_id[custom_id]
+        yield label, entry, {"status": "error", "file": custom_id, "usage": None,
+                             "error": "No result returned by batch"}
+
+
+def run_concurrent(work, worker, concurrency=1, rpm=None, guard=None, deferred=None, retry=None, limiter=None):
+    """Run worker(entry) over (label, entry, estimate) work items on a thread pool.
+
+    At most `concurrency` requests are in flight and launches are spaced by
+    `rpm`; pass the `limiter` a Hedger shares to count its duplicates too. With a BudgetGuard, each launch reserves the entry's projected
+    cost; once nothing is in flight and the next entry still doesn't fit,
+    the remaining work is moved to `deferred`. Yields (label, entry, result)
+    as requests complete; worker exceptions become error results.
+
+    `retry(label, entry, estimate, result)` may return a replacement
+    (worker, estimate) for a failed entry; it goes to the back of the same
+    queue, so repairs share the pool with first attempts and reserve their
+    own projected cost. The final result's "usage" covers every
+    attempt and "repairs" counts the follow-ups.
+    """
+    concurrency = max(concurrency, 1)
+    limiter = limiter or RateLimiter(rpm, concurrency)
+    queue = deque((label, entry, est, worker) for label, entry, est in work)
+    in_flight = {}
+    earlier = {}  # output filename -> (usage so far, repairs so far)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        while queue or in_flight:
+            while queue and limiter.free():
+                label, entry, est, task = queue[0]
+                if guard and not guard.try_reserve(est["cost"]):
+                    if limiter.in_flight:
+                        break  # wait for actual spend to settle, then re-check
+                    print(f"  Budget reached (${guard.spent:.2f} spent of ${guard.budget:.2f}) "
+                          f"— not launching {len(queue)} remaining page(s)")
+                    if deferred is not None:
+                        deferred.extend(item[:3] for item in queue)
+                    queue.clear()
+                    break
+                queue.popleft()
+                limiter.wait()
+                in_flight[pool.submit(task, entry)] = (label, entry, est)
+
+            if not in_flight:
+                if queue:
+                    time.sleep(0.1)  # only dropped hedge copies are running; wait for their slots
+                    continue
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                label, entry, est = in_flight.pop(future)
+                limiter.release()
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"status": "error", "file": entry["output_filename"], "usage": None, "error": str(e)}
+                if guard:
+                    guard.settle(est["cost"], result["usage"])
+                if retry is None:
+                    yield label, entry, result
+                    continue
+                key = entry["output_filename"]
+                usage, repairs = earlier.pop(key, (None, 0))
+                if usage:
+                    merged = {}
+                    _add_usage(merged, usage)
+                    _add_usage(merged, result["usage"])
+                    result["usage"] = merged
+                result["repairs"] = repairs
+                follow_up = retry(label, entry, est, result) if result["status"] == "error" else None
+                if follow_up:
+                    earlier[key] = (result["usage"], repairs + 1)
+                    task, repair_est = follow_up
+                    queue.append((label, entry, repair_est, task))
+                    continue
+                yield label, entry, result
+
+
+def estimate_entries(entries, prompt_template, model, batch=False, cached_tokens=0):
+    """Projected tokens and cost for each entry, in plan order.
+
+    `cached_tokens` is the expected prompt-cache hit for every request after
+    the first (see prompt_layout.cacheable_tokens).
+    """
+    output_tokens = llm_budget.calibrate_output_tokens(model, max_tokens=MAX_COMPLETION_TOKENS)
+    return [
+        llm_budget.estimate_entry(build_messages(build_prompt(prompt_template, entry)), model, output_tokens,
+                                  batch=batch, cached_tokens=cached_tokens if i else 0)
+        for i, entry in enumerate(entries)
+    ]
+
+
+def print_cache_report(results, model):
+    """Print the prompt-cache hit ratio, savings and latency split from API usage."""
+    stats = prompt_layout.summarize_cache_usage([r["usage"] for r in results], model)
+    print(f"  Prompt cache: {stats['ratio']:.0%} of prompt tokens served from cache "
+          f"({stats['cached_tokens']:,} of {stats['prompt_tokens']:,}), saved ${stats['saved']:.2f}")
+
+    def cached(result):
+        return ((result["usage"] or {}).get("prompt_tokens_details") or {}).get("cached_tokens", 0) > 0
+
+    for name, group in (("hit", [r for r in results if cached(r)]), ("miss", [r for r in results if not cached(r)])):
+        timings = [r["elapsed"] for r in group if "elapsed" in r]
+        if timings:
+            print(f"    cache {name:4s}: {len(timings):3d} requests, mean latency {sum(timings) / len(timings):.1f}s")
+
+
+def print_hedge_report(stats, wasted_usage, model):
+    """Print how many requests were hedged and the tail latency that saved (see llm_hedge.Hedger.summary)."""
+    if not stats["requests"]:
+        return
+    print(f"  Hedging:  {stats['hedges']} duplicate(s) of {stats['requests']} request(s) "
+          f"(budget {stats['allowed']}), {stats['hedge_wins']} finished first")
+    for kind, threshold in sorted(stats["thresholds"].items()):
+        print(f"    hedge after {threshold:.1f}s without a response ({kind})")
+    if stats["hedges"]:
+        saved = f"    tail latency saved: {stats['saved']:.1f}s"
+        if stats["still_running"]:
+            saved += f" + at least {stats['saved_at_least']:.1f}s ({stats['still_running']} straggler(s) still running)"
+        wasted = sum(llm_budget.cost_from_usage(u, model) for u in wasted_usage)
+        print(f"{saved}; duplicate spend ${wasted:.2f}")
+    if stats["p95"] is not None:
+        print(f"    request latency: p50 {stats['p50']:.1f}s, p95 {stats['p95']:.1f}s, max {stats['max']:.1f}s")
+
+
+def print_projection(projection, budget=None, deferred=None, batch=False):
+    """Print a plan cost / time projection."""
+    print(f"  Tokenizer:      {llm_budget.tokenizer_name(projection['model'])}")
+    print(f"  Requests:       {projection['requests']}")
+    print(f"  Input tokens:   {projection['input_tokens']:,}")
+    if projection["cached_tokens"]:
+        print(f"  Cached input:   {projection['cached_tokens']:,} (prompt-cache hits, discounted)")
+    print(f"  Output tokens:  {projection['output_tokens']:,} (calibrated from existing pages)")
+    if batch:
+        print(f"  Est. cost:      ${projection['cost']:.2f} ({projection['model']}, Batch API pricing)")
+        print(f"  Est. wall time: up to {llm_budget.format_duration(BATCH_COMPLETION_WINDOW_S)} "
+              f"(batch completion window)")
+    else:
+        print(f"  Est. cost:      ${projection['cost']:.2f} ({projection['model']})")
+        rpm = f", rpm={projection['rpm']}" if projection["rpm"] else ""
+        print(f"  Est. wall time: {llm_budget.format_duration(projection['wall_time_s'])} "
+              f"(concurrency={projection['concurrency']}{rpm})")
+    if budget is not None:
+        print(f"  Budget:         ${budget:.2f} — {len(deferred or [])} page(s) would be deferred")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Generate SEO pages for Elevate Repair")
     parser.add_argument("--plan", required=True, help="Path to plan JSON file")
-    parser.add_argument("--template", required=True, help="Path to HTML template file")
+    parser.add_argument("--template", default=None, help="Path to HTML template file (required unless validating)")
     parser.add_argument("--prompt", default=str(REPO_ROOT / "tools" / "prompt_templates" / "page_prompt.txt"),
                         help="Path to prompt template file")
     parser.add_argument("--limit", type=int, default=20, help="Maximum number of pages to generate")
     parser.add_argument("--dry-run", action="store_true", help="Show what would be generated without making API calls")
     parser.add_argument("--model", default="gpt-4o", help="OpenAI model to use (default: gpt-4o)")
+    parser.add_argument("--concurrency", type=int, default=1, help="Parallel API requests (default: 1)")
+    parser.add_argument("--rpm", type=int, default=60, help="Max request launches per minute (default: 60)")
+    parser.add_argument("--budget", type=float, default=None,
+                        help="Spend cap in USD. Highest-priority pages (tier, then page_type) are generated "
+                             "first; no new request is launched once projected + actual spend would exceed it")
+    parser.add_argument("--batch", action="store_true",
+                        help="Submit all prompts as one Batch API job (half price, up to 24h turnaround)")
+    parser.add_argument("--resume-batch", default=None, metavar="BATCH_ID",
+                        help="With --batch: poll an already-submitted batch instead of creating a new one")
+    parser.add_argument("--poll-interval", type=int, default=30, help="Seconds between batch status polls (default: 30)")
+    parser.add_argument("--siblings", type=int, default=1, metavar="N",
+                        help=f"Ask for up to N sibling pages (same city + appliance) per request as one JSON "
+                             f"response; failed siblings are retried on their own (1-{MAX_SIBLINGS}, default: 1)")
+    parser.add_argument("--max-repairs", type=int, default=DEFAULT_MAX_REPAIRS, metavar="N",
+                        help="Follow-up requests per page whose response fails parsing or validation; each "
+                             f"names the specific failure (0 disables, default: {DEFAULT_MAX_REPAIRS})")
+    parser.add_argument("--check-cannibalization", action="store_true",
+                        help="Before any request, skip entries whose target competes with a published page or an "
+                             "earlier entry (tools/cannibalization.py; needs numpy + scipy)")
+    parser.add_argument("--prompt-layout", choices=("inline", "cached"), default="inline",
+                        help="'cached' moves the invariant instructions into a shared prefix and runs entries "
+                             "sharing city + appliance back to back, so provider prefix caching applies")
+    parser.add_argument("--hedge-budget", type=float, default=llm_hedge.DEFAULT_BUDGET, metavar="FRACTION",
+                        help="Duplicate requests still unanswered at the run's p95 response time, at most this "
+                             f"share of requests extra (0 disables, default: {llm_hedge.DEFAULT_BUDGET:g})")
+    changed_pages.add_arguments(parser)
     args = parser.parse_args()
+    validating = bool(args.since or args.staged)
+    if not args.template and not validating:
+        parser.error("--template is required unless validating with --since/--staged")
+    if not 1 <= args.siblings <= MAX_SIBLINGS:
+        parser.error(f"--siblings must be between 1 and {MAX_SIBLINGS}")
+    if not 0 <= args.hedge_budget <= 1:
+        parser.error("--hedge-budget must be between 0 and 1")
+    if args.siblings > 1 and args.batch:
+        parser.error("--siblings is not supported with --batch")
 
     print("=" * 60)
     print("  Elevate Repair — SEO Page Generator")
@@ -373,6 +1040,8 @@ def main():
         plan_path = REPO_ROOT / plan_path
     plan = load_plan(plan_path)
     print(f"  Loaded plan: {len(plan)} pages defined")
+    if validating:
+        return validate_changed(plan, args)
 
     template_path = Path(args.template)
     if not template_path.is_absolute():
@@ -389,6 +1058,16 @@ def main():
     prompt_template = load_prompt_template(prompt_path)
     print(f"  Loaded prompt template: {prompt_path.name}")
 
+    cached_tokens = 0
+    if args.prompt_layout == "cached":
+        prompt_template, prefix = prompt_layout.compile_layout(prompt_template)
+        prefix_tokens = prompt_layout.shared_prefix_tokens(prefix, SYSTEM_PROMPT, args.model)
+        cached_tokens = prompt_layout.cacheable_tokens(prefix_tokens)
+        print(f"  Prompt layout: cached (shared prefix {prefix_tokens} tokens, {cached_tokens} cacheable)")
+        if not cached_tokens:
+            print(f"  WARNING: shared prefix is below the {prompt_layout.MIN_CACHEABLE_PREFIX_TOKENS}-token "
+                  f"caching minimum")
+
     if not args.dry_run:
         api_key = os.environ.get("OPENAI_API_KEY")
         if not api_key:
@@ -403,74 +1082,139 @@ def main():
 
     created = []
     skipped = []
+    competing = []
     errors = []
+    deferred = []
+    actual_cost = 0.0
+    api_results = []
+    hedger = hedge_stats = None
 
+    pending_entries = []
     for i, entry in enumerate(entries, 1):
         filename = entry["output_filename"]
-        output_path = REPO_ROOT / filename
         label = f"  [{i:2d}/{len(entries)}] {filename}"
 
         # Skip if exists
-        if output_path.exists():
+        if (REPO_ROOT / filename).exists():
             print(f"{label} — SKIPPED (file exists)")
             skipped.append(filename)
             continue
-
-        if args.dry_run:
+        pending_entries.append((label, entry))
+
+    if args.check_cannibalization and pending_entries:
+        import cannibalization
+
+        conflicts = cannibalization.check_plan([entry for _, entry in pending_entries])
+        for label, entry in pending_entries:
+            if entry["output_filename"] in conflicts:
+                competitor, score = conflicts[entry["output_filename"]]
+                print(f"{label} — SKIPPED (competes with {competitor}, similarity {score:.2f})")
+                competing.append(entry["output_filename"])
+        pending_entries = [(label, entry) for label, entry in pending_entries
+                           if entry["output_filename"] not in conflicts]
+
+    estimates = estimate_entries([e for _, e in pending_entries], prompt_template, args.model,
+                                 batch=args.batch, cached_tokens=cached_tokens)
+    work = [(label, entry, est) for (label, entry), est in zip(pending_entries, estimates)]
+    if args.budget is not None:
+        by_id = {id(entry): (label, entry, est) for label, entry, est in work}
+        selected, over_budget = llm_budget.select_within_budget(
+            [entry for _, entry, _ in work], estimates, args.budget,
+        )
+        work = [by_id[id(entry)] for entry, _ in selected]
+        deferred = [by_id[id(entry)] for entry, _ in over_budget]
+    if args.prompt_layout == "cached":
+        work = prompt_layout.schedule_for_cache(
+            work, entry_of=lambda item: item[1],
+            priority=llm_budget.entry_priority if args.budget is not None else None,
+        )
+
+    if args.siblings > 1:
+        work = group_siblings(work, args.siblings, prompt_template, args.model)
+
+    if args.dry_run and args.siblings > 1:
+        for label, items, est in work:
+            print(f"{label} — DRY RUN ({len(items)} page(s) in one request)")
+            for _, entry, _ in items:
+                print(f"         {entry['output_filename']}: {entry['city']} / {entry['category']} / {entry['problem']}")
+            print(f"         ~{est['input_tokens']} in / ~{est['output_tokens']} out tokens, ~${est['cost']:.3f}")
+        for label, entry, est in deferred:
+            print(f"{label} — DEFERRED (over budget, tier {entry.get('tier')}, {entry.get('page_type')})")
+    elif args.dry_run:
+        for label, entry, est in work:
             prompt = build_prompt(prompt_template, entry)
             print(f"{label} — DRY RUN")
             print(f"         City: {entry['city']}, Appliance: {entry['category']}, Problem: {entry['problem']}")
             print(f"         Parent: {entry['parent_page']}")
-            print(f"         Prompt length: {len(prompt)} chars")
-            continue
+            print(f"         Prompt length: {len(prompt)} chars, ~{est['input_tokens']} in / "
+                  f"~{est['output_tokens']} out tokens, ~${est['cost']:.3f}")
+        for label, entry, est in deferred:
+            print(f"{label} — DEFERRED (over budget, tier {entry.get('tier')}, {entry.get('page_type')})")
 
-        # Generate via API
-        try:
-            print(f"{label} — generating...", end="", flush=True)
-            prompt = build_prompt(prompt_template, entry)
-            response_text = call_openai(prompt, model=args.model)
-            sections = parse_openai_response(response_text)
-
-            # Check parsing
-            missing_sections = [k for k in ("title", "description", "h1", "intro", "body") if not sections.get(k)]
-            if missing_sections:
-                print(f" ERROR (missing sections: {missing_sections})")
-                errors.append({"file": filename, "error": f"Missing sections: {missing_sections}"})
-                continue
-
-            # Inject into template
-            html = inject_content(template_html, sections, entry)
-
-            # Validate
-            validation_errors = validate_output(html, entry)
-            if validation_errors:
-                print(f" ERROR")
-                for ve in validation_errors:
-                    print(f"         {ve}")
-                errors.append({"file": filename, "error": "; ".join(validation_errors)})
-                continue
-
-            # Write file
-            with open(output_path, "w") as f:
-                f.write(html)
-
-            word_count = len(re.sub(r"<[^>]+>", "", sections["body"]).split())
-            print(f" OK ({word_count} words)")
-            created.append(str(output_path))
-
-            # Rate limit: small delay between API calls
-            if i < len(entries):
-                time.sleep(1)
+    # ── Generate via API ───────────────────────────────────────
+    else:
+        if args.batch:
+            results = run_batch(
+                work, prompt_template, template_html, args.model,
+                batch_dir=REPO_ROOT / "tools" / "batches",
+                resume_batch_id=args.resume_batch,
+                poll_interval=args.poll_interval,
+            )
+        elif args.siblings > 1:
+            guard = llm_budget.BudgetGuard(args.budget, args.model) if args.budget is not None else None
+            limiter = RateLimiter(args.rpm, max(args.concurrency, 1))
+            hedger = llm_hedge.Hedger(args.hedge_budget, guard, limiter) if args.hedge_budget > 0 else None
+            deferred_groups = []
+            results = run_concurrent(
+                work,
+                lambda items: generate_sibling_pages(items, prompt_template, template_html, args.model,
+                                                     hedger=hedger),
+                concurrency=args.concurrency, rpm=args.rpm, guard=guard, deferred=deferred_groups,
+                limiter=limiter,
+            )
+        else:
+            guard = llm_budget.BudgetGuard(args.budget, args.model) if args.budget is not None else None
+            limiter = RateLimiter(args.rpm, max(args.concurrency, 1))
+            hedger = llm_hedge.Hedger(args.hedge_budget, guard, limiter) if args.hedge_budget > 0 else None
+            retry = (make_repairer(prompt_template, template_html, args.model, args.max_repairs, hedger=hedger)
+                     if args.max_repairs > 0 else None)
+            results = run_concurrent(
+                work,
+                lambda entry: generate_page(entry, prompt_template, template_html, args.model, hedger=hedger),
+                concurrency=args.concurrency, rpm=args.rpm, guard=guard, deferred=deferred, retry=retry,
+                limiter=limiter,
+            )
 
-        except Exception as e:
-            print(f" ERROR: {e}")
-            errors.append({"file": filename, "error": str(e)})
+        for label, entry, result in results:
+            actual_cost += llm_budget.cost_from_usage(result["usage"], args.model, batch=args.batch)
+            api_results.append(result)
+            for label, entry, result in result.get("pages") or [(label, entry, result)]:
+                repaired = f", {result['repairs']} repair(s)" if result.get("repairs") else ""
+                if result["status"] == "created":
+                    print(f"{label} — OK ({result['word_count']} words{repaired})")
+                    created.append(result["path"])
+                else:
+                    print(f"{label} — ERROR ({result['error']}{repaired})")
+                    errors.append({"file": entry["output_filename"], "error": result["error"]})
+        if args.siblings > 1:
+            deferred.extend(item for _, items, _ in deferred_groups for item in items)
+        if hedger:
+            hedge_stats = hedger.summary()
+            actual_cost += sum(llm_budget.cost_from_usage(u, args.model) for u in hedger.wasted_usage)
 
     # ── Dry run summary ────────────────────────────────────────
     if args.dry_run:
+        projection = llm_budget.summarize_plan(
+            [est for _, _, est in work], args.model, args.concurrency, args.rpm,
+        )
         print(f"\n[DRY RUN COMPLETE]")
-        print(f"  Would generate: {len(entries) - len(skipped)} pages")
+        pages = sum(len(items) for _, items, _ in work) if args.siblings > 1 else len(work)
+        print(f"  Would generate: {pages} pages")
         print(f"  Would skip: {len(skipped)} pages (already exist)")
+        if args.check_cannibalization:
+            print(f"  Would skip: {len(competing)} pages (compete with another page)")
+        print()
+        print_projection(projection, args.budget, deferred, batch=args.batch)
         print("\nTo run for real, remove the --dry-run flag.")
         return 0
 
@@ -489,9 +1233,13 @@ def main():
         print("  No files to check")
 
     # ── Sitemap update ─────────────────────────────────────────
-    print(f"\n[4/6] Updating sitemap.xml...")
+    print(f"\n[4/6] Updating sitemap.xml and related links...")
     if created:
         update_sitemap(created)
+        # The new pages' <!-- RELATED_LINKS --> blocks, and the pages that now rank them.
+        parents = speculation_rules.plan_parents(plan_path)
+        _, _, _, relinked, _ = related_links.update(write=True, parents=parents)
+        print(f"  Related links re-rendered on {len(relinked)} page(s)")
     else:
         print("  No new files to add")
 
@@ -504,9 +1252,21 @@ def main():
     print(f"  Skipped:  {len(skipped)}")
     for f in skipped:
         print(f"    ~ {f}")
+    if args.check_cannibalization:
+        print(f"  Competing: {len(competing)} (not generated)")
+        for f in competing:
+            print(f"    ~ {f}")
+    if args.budget is not None:
+        print(f"  Deferred: {len(deferred)} (over ${args.budget:.2f} budget)")
+        for _, entry, _ in deferred:
+            print(f"    - {entry['output_filename']}")
     print(f"  Errors:   {len(errors)}")
     for e in errors:
         print(f"    ! {e['file']}: {e['error']}")
+    print(f"  Spend:    ${actual_cost:.2f} ({args.model}{', batch' if args.batch else ''})")
+    print_cache_report(api_results, args.model)
+    if hedge_stats:
+        print_hedge_report(hedge_stats, hedger.wasted_usage, args.model)
 
     # ── Terminal commands ──────────────────────────────────────
     print(f"\n[6/6] Done!")
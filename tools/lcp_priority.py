@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+lcp_priority.py — Prioritize each page's largest contentful paint image.
+
+The LCP image is found from template position: it is the first
+non-decorative <img> in the first <section> after the header (the .hero /
+.page-hero section every template opens with). Pages whose first section has no image (most problem
+pages) have a text LCP and are left alone. For the LCP image this stage:
+
+    - replaces loading="lazy" with loading="eager"
+    - adds fetchpriority="high"
+    - emits preload hints in <head>, so the request starts before layout:
+
+        <!-- LCP_PRELOAD -->
+        <link rel="preload" as="image" href="..." fetchpriority="high">
+        <!-- /LCP_PRELOAD -->
+
+When the image sits in a <picture> with media-switched sources (the
+desktop / mobile city banners), each source gets its own preload scoped by
+the same media query, and the fallback <img> gets the negated query, so a
+phone preloads only the mobile banner and a desktop only the desktop one.
+
+Every other image keeps its loading attribute, so below-the-fold images stay
+lazy. The preload block is re-rendered on each run, so the stage is
+idempotent and follows template changes.
+
+Usage:
+    python3 tools/lcp_priority.py                    # dry run: list pages that would change
+    python3 tools/lcp_priority.py --write            # rewrite pages + templates
+    python3 tools/lcp_priority.py --check            # exit 1 if any page is out of date
+    python3 tools/lcp_priority.py index.html aurora.html
+"""
+
+import argparse
+import json
+import re
+import sys
+
+import changed_pages
+from page_model import load_page, write_page
+from site_pages import REPO_ROOT, TEMPLATE_PAGES, iter_site_pages
+
+START_MARKER = "<!-- LCP_PRELOAD -->"
+END_MARKER = "<!-- /LCP_PRELOAD -->"
+
+# Narrower images (icons, badges) are not LCP candidates.
+MIN_LCP_WIDTH = 200
+
+_BLOCK_RE = re.compile(r"[ \t]*<!-- LCP_PRELOAD -->.*?<!-- /LCP_PRELOAD -->[ \t]*\n?", re.S)
+_SECTION_RE = re.compile(r"<section\b.*?</section>", re.S)
+_IMG_RE = re.compile(r"<img\b[^>]*>", re.S)
+_PICTURE_RE = re.compile(r"<picture\b[^>]*>(?P<body>.*?)</picture>", re.S)
+_SOURCE_RE = re.compile(r"<source\b[^>]*>", re.S)
+_ATTR_RE = re.compile(r'([\w-]+)\s*=\s*"([^"]*)"')
+# Preloads go before the stylesheet so the image request isn't queued behind CSS discovery.
+_ANCHOR_RE = re.compile(r'[ \t]*<link rel="stylesheet"')
+
+
+# ===================================================================
+# Transform
+# ===================================================================
+
+def _attrs(tag):
+    return dict(_ATTR_RE.findall(tag))
+
+
+def _set_attr(tag, name, value):
+    """Set an attribute on a start tag, keeping multi-line tags aligned."""
+    if re.search(rf'\s{name}="[^"]*"', tag):
+        return re.sub(rf'(\s{name}=)"[^"]*"', rf'\g<1>"{value}"', tag)
+    self_closing = tag.endswith("/>")
+    head = tag[:-2 if self_closing else -1].rstrip()
+    lines = head.split("\n")
+    sep = "\n" + re.match(r"\s*", lines[-1]).group(0) if len(lines) > 1 else " "
+    return f'{head}{sep}{name}="{value}"{" />" if self_closing else ">"}'
+
+
+def _is_decorative(tag):
+    """Icons and ornaments (alt="" or smaller than MIN_LCP_WIDTH) never become the LCP element."""
+    attrs = _attrs(tag)
+    return attrs.get("alt") == "" or int(attrs.get("width") or MIN_LCP_WIDTH) < MIN_LCP_WIDTH
+
+
+def find_lcp(html):
+    """(img span, picture body or None) for the page's LCP image, or None.
+
+    Spans are absolute offsets into html.
+    """
+    header_end = html.find("</header>")
+    section = _SECTION_RE.search(html, max(header_end, 0))
+    if not section:
+        return None
+    img = next((m for m in _IMG_RE.finditer(html, section.start(), section.end())
+                if not _is_decorative(m.group(0))), None)
+    if not img:
+        return None
+    for picture in _PICTURE_RE.finditer(html, section.start(), section.end()):
+        if picture.start("body") <= img.start() < picture.end("body"):
+            return img.span(), picture.group("body")
+    return img.span(), None
+
+
+def preload_links(img_tag, picture_body=None):
+    """The <link rel=preload> tags for an LCP image (and its <picture> sources)."""
+    img = _attrs(img_tag)
+    links, medias = [], []
+    for source in _SOURCE_RE.findall(picture_body or ""):
+        attrs = _attrs(source)
+        if "srcset" not in attrs:
+            continue
+        media = attrs.get("media")
+        if media is None:
+            # A type-switched source (e.g. AVIF with a WebP fallback) — let the browser pick.
+            return []
+        medias.append(media)
+        extra = f' imagesizes="{attrs["sizes"]}"' if "sizes" in attrs else ""
+        links.append(f'<link rel="preload" as="image" imagesrcset="{attrs["srcset"]}"{extra} '
+                     f'media="{media}" fetchpriority="high">')
+
+    if len(medias) > 1:
+        return links  # No single media query covers "none of the above"; the fallback isn't preloaded.
+    src = ' href="{}"'.format(img["src"]) if "src" in img else ""
+    if "srcset" in img:
+        src += f' imagesrcset="{img["srcset"]}"'
+        if "sizes" in img:
+            src += f' imagesizes="{img["sizes"]}"'
+    if not src:
+        return links
+    media = f' media="not all and {medias[0]}"' if medias else ""
+    links.append(f'<link rel="preload" as="image"{src}{media} fetchpriority="high">')
+    return links
+
+
+def prioritize_img(tag):
+    """The LCP <img> tag with lazy loading removed and high fetch priority."""
+    if _attrs(tag).get("loading") == "lazy":
+        tag = _set_attr(tag, "loading", "eager")
+    if "fetchpriority" not in _attrs(tag):
+        tag = _set_attr(tag, "fetchpriority", "high")
+    return tag
+
+
+def render_block(links, indent):
+    return "".join(f"{indent}{line}\n" for line in [START_MARKER, *links, END_MARKER])
+
+
+def transform_page(rel_path, html):
+    """Apply the stage to one page. Returns (new_html, report_entry)."""
+    entry = {"page": rel_path, "lcp": None, "preloads": 0}
+    new_html = _BLOCK_RE.sub("", html)
+    found = find_lcp(new_html)
+    if not found:
+        entry["action"] = "text LCP" if new_html == html else "preload removed"
+        return new_html, entry
+
+    (start, end), picture_body = found
+    img_tag = new_html[start:end]
+    entry["lcp"] = _attrs(img_tag).get("src")
+    new_html = new_html[:start] + prioritize_img(img_tag) + new_html[end:]
+
+    links = preload_links(img_tag, picture_body)
+    entry["preloads"] = len(links)
+    head_end = new_html.find("</head>")
+    anchor = _ANCHOR_RE.search(new_html, 0, head_end) or re.search(r"[ \t]*</head>", new_html)
+    if links and anchor:
+        indent = re.match(r"[ \t]*", anchor.group(0)).group(0)
+        new_html = new_html[:anchor.start()] + render_block(links, indent) + new_html[anchor.start():]
+    entry["action"] = "updated" if new_html != html else "up to date"
+    return new_html, entry
+
+
+# ===================================================================
+# Main
+# ===================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Prioritize and preload each page's LCP image")
+    parser.add_argument("pages", nargs="*", help="Pages to process (default: every page plus the tools/ templates)")
+    parser.add_argument("--write", action="store_true", help="Rewrite files (default: dry run)")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if any page is out of date (implies dry run)")
+    parser.add_argument("--report", default=None, metavar="PATH", help="Write the per-page report as JSON")
+    changed_pages.add_arguments(parser)
+    args = parser.parse_args()
+    write = args.write and not args.check
+
+    paths = [REPO_ROOT / p for p in args.pages] if args.pages else [*iter_site_pages(), *TEMPLATE_PAGES]
+    paths = changed_pages.select(args, paths)
+
+    print("=" * 60)
+    print("  Elevate Repair — LCP Image Priority")
+    print("=" * 60)
+    print(f"  Mode: {'WRITE' if write else 'DRY RUN'}")
+
+    report, counts = [], {}
+    for path in paths:
+        rel = path.resolve().relative_to(REPO_ROOT).as_posix()
+        html = load_page(path).html
+        new_html, entry = transform_page(rel, html)
+        report.append(entry)
+        counts[entry["action"]] = counts.get(entry["action"], 0) + 1
+        if new_html != html:
+            if write:
+                write_page(path, new_html)
+            print(f"    ~ {rel}  [{entry['lcp'] or 'no image'}, {entry['preloads']} preload(s)]")
+
+    print(f"\n  Files: {len(report)}")
+    for action, n in sorted(counts.items()):
+        print(f"    {action:26s} {n}")
+    changed = counts.get("updated", 0) + counts.get("preload removed", 0)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n  Report written to {args.report}")
+    if args.check:
+        return 1 if changed else 0
+    if changed and not write:
+        print("\n  Dry run — re-run with --write to apply.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+llm_batch.py — OpenAI Batch API client used by generate_seo_pages.py --batch.
+
+Batch jobs are billed at half the synchronous price and are not subject to
+per-minute rate limits, which suits bulk plan runs that don't need pages back
+within seconds. Flow:
+
+    write_batch_file()  -> batch-request JSONL (one chat completion per line)
+    upload_batch_file() -> POST /files (purpose=batch)
+    create_batch()      -> POST /batches
+    poll_batch()        -> GET  /batches/{id} until a terminal status
+    iter_batch_results()-> GET  /files/{output_file_id}/content, streamed
+
+The base URL comes from OPENAI_BASE_URL, so the whole flow can be exercised
+against tools/openai_stub_server.py without an API key or network access.
+"""
+
+import json
+import os
+import sys
+import time
+
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+CHAT_ENDPOINT = "/v1/chat/completions"
+
+
+def _api():
+    """Return (base_url, headers) for the configured OpenAI-compatible API."""
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        raise EnvironmentError("OPENAI_API_KEY environment variable is not set.")
+    base_url = os.environ.get("OPENAI_BASE_URL", "https://api.openai.com/v1").rstrip("/")
+    return base_url, {"Authorization": f"Bearer {api_key}"}
+
+
+def write_batch_file(path, requests_iter):
+    """Write (custom_id, body) pairs as a batch-request JSONL. Returns the line count."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for custom_id, body in requests_iter:
+            line = {"custom_id": custom_id, "method": "POST", "url": CHAT_ENDPOINT, "body": body}
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def upload_batch_file(path, timeout=300):
+    """Upload a batch-request JSONL. Returns the file ID."""
+    import requests
+
+    base_url, headers = _api()
+    with open(path, "rb") as f:
+        resp = requests.post(
+            f"{base_url}/files",
+            headers=headers,
+            data={"purpose": "batch"},
+            files={"file": (os.path.basename(path), f, "application/jsonl")},
+            timeout=timeout,
+        )
+    resp.raise_for_status()
+    return resp.json()["id"]
+
+
+def create_batch(input_file_id, completion_window="24h", timeout=60):
+    """Create a batch job for an uploaded file. Returns the batch object."""
+    import requests
+
+    base_url, headers = _api()
+    resp = requests.post(
+        f"{base_url}/batches",
+        headers=headers,
+        json={
+            "input_file_id": input_file_id,
+            "endpoint": CHAT_ENDPOINT,
+            "completion_window": completion_window,
+        },
+        timeout=timeout,
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+
+def get_batch(batch_id, timeout=60):
+    """Fetch the current state of a batch job."""
+    import requests
+
+    base_url, headers = _api()
+    resp = requests.get(f"{base_url}/batches/{batch_id}", headers=headers, timeout=timeout)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def poll_batch(batch_id, interval=30, max_wait=None):
+    """Poll a batch until it reaches a terminal status. Returns the final batch object.
+
+    Prints a progress line whenever the status or completed count changes.
+    """
+    started = time.monotonic()
+    last = None
+    while True:
+        batch = get_batch(batch_id)
+        counts = batch.get("request_counts") or {}
+        progress = (batch["status"], counts.get("completed", 0), counts.get("failed", 0))
+        if progress != last:
+            print(f"  Batch {batch_id}: {batch['status']} "
+                  f"({counts.get('completed', 0)}/{counts.get('total', 0)} done, "
+                  f"{counts.get('failed', 0)} failed)", flush=True)
+            last = progress
+        if batch["status"] in TERMINAL_STATUSES:
+            return batch
+        if max_wait is not None and time.monotonic() - started > max_wait:
+            raise TimeoutError(f"Batch {batch_id} still '{batch['status']}' after {max_wait}s")
+        time.sleep(interval)
+
+
+def _iter_file_lines(file_id, timeout=300):
+    """Stream a file's content line by line, yielding parsed JSON objects."""
+    import requests
+
+    base_url, headers = _api()
+    with requests.get(f"{base_url}/files/{file_id}/content", headers=headers,
+                      stream=True, timeout=timeout) as resp:
+        resp.raise_for_status()
+        for raw in resp.iter_lines():
+            if raw:
+                yield json.loads(raw)
+
+
+def iter_batch_results(batch):
+    """Yield (custom_id, content, usage, error) for every result of a finished batch.
+
+    Successful lines carry the assistant content and usage; failed lines (from
+    either the output or the error file) carry an error string instead.
+    """
+    for file_key in ("output_file_id", "error_file_id"):
+        file_id = batch.get(file_key)
+        if not file_id:
+            continue
+        for line in _iter_file_lines(file_id):
+            custom_id = line.get("custom_id")
+            response = line.get("response") or {}
+            body = response.get("body") or {}
+            if line.get("error") or response.get("status_code", 200) != 200:
+                error = line.get("error") or body.get("error") or {}
+                message = error.get("message") if isinstance(error, dict) else str(error)
+                yield custom_id, None, body.get("usage"), f"Batch request failed: {message or 'unknown error'}"
+                continue
+            try:
+                content = body["choices"][0]["message"]["content"]
+            except (KeyError, IndexError, TypeError):
+                yield custom_id, None, body.get("usage"), "Batch response had no message content"
+                continue
+            yield custom_id, content, body.get("usage") or {}, None
+
+
+if __name__ == "__main__":
+    # Minimal status check: python tools/llm_batch.py <batch_id>
+    if len(sys.argv) != 2:
+        print("Usage: python tools/llm_batch.py <batch_id>", file=sys.stderr)
+        sys.exit(2)
+    print(json.dumps(get_batch(sys.argv[1]), indent=2))
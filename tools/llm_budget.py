@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+llm_budget.py — Offline token, cost and wall-time estimation for SEO plan runs.
+
+Used by generate_seo_pages.py to project what a plan will cost before any
+API call is made, and to enforce a spend cap while the plan is running.
+
+Token counts come from tiktoken when it is installed; otherwise a local
+word/punctuation approximation is used (typically within ~10% for English
+prose and HTML). Expected output size is calibrated from the problem pages
+already in the repo, so the projection tracks what the prompt really produces.
+"""
+
+import math
+import re
+import statistics
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+from page_model import load_page
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# USD per 1M tokens. Cached input is the discounted rate for prompt-cache hits.
+MODEL_PRICING = {
+    "gpt-4o":       {"input": 2.50, "cached_input": 1.25,  "output": 10.00},
+    "gpt-4o-mini":  {"input": 0.15, "cached_input": 0.075, "output": 0.60},
+    "gpt-4.1":      {"input": 2.00, "cached_input": 0.50,  "output": 8.00},
+    "gpt-4.1-mini": {"input": 0.40, "cached_input": 0.10,  "output": 1.60},
+    "gpt-4.1-nano": {"input": 0.10, "cached_input": 0.025, "output": 0.40},
+}
+DEFAULT_PRICING_MODEL = "gpt-4o"
+
+# Batch API jobs are billed at half the synchronous rate.
+BATCH_DISCOUNT = 0.5
+
+# Chat format overhead: every message is wrapped in a few framing tokens,
+# and the reply is primed with a few more.
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+# Fallback output size when no generated pages exist to calibrate from:
+# ~1,050 body words (midpoint of the 900–1200 target) plus title/intro and markup.
+DEFAULT_OUTPUT_TOKENS = 1900
+
+# Rough decode throughput and fixed per-request latency used for wall time.
+DEFAULT_TOKENS_PER_SECOND = 60.0
+DEFAULT_REQUEST_OVERHEAD_S = 1.5
+
+# Lower rank = generated first when a budget can't cover the whole plan.
+PAGE_TYPE_PRIORITY = {
+    "city_problem": 0,
+    "brand_problem": 1,
+}
+
+
+# ===================================================================
+# Tokenization
+# ===================================================================
+
+@lru_cache(maxsize=None)
+def _get_encoding(model):
+    """Return a tiktoken encoding for the model, or None if tiktoken is unavailable."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+_TOKEN_PIECE_RE = re.compile(r"[A-Za-z]+|\d{1,3}|[^\sA-Za-z\d]")
+
+
+def _approx_tokens(text):
+    """Approximate BPE token count without a tokenizer.
+
+    Short words are a single token; long words split roughly every six
+    characters. Digits group in threes and each punctuation mark (including
+    HTML angle brackets and slashes) is its own token.
+    """
+    count = 0
+    for piece in _TOKEN_PIECE_RE.findall(text):
+        count += 1 + (len(piece) - 1) // 6 if piece[0].isalpha() else 1
+    return count
+
+
+def count_tokens(text, model=DEFAULT_PRICING_MODEL):
+    """Count tokens in text for the given model."""
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return _approx_tokens(text)
+
+
+def count_message_tokens(messages, model=DEFAULT_PRICING_MODEL):
+    """Count prompt tokens for a list of chat messages, including framing."""
+    total = TOKENS_PER_REPLY
+    for message in messages:
+        total += TOKENS_PER_MESSAGE + count_tokens(message["content"], model)
+    return total
+
+
+def tokenizer_name(model=DEFAULT_PRICING_MODEL):
+    """Describe which tokenizer count_tokens will use."""
+    encoding = _get_encoding(model)
+    return f"tiktoken/{encoding.name}" if encoding is not None else "approximate (tiktoken not installed)"
+
+
+# ===================================================================
+# Pricing
+# ===================================================================
+
+def get_pricing(model):
+    """Return the per-1M-token price table for a model (falls back to gpt-4o)."""
+    if model in MODEL_PRICING:
+        return MODEL_PRICING[model]
+    # Dated snapshots (e.g. gpt-4o-2024-08-06) share their base model's price.
+    for name in sorted(MODEL_PRICING, key=len, reverse=True):
+        if model.startswith(name):
+            return MODEL_PRICING[name]
+    return MODEL_PRICING[DEFAULT_PRICING_MODEL]
+
+
+def estimate_cost(input_tokens, output_tokens, model, cached_tokens=0, batch=False):
+    """Cost in USD for one request."""
+    pricing = get_pricing(model)
+    uncached = max(input_tokens - cached_tokens, 0)
+    cost = (
+        uncached * pricing["input"]
+        + cached_tokens * pricing["cached_input"]
+        + output_tokens * pricing["output"]
+    ) / 1_000_000
+    return cost * BATCH_DISCOUNT if batch else cost
+
+
+def cost_from_usage(usage, model, batch=False):
+    """Actual cost in USD from an API `usage` object."""
+    if not usage:
+        return 0.0
+    details = usage.get("prompt_tokens_details") or {}
+    return estimate_cost(
+        usage.get("prompt_tokens", 0),
+        usage.get("completion_tokens", 0),
+        model,
+        cached_tokens=details.get("cached_tokens", 0) or 0,
+        batch=batch,
+    )
+
+
+# ===================================================================
+# Output-size calibration
+# ===================================================================
+
+def calibrate_output_tokens(model=DEFAULT_PRICING_MODEL, sample_size=40, max_tokens=None):
+    """Estimate completion tokens per page from generated pages already in the repo.
+
+    Takes the median token count of the content-body + hero text of up to
+    `sample_size` existing problem pages. Falls back to DEFAULT_OUTPUT_TOKENS.
+    """
+    samples = []
+    for path in sorted(REPO_ROOT.glob("*-*-*.html"))[:sample_size * 3]:
+        page = load_page(path)
+        body = re.search(r'<div class="content-body">(.*?)</div>', page.html, re.DOTALL)
+        if not body:
+            continue
+        intro = re.search(r'<p class="hero-text">(.*?)</p>', page.html, re.DOTALL)
+        parts = [page.title] + ([intro.group(1)] if intro else []) + [body.group(1)]
+        samples.append(count_tokens("\n".join(parts), model))
+        if len(samples) >= sample_size:
+            break
+
+    estimate = int(statistics.median(samples)) if samples else DEFAULT_OUTPUT_TOKENS
+    if max_tokens:
+        estimate = min(estimate, max_tokens)
+    return estimate
+
+
+# ===================================================================
+# Plan projection
+# ===================================================================
+
+def entry_priority(entry):
+    """Sort key: lower tier first, then page type rank."""
+    return (entry.get("tier") or 99, PAGE_TYPE_PRIORITY.get(entry.get("page_type"), len(PAGE_TYPE_PRIORITY)))
+
+
+def estimate_entry(messages, model, output_tokens, batch=False, cached_tokens=0):
+    """Projected tokens and cost for one request."""
+    input_tokens = count_message_tokens(messages, model)
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cached_tokens": cached_tokens,
+        "cost": estimate_cost(input_tokens, output_tokens, model, cached_tokens=cached_tokens, batch=batch),
+    }
+
+
+def estimate_wall_time(num_requests, output_tokens, concurrency=1, rpm=None,
+                       tokens_per_second=DEFAULT_TOKENS_PER_SECOND,
+                       overhead_s=DEFAULT_REQUEST_OVERHEAD_S):
+    """Projected seconds to finish `num_requests` requests.
+
+    Each request takes overhead + output/throughput seconds. Requests run in
+    waves of `concurrency`; with an `rpm` cap the launches are also spaced
+    60/rpm seconds apart, and the slower of the two bounds wins.
+    """
+    if num_requests <= 0:
+        return 0.0
+    latency = overhead_s + output_tokens / tokens_per_second
+    wall = math.ceil(num_requests / max(concurrency, 1)) * latency
+    if rpm:
+        wall = max(wall, (num_requests - 1) * 60.0 / rpm + latency)
+    return wall
+
+
+def summarize_plan(estimates, model, concurrency=1, rpm=None):
+    """Aggregate per-entry estimates into a plan projection."""
+    n = len(estimates)
+    input_tokens = sum(e["input_tokens"] for e in estimates)
+    output_tokens = sum(e["output_tokens"] for e in estimates)
+    avg_output = output_tokens / n if n else 0
+    return {
+        "requests": n,
+        "input_tokens": input_tokens,
+        "cached_tokens": sum(e.get("cached_tokens", 0) for e in estimates),
+        "output_tokens": output_tokens,
+        "cost": sum(e["cost"] for e in estimates),
+        "wall_time_s": estimate_wall_time(n, avg_output, concurrency, rpm),
+        "model": model,
+        "concurrency": concurrency,
+        "rpm": rpm,
+    }
+
+
+def select_within_budget(entries, estimates, budget):
+    """Pick the highest-priority entries whose projected cost fits the budget.
+
+    Walks entries in priority order (tier, then page type, then plan order)
+    and keeps each one that still fits. Returns (selected, deferred), each a
+    list of (entry, estimate) pairs; `selected` is in launch order.
+    """
+    ranked = sorted(
+        zip(entries, estimates),
+        key=lambda pair: entry_priority(pair[0]),
+    )
+    selected, deferred = [], []
+    total = 0.0
+    for entry, est in ranked:
+        if total + est["cost"] <= budget:
+            selected.append((entry, est))
+            total += est["cost"]
+        else:
+            deferred.append((entry, est))
+    return selected, deferred
+
+
+def format_duration(seconds):
+    """Format seconds as e.g. '4m 05s' or '1h 02m'."""
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+# ===================================================================
+# Runtime budget enforcement
+# ===================================================================
+
+class BudgetGuard:
+    """Thread-safe spend cap for a running plan.
+
+    Before launching a request the caller reserves its projected cost; once
+    the response arrives the reservation is replaced by the actual cost from
+    the API usage. A launch is refused if actual + reserved + projected would
+    exceed the cap.
+    """
+
+    def __init__(self, budget, model, batch=False):
+        self.budget = budget
+        self.model = model
+        self.batch = batch
+        self.spent = 0.0
+        self.reserved = 0.0
+        self._lock = threading.Lock()
+
+    def try_reserve(self, projected_cost):
+        """Reserve projected_cost if it fits under the cap. Returns True on success."""
+        with self._lock:
+            if self.spent + self.reserved + projected_cost > self.budget:
+                return False
+            self.reserved += projected_cost
+            return True
+
+    def settle(self, projected_cost, usage):
+        """Release a reservation and record the actual cost. Returns the actual cost."""
+        actual = cost_from_usage(usage, self.model, batch=self.batch)
+        with self._lock:
+            self.reserved = max(self.reserved - projected_cost, 0.0)
+            self.spent += actual
+        return actual
+
+    @property
+    def remaining(self):
+        with self._lock:
+            return self.budget - self.spent - self.reserved
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+llm_hedge.py — Hedged requests for the synchronous OpenAI calls.
+
+A handful of slow responses dominate a generate_seo_pages.py run: with a
+180 s timeout, one straggler can outlast a dozen normal pages. A Hedger
+learns, from the requests already completed in the run, how long a request
+takes to return its response, separately for each kind of request. That is
+the full response time: the completions aren't streamed, so nothing
+arrives before the whole answer is ready. Once MIN_SAMPLES have been seen,
+a request still unanswered at the p95 of that time gets a duplicate;
+whichever copy finishes first is used and the other is dropped.
+
+A duplicate is a real request, so it goes through the same limits as the
+others. It is only sent if it fits the hedge budget (a share of the run's
+requests, default 10%), a request slot is free right now (the limiter's
+--concurrency and --rpm) and the BudgetGuard, if any, can reserve its
+projected cost. Otherwise the request just keeps waiting. The blocking
+client can't abort a request mid-flight, so a dropped copy is left to
+finish on a daemon thread, still holding its slot and reservation. Its
+result is discarded, but its usage is recorded (it is billed either way)
+and settled against the reservation, and its finish time is measured. That
+is how summary() knows how much tail latency the hedges saved; copies
+still outstanding when the summary is taken count toward a lower bound.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+
+DEFAULT_BUDGET = 0.10
+QUANTILE = 0.95
+MIN_SAMPLES = 20
+# Recent response times per kind the threshold is learned from.
+WINDOW = 200
+# Never hedge sooner than this, however fast the run has been so far.
+MIN_DELAY_S = 1.0
+
+
+def quantile(values, q):
+    """Nearest-rank q-quantile of a non-empty sequence."""
+    ordered = sorted(values)
+    return ordered[min(max(math.ceil(q * len(ordered)) - 1, 0), len(ordered) - 1)]
+
+
+class Hedger:
+    """Thread-safe request hedging shared by every call in a run."""
+
+    def __init__(self, budget=DEFAULT_BUDGET, guard=None, limiter=None):
+        """`limiter` has try_acquire() -> bool and release() (generate_seo_pages.RateLimiter)."""
+        self.budget = budget
+        self.guard = guard
+        self.limiter = limiter
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.saved = 0.0
+        self.latencies = []
+        self.wasted_usage = []
+        self._response_times = {}
+        self._outstanding = {}  # still-running loser -> (time the hedge won or None if the primary won, reserved cost)
+        self._lock = threading.Lock()
+
+    def threshold(self, kind):
+        """Seconds to wait for a response before hedging, or None while still learning."""
+        with self._lock:
+            samples = list(self._response_times.get(kind, ()))
+        if len(samples) < MIN_SAMPLES:
+            return None
+        return max(quantile(samples, QUANTILE), MIN_DELAY_S)
+
+    def _take_hedge(self, projected_cost):
+        """Claim a hedge: budget share, a free request slot, then the cost reservation."""
+        with self._lock:
+            if self.hedges + 1 > self.budget * self.requests:
+                return False
+            self.hedges += 1
+        if self.limiter and not self.limiter.try_acquire():
+            self._untake()
+            return False
+        if self.guard and not self.guard.try_reserve(projected_cost):
+            if self.limiter:
+                self.limiter.release()
+            self._untake()
+            return False
+        return True
+
+    def _untake(self):
+        with self._lock:
+            self.hedges -= 1
+
+    def _release(self, projected_cost, usage):
+        """Give back a hedge's slot and settle its reservation against the usage it was billed."""
+        if self.limiter:
+            self.limiter.release()
+        if self.guard:
+            self.guard.settle(projected_cost, usage)
+
+    def _launch(self, send, kind):
+        """Run send() on a daemon thread. The future resolves to (result, finished_at)."""
+        future = Future()
+
+        def target():
+            try:
+                result, response_time = send()
+            except BaseException as e:
+                future.set_exception(e)
+                return
+            with self._lock:
+                self._response_times.setdefault(kind, deque(maxlen=WINDOW)).append(response_time)
+            future.set_result((result, time.monotonic()))
+
+        threading.Thread(target=target, name="hedged-request", daemon=True).start()
+        return future
+
+    def run(self, send, kind="default", usage_of=None, projected_cost=None):
+        """Call send() -> (result, response seconds), hedged. Returns the winning result.
+
+        `kind` groups requests whose latencies are comparable; `usage_of`
+        pulls the API usage out of a result, so a dropped copy is accounted.
+        `projected_cost()` is what a duplicate reserves with the BudgetGuard.
+        If every copy fails, the primary's exception is raised.
+        """
+        started = time.monotonic()
+        with self._lock:
+            self.requests += 1
+        primary = self._launch(send, kind)
+        threshold = self.threshold(kind)
+        if threshold is not None:
+            wait([primary], timeout=threshold)
+        cost = projected_cost() if projected_cost and self.guard and threshold is not None else 0.0
+        if primary.done() or threshold is None or not self._take_hedge(cost):
+            result, _ = primary.result()
+            self._record_latency(started)
+            return result
+
+        hedge = self._launch(send, kind)
+        pending, winner = {primary, hedge}, None
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            succeeded = [f for f in (primary, hedge) if f in done and f.exception() is None]
+            winner = succeeded[0] if succeeded else None
+        if winner is None:
+            self._release(cost, None)
+            primary.result()  # raises
+        won_at = time.monotonic()
+        self._record_latency(started)
+
+        hedge_won = winner is hedge
+        loser = primary if hedge_won else hedge
+        with self._lock:
+            self.hedge_wins += hedge_won
+            self._outstanding[loser] = (won_at if hedge_won else None, cost)
+        loser.add_done_callback(lambda f: self._settle(f, usage_of))
+        return winner.result()[0]
+
+    def _record_latency(self, started):
+        with self._lock:
+            self.latencies.append(time.monotonic() - started)
+
+    def _settle(self, loser, usage_of):
+        """A dropped copy finished: count the time the hedge saved and the usage it wasted."""
+        finished = loser.result()[1] if loser.exception() is None else time.monotonic()
+        usage = usage_of(loser.result()[0]) if usage_of and loser.exception() is None else None
+        with self._lock:
+            won_at, cost = self._outstanding.pop(loser)
+            if won_at is not None:
+                self.saved += max(finished - won_at, 0.0)
+            if usage:
+                self.wasted_usage.append(usage)
+        self._release(cost, usage)
+
+    def summary(self):
+        """Hedging counters plus the request latency tail, as a dict."""
+        now = time.monotonic()
+        with self._lock:
+            latencies = list(self.latencies)
+            pending = [won_at for won_at, _ in self._outstanding.values() if won_at is not None]
+            return {
+                "requests": self.requests,
+                "hedges": self.hedges,
+                "allowed": math.floor(self.budget * self.requests),
+                "hedge_wins": self.hedge_wins,
+                "saved": self.saved,
+                "still_running": len(pending),
+                "saved_at_least": sum(now - won_at for won_at in pending),
+                "p50": quantile(latencies, 0.5) if latencies else None,
+                "p95": quantile(latencies, QUANTILE) if latencies else None,
+                "max": max(latencies) if latencies else None,
+                "thresholds": {kind: max(quantile(s, QUANTILE), MIN_DELAY_S)
+                               for kind, s in self._response_times.items() if len(s) >= MIN_SAMPLES},
+            }
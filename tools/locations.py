@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+locations.py — The service-area locations dataset.
+
+tools/data/locations.csv has one row per city or neighborhood the site has
+an area page for: slug, display name, parent city, coordinates, tier and the
+page's clean URL. The tools that need the city list read it from here
+(fix_seo.py, generate_mass_seo_plan.py, generate_seo_pages.py), and
+generate_area_pages.py renders the area pages from it.
+
+The city template (tools/template_city_base.html) carries {{SLOT}}
+placeholders that fill_slots() fills for one location:
+
+    {{AREA_NAME}}    Cherry Creek
+    {{AREA_SLUG}}    cherry-creek
+    {{AREA_PLACE}}   Cherry Creek, Denver      (a neighborhood names its city)
+    {{AREA_BANNER}}  denver                    (city banner name, URL-encoded)
+    {{PAGE_URL}}     https://elevaterepair.com/cherry-creek
+
+Usage:
+    python3 tools/locations.py           # validate the dataset and list it
+"""
+
+import csv
+import re
+import sys
+
+from site_pages import REPO_ROOT, SITE_URL
+
+DATASET = REPO_ROOT / "tools" / "data" / "locations.csv"
+TIERS = (1, 2, 3)
+
+BANNER_DIR = REPO_ROOT / "assets" / "images" / "cities banner"
+DEFAULT_BANNER = "denver"
+
+_SLUG_RE = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+_SLOT_RE = re.compile(r"\{\{([A-Z_]+)\}\}")
+
+
+# ===================================================================
+# Dataset
+# ===================================================================
+
+def load_locations(path=DATASET):
+    """Read and validate the dataset. Returns rows in file order.
+
+    Each row is a dict with slug, name, parent, lat, lng, tier, page and
+    place ("<name>, <parent name>" for neighborhoods). Raises ValueError
+    listing every bad row (bad slug or coordinates, duplicate slug or page,
+    unknown tier, parent that isn't a city in the dataset).
+    """
+    with open(path, newline="") as f:
+        lines = [line for line in f if line.strip() and not line.startswith("#")]
+
+    rows, errors, pages = [], [], set()
+    for row in csv.DictReader(lines):
+        slug = row["slug"].strip()
+        loc = {"slug": slug, "name": row["name"].strip(), "parent": row["parent"].strip(),
+               "page": row["page"].strip()}
+        if not _SLUG_RE.fullmatch(slug):
+            errors.append(f"{slug!r}: not a lowercase-hyphenated slug")
+        if not loc["name"]:
+            errors.append(f"{slug}: missing name")
+        try:
+            loc["lat"], loc["lng"] = float(row["lat"]), float(row["lng"])
+            if not (-90 <= loc["lat"] <= 90 and -180 <= loc["lng"] <= 180):
+                raise ValueError
+        except ValueError:
+            errors.append(f"{slug}: bad coordinates {row['lat']!r}, {row['lng']!r}")
+        try:
+            loc["tier"] = int(row["tier"])
+        except ValueError:
+            loc["tier"] = None
+        if loc["tier"] not in TIERS:
+            errors.append(f"{slug}: unknown tier {row['tier']!r} (expected one of {TIERS})")
+        if not loc["page"].startswith("/"):
+            errors.append(f"{slug}: page {loc['page']!r} is not a site-relative URL")
+        elif loc["page"] in pages:
+            errors.append(f"{slug}: page {loc['page']} is listed more than once")
+        pages.add(loc["page"])
+        rows.append(loc)
+
+    by = {}
+    for loc in rows:
+        if loc["slug"] in by:
+            errors.append(f"{loc['slug']}: listed more than once")
+        by[loc["slug"]] = loc
+    for loc in rows:
+        parent = by.get(loc["parent"])
+        if loc["parent"] and (parent is None or parent["parent"]):
+            errors.append(f"{loc['slug']}: parent {loc['parent']!r} is not a city in the dataset")
+        loc["place"] = f"{loc['name']}, {parent['name']}" if loc["parent"] and parent else loc["name"]
+
+    if errors:
+        raise ValueError(f"{path.name}: {len(errors)} problem(s):\n  " + "\n  ".join(errors))
+    return rows
+
+
+def by_slug(locations=None):
+    """{slug: location} for the dataset (or the given rows)."""
+    return {loc["slug"]: loc for loc in (locations if locations is not None else load_locations())}
+
+
+def cities(locations=None, tier=None):
+    """The locations without a parent, optionally limited to one tier, in file order."""
+    rows = locations if locations is not None else load_locations()
+    return [loc for loc in rows if not loc["parent"] and (tier is None or loc["tier"] == tier)]
+
+
+def page_file(loc):
+    """Repo path of a location's page ("/" is index.html)."""
+    if loc["page"] == "/":
+        return REPO_ROOT / "index.html"
+    return REPO_ROOT / (loc["page"].lstrip("/") + ".html")
+
+
+def banner_name(loc):
+    """URL-encoded name of a location's city banner: its own, else its parent's, else Denver's.
+
+    Each banner comes as <name>-desktop.webp and <name>-mobile.webp in BANNER_DIR.
+    """
+    for slug in (loc["slug"], loc["parent"], DEFAULT_BANNER):
+        for name in (slug, slug.replace("-", " ")):
+            if slug and (BANNER_DIR / f"{name}-desktop.webp").exists():
+                return name.replace(" ", "%20")
+    return DEFAULT_BANNER
+
+
+# ===================================================================
+# Template slots
+# ===================================================================
+
+def slot_values(loc, page_url=None):
+    """{slot: value} for a location; page_url (clean URL) defaults to the location's own page."""
+    path = page_url or loc["page"]
+    return {
+        "AREA_NAME": loc["name"],
+        "AREA_SLUG": loc["slug"],
+        "AREA_PLACE": loc.get("place") or loc["name"],
+        "AREA_BANNER": banner_name(loc),
+        "PAGE_URL": SITE_URL + (path if path == "/" else path.rstrip("/")),
+    }
+
+
+def fill_slots(html, values):
+    """Replace {{SLOT}} placeholders named in `values`; others are left as they are."""
+    return _SLOT_RE.sub(lambda m: values.get(m.group(1), m.group(0)), html)
+
+
+def unfilled_slots(html):
+    """Sorted names of the {{SLOT}} placeholders still in html."""
+    return sorted(set(_SLOT_RE.findall(html)))
+
+
+# ===================================================================
+# Main
+# ===================================================================
+
+def main():
+    try:
+        locations = load_locations()
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    for loc in locations:
+        print(f"  [Tier {loc['tier']}] {loc['place']:32s} {loc['lat']:9.4f} {loc['lng']:10.4f}  {loc['page']}")
+    print(f"\n{len(locations)} locations ({len(cities(locations))} cities)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+nearest_areas.py — "Appliance Repair Near <area>" cards from coordinates.
+
+Each area page ends with cards linking the areas around it. Instead of a
+hand-copied list, this takes the coordinates in tools/data/locations.csv
+and finds every area's k nearest neighbours by great-circle distance: the
+points go on the unit sphere, where straight-line (chord) distance orders
+neighbours exactly like haversine distance, and a scipy cKDTree answers all
+k-nearest queries at once in O(n log n), so the whole site recomputes in
+milliseconds even with thousands of areas. The result is a compact array
+file, tools/data/nearest-areas.json:
+
+    {"v": 1, "k": 6,
+     "areas": [[slug, url, name, card image], ...],
+     "nearest": [i0_0, ..., i0_k-1, i1_0, ...]}   # k indices into areas per area, nearest first
+
+Pages carry a marked block, named after their area, that the render step
+fills from that file:
+
+    <div class="area-cards">
+        <!-- AREA_CARDS:cherry-creek -->
+        <a href="/capitol-hill" class="area-card">...</a>
+        <!-- /AREA_CARDS -->
+    </div>
+
+The city template carries <!-- AREA_CARDS:{{AREA_SLUG}} -->: generate_area_pages.py
+fills the block as it renders, and pages from generate_seo_pages.py start
+empty, so run this after adding pages. --adopt turns the hand-written
+area-cards list of each dataset area's page into a marked block.
+A card shows the area's own city banner, else its parent city's, else
+Denver's.
+
+Requires numpy and scipy.
+
+Usage:
+    python3 tools/nearest_areas.py                  # dry run: list pages whose cards would change
+    python3 tools/nearest_areas.py --write          # recompute + re-render marked pages
+    python3 tools/nearest_areas.py --adopt --write  # also convert hand-written area-cards lists
+    python3 tools/nearest_areas.py --check          # exit 1 if data or pages are out of date
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from html import escape
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+import locations
+from page_model import load_page, write_page
+from site_pages import REPO_ROOT, iter_site_pages, page_url
+
+DATA_PATH = REPO_ROOT / "tools" / "data" / "nearest-areas.json"
+DATA_VERSION = 1
+DEFAULT_K = 6
+
+BANNER_URL = "/assets/images/cities%20banner/{}-desktop.webp"
+
+_BLOCK_RE = re.compile(r"<!-- AREA_CARDS:([a-z0-9-]+) -->.*?<!-- /AREA_CARDS -->", re.S)
+# A hand-written card list: <div class="area-cards"> followed only by area-card links.
+_HAND_CARDS_RE = re.compile(r'(<div class="area-cards">)((?:\s*<a\b[^>]*class="area-card".*?</a>)*)(\s*</div>)', re.S)
+
+
+# ===================================================================
+# Compute
+# ===================================================================
+
+def unit_vectors(lat, lng):
+    """(n, 3) points on the unit sphere for latitude / longitude arrays in degrees."""
+    lat, lng = np.radians(lat), np.radians(lng)
+    return np.column_stack([np.cos(lat) * np.cos(lng), np.cos(lat) * np.sin(lng), np.sin(lat)])
+
+
+def nearest_indices(lat, lng, k=DEFAULT_K):
+    """(n, k) indices of each point's k nearest other points, nearest first (-1 = none)."""
+    n = len(lat)
+    if n < 2:
+        return np.full((n, k), -1, dtype=np.int64)
+    tree = cKDTree(unit_vectors(lat, lng))
+    # Ask for one extra neighbour: each point is its own nearest (or ties with a duplicate).
+    _, idx = tree.query(tree.data, k=min(k + 1, n))
+    idx = idx.reshape(n, -1)
+    # A stable sort on "is self" moves the self entry to the end and keeps distance order.
+    order = np.argsort(idx == np.arange(n)[:, None], axis=1, kind="stable")
+    idx = np.take_along_axis(idx, order, axis=1)[:, :-1]
+    nearest = np.full((n, k), -1, dtype=np.int64)
+    nearest[:, :idx.shape[1]] = idx[:, :k]
+    return nearest
+
+
+def banner_for(loc):
+    """Card image URL: the area's own city banner, else its parent's, else Denver's."""
+    return BANNER_URL.format(locations.banner_name(loc))
+
+
+def compute(rows, k=DEFAULT_K):
+    """The data-file object for the given locations."""
+    lat = np.array([loc["lat"] for loc in rows])
+    lng = np.array([loc["lng"] for loc in rows])
+    return {
+        "v": DATA_VERSION,
+        "k": k,
+        "areas": [[loc["slug"], loc["page"], loc["name"], banner_for(loc)] for loc in rows],
+        "nearest": nearest_indices(lat, lng, k).ravel().tolist(),
+    }
+
+
+def serialize(data):
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False) + "\n"
+
+
+def load_data(path=DATA_PATH):
+    """The data-file object, or None if it hasn't been built."""
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def nearest_for(data):
+    """{slug: [(url, name, image), ...]} from a data-file object."""
+    areas, k, flat = data["areas"], data["k"], data["nearest"]
+    return {
+        slug: [tuple(areas[j][1:]) for j in flat[i * k:(i + 1) * k] if j >= 0]
+        for i, (slug, *_) in enumerate(areas)
+    }
+
+
+# ===================================================================
+# Render
+# ===================================================================
+
+def render_cards(cards, indent):
+    lines = []
+    for url, name, image in cards:
+        lines += [
+            f'<a href="{escape(url)}" class="area-card">',
+            f'    <img class="area-card-img" src="{escape(image)}" alt="{escape(name)} Appliance Repair" '
+            'loading="lazy" width="400" height="250" style="object-fit:cover;border-radius:10px;">',
+            f'    <div class="area-card-label">{escape(name, quote=False)}</div>',
+            "</a>",
+        ]
+    return "".join(f"{indent}{line}\n" for line in lines)
+
+
+def _indent_of(html, pos):
+    line_start = html.rfind("\n", 0, pos) + 1
+    prefix = html[line_start:pos]
+    return prefix if not prefix.strip() else ""
+
+
+def render_page(html, nearest):
+    """Fill every marked block whose area is in `nearest` ({slug: cards})."""
+    def fill(m):
+        cards = nearest.get(m.group(1))
+        if cards is None:
+            return m.group(0)
+        indent = _indent_of(html, m.start())
+        return (f"<!-- AREA_CARDS:{m.group(1)} -->\n" + render_cards(cards, indent)
+                + f"{indent}<!-- /AREA_CARDS -->")
+    return _BLOCK_RE.sub(fill, html)
+
+
+def adopt_page(html, slug):
+    """Wrap the page's hand-written area-cards list in a marked block for `slug`."""
+    m = _HAND_CARDS_RE.search(html)
+    if not m or "<!-- AREA_CARDS:" in html:
+        return html
+    indent = _indent_of(html, m.start()) + "    "
+    block = f"\n{indent}<!-- AREA_CARDS:{slug} --><!-- /AREA_CARDS -->"
+    return html[:m.start()] + m.group(1) + block + m.group(3) + html[m.end():]
+
+
+def render_site(data, adopt=False, write=False):
+    """Re-render every marked page from data. Returns (changed rels, adopted rels)."""
+    nearest = nearest_for(data)
+    area_pages = {area[1]: area[0] for area in data["areas"]}
+    changed, adopted = [], []
+    for path in iter_site_pages():
+        rel = path.relative_to(REPO_ROOT).as_posix()
+        html = load_page(path).html
+        new_html = html
+        if adopt and page_url(path) in area_pages:
+            new_html = adopt_page(html, area_pages[page_url(path)])
+            if new_html != html:
+                adopted.append(rel)
+        if "<!-- AREA_CARDS:" not in new_html:
+            continue
+        new_html = render_page(new_html, nearest)
+        if new_html != html:
+            changed.append(rel)
+            if write:
+                write_page(path, new_html)
+    return changed, adopted
+
+
+# ===================================================================
+# Main
+# ===================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute nearest-area cards from location coordinates")
+    parser.add_argument("--write", action="store_true", help="Write the data file and pages (default: dry run)")
+    parser.add_argument("--adopt", action="store_true",
+                        help="Replace the hand-written area-cards list of each area page with a marked block")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if the data file or any page is out of date")
+    parser.add_argument("-k", type=int, default=DEFAULT_K, help=f"Cards per area (default: {DEFAULT_K})")
+    args = parser.parse_args()
+    write = args.write and not args.check
+
+    print("=" * 60)
+    print("  Elevate Repair — Nearest Areas")
+    print("=" * 60)
+    print(f"  Mode: {'WRITE' if write else 'DRY RUN'}")
+
+    try:
+        rows = locations.load_locations()
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    start = time.perf_counter()
+    data = compute(rows, args.k)
+    elapsed = time.perf_counter() - start
+    text = serialize(data)
+    data_stale = not DATA_PATH.exists() or DATA_PATH.read_text(encoding="utf-8") != text
+    print(f"  Areas: {len(rows)} (k = {args.k}, computed in {elapsed * 1000:.1f} ms)")
+    print(f"  Data file: {DATA_PATH.relative_to(REPO_ROOT)} "
+          f"({len(text.encode()) / 1024:.1f} KB, {'changed' if data_stale else 'unchanged'})")
+    if write and data_stale:
+        DATA_PATH.write_text(text, encoding="utf-8")
+
+    changed, adopted = render_site(data, adopt=args.adopt, write=write)
+    for rel in changed:
+        print(f"    ~ {rel}{'  [adopted]' if rel in adopted else ''}")
+    print(f"\n  {'Rewritten' if write else 'Out of date'}: {len(changed)}")
+    if args.check:
+        return 1 if changed or data_stale else 0
+    if (changed or data_stale) and not write:
+        print("  Dry run — re-run with --write to apply.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+openai_stub_server.py — Local stand-in for the OpenAI endpoints the generators use.
+
+Serves canned page content in the exact TITLE/DESCRIPTION/H1/INTRO/BODY
+format page_prompt.txt asks for, so generate_seo_pages.py can be exercised
+end to end (sync, --batch) without an API key, network access or spend.
+
+Endpoints:
+    POST /v1/chat/completions
+    POST /v1/files                     (multipart, purpose=batch)
+    GET  /v1/files/{id}/content
+    POST /v1/batches
+    GET  /v1/batches/{id}
+
+Requests with response_format json_object are answered in the sibling-page
+JSON shape ({"pages": [...]}), one page per "PAGE n DETAILS (id: ...)" block.
+
+Chat completions simulate provider prefix caching: once a prompt prefix of
+1,024+ tokens has been seen, later requests sharing it report the matching
+prompt_tokens_details.cached_tokens (in 128-token steps) and, with
+--latency, answer proportionally faster. With --straggler-rate, that
+fraction of chat requests takes --straggler-latency seconds longer, the
+slow tail request hedging in generate_seo_pages.py (llm_hedge.py) is for.
+
+With --defect-rate, that fraction of first-attempt pages comes back with a
+defect generate_seo_pages.py rejects (no INTRO, a Cherry Creek mention, or
+a short BODY); repair follow-ups are always answered cleanly.
+
+Usage:
+    python3 tools/openai_stub_server.py --port 8765
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=stub \\
+        python3 tools/generate_seo_pages.py --plan ... --template ... --batch --poll-interval 1
+"""
+
+import argparse
+import email.parser
+import hashlib
+import itertools
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import llm_budget
+from prompt_layout import MIN_CACHEABLE_PREFIX_TOKENS
+
+CACHE_BLOCK_TOKENS = 128
+
+# Share of the configured latency a fully cached prompt still takes.
+CACHED_LATENCY_FACTOR = 0.5
+
+VOCABULARY = (
+    "appliance technician repair inspect component heating element thermostat sensor valve pump motor "
+    "belt bearing seal hose filter vent coil compressor fan control board wiring circuit fuse switch "
+    "household kitchen laundry winter summer altitude humidity water pressure airflow lint drain cycle "
+    "diagnose replace adjust clean test measure verify restore warranty schedule service visit estimate "
+    "homeowners neighborhood residents reliable careful thorough efficient quiet safe energy usage noise"
+).split()
+
+
+def _details(prompt):
+    """Pull city / appliance / problem out of a page prompt's PAGE DETAILS block."""
+    def field(name, default):
+        m = re.search(rf"^- {name}:\s*(.+)$", prompt, re.MULTILINE)
+        return m.group(1).strip() if m else default
+    return field("City", "Denver"), field("Appliance", "Appliance"), field("Problem", "Not Working")
+
+
+def _sentence(rng, city):
+    words = rng.sample(VOCABULARY, rng.randint(10, 16))
+    words.insert(rng.randint(2, len(words) - 1), city)
+    return " ".join(words).capitalize() + "."
+
+
+def fake_sections(prompt):
+    """Deterministic, unique-per-prompt page sections (~1,000 body words)."""
+    city, category, problem = _details(prompt)
+    rng = random.Random(hashlib.sha256(prompt.encode()).hexdigest())
+    headings = [
+        f"Why Your {category} Is {problem} in {city}",
+        "What Our Technicians Inspect",
+        f"Our {category} Repair Process in {city}",
+        f"Common Questions About {category} {problem} Issues",
+        f"Why {city} Residents Trust Elevate Repair",
+    ]
+    body = []
+    for heading in headings:
+        body.append(f"<h2>{heading}</h2>")
+        for _ in range(3):
+            body.append("<p>" + " ".join(_sentence(rng, city) for _ in range(5)) + "</p>")
+    body.append(f"<h2>Schedule Your {category} Repair Today</h2>")
+    body.append(f"<p>Call <a href=\"tel:7205758432\">(720) 575-8432</a> to book {category.lower()} "
+                f"repair in {city}.</p>")
+    return {
+        "title": f"{category} {problem} Repair in {city}, CO | Elevate Appliance Repair",
+        "description": f"Professional {category.lower()} {problem.lower()} repair in {city}, CO.",
+        "h1": f"{category} {problem} Repair in {city}",
+        "intro": f"{_sentence(rng, city)} {_sentence(rng, city)}",
+        "body": "\n".join(body),
+    }
+
+
+DEFECTS = ("missing_intro", "cherry_creek", "short_body")
+
+
+def fake_page(prompt, defect=None):
+    """Page content in page_prompt.txt's TITLE/DESCRIPTION/H1/INTRO/BODY format.
+
+    `defect` (one of DEFECTS) spoils the page the way a real model
+    occasionally does.
+    """
+    sections = fake_sections(prompt)
+    if defect == "cherry_creek":
+        sections["body"] += "\n<p>We also serve homeowners in nearby Cherry Creek.</p>"
+    elif defect == "short_body":
+        sections["body"] = "\n".join(sections["body"].split("\n")[:4])
+    return (
+        f"TITLE: {sections['title']}\n\n"
+        f"DESCRIPTION: {sections['description']}\n\n"
+        f"H1: {sections['h1']}\n\n"
+        + ("" if defect == "missing_intro" else f"INTRO: {sections['intro']}\n\n")
+        + f"BODY:\n{sections['body']}"
+    )
+
+
+_SIBLING_BLOCK_RE = re.compile(r"^PAGE \d+ DETAILS \(id: (.+?)\):\n((?:- .*\n?)+)", re.MULTILINE)
+
+
+def fake_sibling_pages(prompt, drop_rate=0.0):
+    """JSON response for a sibling-mode prompt; each page is left out with probability drop_rate."""
+    pages = [dict(id=page_id, **fake_sections(block))
+             for page_id, block in _SIBLING_BLOCK_RE.findall(prompt)
+             if random.random() >= drop_rate]
+    return json.dumps({"pages": pages})
+
+
+class StubState:
+    """In-memory files and batches shared by all request handlers."""
+
+    def __init__(self, latency=0.0, error_rate=0.0, batch_delay=2.0, defect_rate=0.0,
+                 straggler_rate=0.0, straggler_latency=30.0):
+        self.latency = latency
+        self.straggler_rate = straggler_rate
+        self.straggler_latency = straggler_latency
+        self.error_rate = error_rate
+        self.defect_rate = defect_rate
+        self.batch_delay = batch_delay
+        self.files = {}
+        self.batches = {}
+        self.prefix_cache = set()
+        self.lock = threading.RLock()
+        self.ids = itertools.count(1)
+
+    def new_id(self, prefix):
+        with self.lock:
+            return f"{prefix}-stub{next(self.ids):06d}"
+
+    def cached_prefix_tokens(self, messages):
+        """Length of the longest previously seen prompt prefix, then remember this prompt's prefixes.
+
+        Prefixes are hashed at MIN_CACHEABLE_PREFIX_TOKENS and every
+        CACHE_BLOCK_TOKENS after it, like the real cache. Token boundaries use
+        the approximate tokenizer's pieces, which is close enough for a stub.
+        """
+        text = "".join(f"<{m.get('role')}>{m.get('content', '')}" for m in messages)
+        ends = [m.end() for m in llm_budget._TOKEN_PIECE_RE.finditer(text)]
+        hashes = []
+        for n in range(MIN_CACHEABLE_PREFIX_TOKENS, len(ends) + 1, CACHE_BLOCK_TOKENS):
+            hashes.append((n, hashlib.sha256(text[:ends[n - 1]].encode()).hexdigest()))
+        with self.lock:
+            cached = max((n for n, h in hashes if h in self.prefix_cache), default=0)
+            self.prefix_cache.update(h for _, h in hashes)
+        return cached
+
+    def complete(self, body, cached_tokens=None):
+        """Build a chat.completion response object for a request body."""
+        messages = body.get("messages") or []
+        prompt = "\n".join(m.get("content", "") for m in messages)
+        if (body.get("response_format") or {}).get("type") == "json_object":
+            content = fake_sibling_pages(prompt, drop_rate=self.error_rate)
+        else:
+            is_repair = any(m.get("role") == "assistant" for m in messages)
+            defect = None
+            if not is_repair and random.random() < self.defect_rate:
+                defect = random.choice(DEFECTS)
+            content = fake_page(prompt, defect)
+        model = body.get("model", "gpt-4o")
+        if cached_tokens is None:
+            cached_tokens = self.cached_prefix_tokens(messages)
+        return {
+            "id": self.new_id("chatcmpl"),
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {
+                "prompt_tokens": llm_budget.count_message_tokens(messages, model),
+                "completion_tokens": llm_budget.count_tokens(content, model),
+                "prompt_tokens_details": {"cached_tokens": cached_tokens},
+            },
+        }
+
+    def run_batch(self, batch_id):
+        """Process a batch in the background after batch_delay seconds."""
+        time.sleep(self.batch_delay)
+        with self.lock:
+            batch = self.batches[batch_id]
+            batch["status"] = "in_progress"
+            lines = self.files[batch["input_file_id"]]["content"].decode().splitlines()
+        outputs, errors = [], []
+        for raw in filter(None, lines):
+            request = json.loads(raw)
+            if random.random() < self.error_rate:
+                errors.append({"id": self.new_id("batch_req"), "custom_id": request["custom_id"], "response": None,
+                               "error": {"code": "server_error", "message": "Stub injected failure"}})
+                continue
+            outputs.append({"id": self.new_id("batch_req"), "custom_id": request["custom_id"],
+                            "response": {"status_code": 200, "body": self.complete(request["body"])},
+                            "error": None})
+        with self.lock:
+            batch["output_file_id"] = self._store_file(outputs, "batch_output")
+            batch["error_file_id"] = self._store_file(errors, "batch_error") if errors else None
+            batch["request_counts"] = {"total": len(outputs) + len(errors),
+                                       "completed": len(outputs), "failed": len(errors)}
+            batch["status"] = "completed"
+            batch["completed_at"] = int(time.time())
+
+    def _store_file(self, rows, purpose):
+        file_id = self.new_id("file")
+        content = "".join(json.dumps(r) + "\n" for r in rows).encode()
+        self.files[file_id] = {"id": file_id, "purpose": purpose, "bytes": len(content), "content": content}
+        return file_id
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    state = None  # set by serve()
+
+    def log_message(self, fmt, *args):
+        print(f"  [stub] {self.command} {self.path} -> {args[1] if len(args) > 1 else ''}", flush=True)
+
+    def _send_json(self, status, obj):
+        data = json.dumps(obj).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length)
+
+    def do_POST(self):
+        state = self.state
+        if self.path == "/v1/chat/completions":
+            body = json.loads(self._body())
+            messages = body.get("messages") or []
+            cached = state.cached_prefix_tokens(messages)
+            total = llm_budget.count_message_tokens(messages, body.get("model", "gpt-4o"))
+            share = min(cached / total, 1.0) if total else 0.0
+            delay = state.latency * (1 - share * (1 - CACHED_LATENCY_FACTOR))
+            if random.random() < state.straggler_rate:
+                delay += state.straggler_latency
+            time.sleep(delay)
+            if random.random() < state.error_rate:
+                return self._send_json(500, {"error": {"message": "Stub injected failure", "type": "server_error"}})
+            return self._send_json(200, state.complete(body, cached_tokens=cached))
+
+        if self.path == "/v1/files":
+            raw = b"Content-Type: " + self.headers["Content-Type"].encode() + b"\r\n\r\n" + self._body()
+            message = email.parser.BytesParser().parsebytes(raw)
+            fields = {part.get_param("name", header="content-disposition"): part.get_payload(decode=True)
+                      for part in message.get_payload()}
+            file_id = state.new_id("file")
+            with state.lock:
+                state.files[file_id] = {"id": file_id, "purpose": (fields.get("purpose") or b"").decode(),
+                                        "bytes": len(fields.get("file") or b""), "content": fields.get("file") or b""}
+            return self._send_json(200, {"id": file_id, "object": "file", "purpose": "batch",
+                                         "bytes": state.files[file_id]["bytes"]})
+
+        if self.path == "/v1/batches":
+            body = json.loads(self._body())
+            if body.get("input_file_id") not in state.files:
+                return self._send_json(404, {"error": {"message": "No such file"}})
+            batch_id = state.new_id("batch")
+            with state.lock:
+                state.batches[batch_id] = {
+                    "id": batch_id, "object": "batch", "endpoint": body.get("endpoint"),
+                    "input_file_id": body["input_file_id"], "completion_window": body.get("completion_window"),
+                    "status": "validating", "output_file_id": None, "error_file_id": None,
+                    "created_at": int(time.time()), "request_counts": {"total": 0, "completed": 0, "failed": 0},
+                }
+            threading.Thread(target=state.run_batch, args=(batch_id,), daemon=True).start()
+            return self._send_json(200, state.batches[batch_id])
+
+        self._send_json(404, {"error": {"message": f"Unknown endpoint {self.path}"}})
+
+    def do_GET(self):
+        state = self.state
+        m = re.fullmatch(r"/v1/batches/([\w-]+)", self.path)
+        if m:
+            batch = state.batches.get(m.group(1))
+            return self._send_json(200, batch) if batch else self._send_json(404, {"error": {"message": "No such batch"}})
+
+        m = re.fullmatch(r"/v1/files/([\w-]+)/content", self.path)
+        if m:
+            f = state.files.get(m.group(1))
+            if not f:
+                return self._send_json(404, {"error": {"message": "No such file"}})
+            self.send_response(200)
+            self.send_header("Content-Type", "application/jsonl")
+            self.send_header("Content-Length", str(len(f["content"])))
+            self.end_headers()
+            self.wfile.write(f["content"])
+            return
+
+        self._send_json(404, {"error": {"message": f"Unknown endpoint {self.path}"}})
+
+
+def serve(host="127.0.0.1", port=8765, **state_kwargs):
+    """Start the stub server (blocking)."""
+    StubHandler.state = StubState(**state_kwargs)
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    print(f"OpenAI stub listening on http://{host}:{port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the OpenAI chat, files and batch endpoints")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each chat response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail (0-1)")
+    parser.add_argument("--batch-delay", type=float, default=2.0, help="Seconds before a batch starts processing")
+    parser.add_argument("--defect-rate", type=float, default=0.0,
+                        help="Fraction of first-attempt pages returned with a content defect (0-1)")
+    parser.add_argument("--straggler-rate", type=float, default=0.0,
+                        help="Fraction of chat requests that answer --straggler-latency seconds late (0-1)")
+    parser.add_argument("--straggler-latency", type=float, default=30.0,
+                        help="Extra seconds a straggling chat request takes (default: 30)")
+    args = parser.parse_args()
+    serve(args.host, args.port, latency=args.latency, error_rate=args.error_rate, batch_delay=args.batch_delay,
+          defect_rate=args.defect_rate, straggler_rate=args.straggler_rate, straggler_latency=args.straggler_latency)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
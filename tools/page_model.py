@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+page_model.py — Lazily parsed site pages, shared by the tools.
+
+load_page(path) returns a Page for an HTML file. Nothing is read until a
+field is used, and the first parsed field triggers one HTMLParser pass that
+collects all of them:
+
+    page.html          the file's text (page.raw: its bytes)
+    page.title         <title> text
+    page.meta          {name or property: content} of the <meta> tags (first wins)
+    page.description   meta description
+    page.canonical     <link rel="canonical"> href
+    page.h1            text of the first <h1>
+    page.json_ld       parsed application/ld+json blocks (unparseable ones left out)
+    page.body_text     <body> text outside chrome and code (nav, header, footer, script, ...)
+                       and outside the rendered <!-- RELATED_LINKS --> block
+    page.noindex       robots meta asks not to index
+    page.markers       {name: (start, end)} of each <!-- SEO_* --> ... <!-- /SEO_* --> block's content
+    page.marker(name)  that content, or None
+
+Text fields are unescaped and whitespace-normalised. Pages are cached per
+process by path and invalidated when the file's mtime or size changes, so
+a file is read and tokenized at most once however many tools look at it;
+write_page() writes a file and refreshes its cache entry. Page.from_html()
+wraps HTML that isn't on disk (a page being generated).
+
+Usage:
+    python3 tools/page_model.py                 # parsed fields of every published page
+    python3 tools/page_model.py about.html      # ... of the given pages
+"""
+
+import json
+import os
+import re
+import sys
+from html.parser import HTMLParser
+from pathlib import Path
+
+from site_pages import REPO_ROOT, is_noindex, iter_site_pages
+
+# Elements whose text is chrome or code rather than page content.
+SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "nav", "header", "footer", "form", "select"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+_MARKER_RE = re.compile(r"<!-- (SEO_[A-Z0-9_]+) -->(.*?)<!-- /\1 -->", re.S)
+_PARSED = ("title", "meta", "canonical", "h1", "json_ld", "body_text")
+# Comment-marked blocks whose text is computed from other pages (related_links.py), not page content.
+SKIP_BLOCKS = {"RELATED_LINKS"}
+
+
+# ===================================================================
+# Parsing
+# ===================================================================
+
+class _PageParser(HTMLParser):
+    """Single pass over a page collecting the parsed Page fields."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title, self.h1, self.body = [], [], []
+        self.meta, self.canonical, self.json_ld = {}, None, []
+        self._stack = []
+        self._skip_depth = 0
+        self._skip_blocks = 0
+        self._json_ld = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("meta", "link", "script"):
+            attrs = {k: v or "" for k, v in attrs}
+            if tag == "meta" and "content" in attrs:
+                key = attrs.get("name") or attrs.get("property")
+                if key:
+                    self.meta.setdefault(key.lower(), attrs["content"])
+            elif tag == "link" and "canonical" in attrs.get("rel", "").lower().split() and self.canonical is None:
+                self.canonical = attrs.get("href", "")
+            elif tag == "script" and attrs.get("type", "").lower() == "application/ld+json":
+                self._json_ld = []
+        if tag in VOID_TAGS:
+            return
+        self._stack.append(tag)
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag == "script" and self._json_ld is not None:
+            self.json_ld.append("".join(self._json_ld))
+            self._json_ld = None
+        if tag not in self._stack:
+            return
+        while self._stack:
+            open_tag = self._stack.pop()
+            if open_tag in SKIP_TAGS:
+                self._skip_depth -= 1
+            if open_tag == tag:
+                break
+
+    def handle_comment(self, data):
+        name = data.strip()
+        if name in SKIP_BLOCKS:
+            self._skip_blocks += 1
+        elif name.startswith("/") and name[1:] in SKIP_BLOCKS and self._skip_blocks:
+            self._skip_blocks -= 1
+
+    def handle_data(self, data):
+        if self._json_ld is not None:
+            self._json_ld.append(data)
+        elif "title" in self._stack:
+            self.title.append(data)
+        elif self._skip_depth or self._skip_blocks:
+            return
+        elif "h1" in self._stack:
+            self.h1.append(data)
+        elif "body" in self._stack:
+            self.body.append(data)
+
+
+def _text(parts):
+    return " ".join(" ".join(parts).split())
+
+
+def _json_ld(blocks):
+    parsed = []
+    for block in blocks:
+        try:
+            parsed.append(json.loads(block))
+        except ValueError:
+            continue
+    return parsed
+
+
+# ===================================================================
+# Page
+# ===================================================================
+
+class Page:
+    """One HTML page, read on first use and parsed on first access to a parsed field."""
+
+    __slots__ = ("path", "mtime_ns", "size", "_raw", "_html", "_markers", *(f"_{name}" for name in _PARSED))
+
+    def __init__(self, path=None, mtime_ns=None, size=None):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self._raw = self._html = self._markers = None
+        for name in _PARSED:
+            setattr(self, f"_{name}", None)
+
+    @classmethod
+    def from_html(cls, html, path=None):
+        """A Page for HTML that isn't (yet) on disk. Not cached."""
+        page = cls(path)
+        page._html = html
+        return page
+
+    def __repr__(self):
+        return f"Page({str(self.path)!r})"
+
+    @property
+    def raw(self):
+        if self._raw is None:
+            self._raw = self.html.encode("utf-8") if self._html is not None else Path(self.path).read_bytes()
+        return self._raw
+
+    @property
+    def html(self):
+        if self._html is None:
+            self._html = self.raw.decode("utf-8", errors="replace")
+        return self._html
+
+    def _parse(self):
+        parser = _PageParser()
+        parser.feed(self.html)
+        parser.close()
+        self._title, self._h1, self._body_text = _text(parser.title), _text(parser.h1), _text(parser.body)
+        self._meta, self._canonical, self._json_ld = parser.meta, parser.canonical, _json_ld(parser.json_ld)
+
+    def _field(self, name):
+        if self._title is None:  # every parsed field is set by the same pass
+            self._parse()
+        return getattr(self, f"_{name}")
+
+    title = property(lambda self: self._field("title"))
+    meta = property(lambda self: self._field("meta"))
+    canonical = property(lambda self: self._field("canonical"))
+    h1 = property(lambda self: self._field("h1"))
+    json_ld = property(lambda self: self._field("json_ld"))
+    body_text = property(lambda self: self._field("body_text"))
+
+    @property
+    def description(self):
+        return self.meta.get("description")
+
+    @property
+    def noindex(self):
+        return is_noindex(self.html)
+
+    @property
+    def markers(self):
+        if self._markers is None:
+            self._markers = {m.group(1): m.span(2) for m in _MARKER_RE.finditer(self.html)}
+        return self._markers
+
+    def marker(self, name):
+        """Content of the <!-- name --> ... <!-- /name --> block, or None."""
+        span = self.markers.get(name)
+        return self.html[span[0]:span[1]] if span else None
+
+
+# ===================================================================
+# Cache
+# ===================================================================
+
+_cache = {}
+
+
+def load_page(path):
+    """The Page for a file, reused while the file's mtime and size are unchanged."""
+    key = os.path.abspath(path)
+    st = os.stat(key)
+    page = _cache.get(key)
+    if page is None or page.mtime_ns != st.st_mtime_ns or page.size != st.st_size:
+        page = _cache[key] = Page(Path(key), st.st_mtime_ns, st.st_size)
+    return page
+
+
+def write_page(path, html):
+    """Write a page and cache its new content."""
+    Path(path).write_text(html, encoding="utf-8")
+    key = os.path.abspath(path)
+    st = os.stat(key)
+    page = _cache[key] = Page(Path(key), st.st_mtime_ns, st.st_size)
+    page._html = html
+    return page
+
+
+# ===================================================================
+# Main
+# ===================================================================
+
+def main():
+    paths = [Path(p) for p in sys.argv[1:]] or list(iter_site_pages())
+    for path in paths:
+        page = load_page(path)
+        print(f"{Path(page.path).relative_to(REPO_ROOT)}")
+        print(f"    title:       {page.title}")
+        print(f"    description: {page.description or '-'}")
+        print(f"    canonical:   {page.canonical or '-'}")
+        print(f"    h1:          {page.h1 or '-'}")
+        types = [str(block.get("@type", "?")) for block in page.json_ld if isinstance(block, dict)]
+        print(f"    json-ld:     {', '.join(types) or '-'}")
+        print(f"    markers:     {', '.join(page.markers) or '-'}")
+        print(f"    body text:   {len(page.body_text.split())} words{'  (noindex)' if page.noindex else ''}")
+    print(f"\n{len(paths)} pages", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
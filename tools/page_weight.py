@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+page_weight.py — Per-page transfer weight audit with budgets and a baseline.
+
+For every published page, resolves the resources it references from disk
+(stylesheets and the url() assets inside them, scripts, images, icons, the
+web manifest) and measures:
+
+    html / total raw bytes     what sits on disk
+    html / total gzip bytes    text assets gzipped (level 6); images as-is
+    requests                   the page + each distinct resource
+    dom_nodes                  element count of the HTML
+
+Third-party scripts can't be read from disk; they count as requests with the
+estimated sizes in THIRD_PARTY_ESTIMATES.
+
+Pages fail when they exceed a budget in tools/page_weight_budgets.json or
+grow more than max_regression_pct over tools/page_weight_baseline.json.
+Pages are measured in parallel (one process per core); shared resources are
+read once per process.
+
+Usage:
+    python3 tools/page_weight.py                      # audit against budgets + baseline
+    python3 tools/page_weight.py --update-baseline    # accept current weights as the baseline
+    python3 tools/page_weight.py --top 20 --json out.json
+    python3 tools/page_weight.py index.html brands.html
+    python3 tools/page_weight.py --since main         # only pages changed since main
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+import changed_pages
+from page_model import load_page
+from site_pages import REPO_ROOT, iter_site_pages
+
+BUDGETS_PATH = REPO_ROOT / "tools" / "page_weight_budgets.json"
+BASELINE_PATH = REPO_ROOT / "tools" / "page_weight_baseline.json"
+
+TEXT_EXTENSIONS = {".html", ".css", ".js", ".mjs", ".json", ".svg", ".webmanifest", ".txt", ".xml"}
+GZIP_LEVEL = 6
+
+# Third-party scripts: (raw bytes, compressed bytes) as typically served.
+THIRD_PARTY_ESTIMATES = {
+    "www.googletagmanager.com/gtag/js": (380_000, 130_000),
+    "www.clarity.ms/tag": (90_000, 30_000),
+    "maps.googleapis.com/maps/api/js": (250_000, 90_000),
+}
+DEFAULT_THIRD_PARTY_ESTIMATE = (50_000, 20_000)
+
+METRICS = ("html_raw", "html_gz", "total_raw", "total_gz", "requests", "dom_nodes")
+
+_CSS_URL_RE = re.compile(r"""url\(\s*['"]?([^'")]+)['"]?\s*\)""")
+# Inline loaders (Clarity's bootstrap, the deferred-tag loader) inject these at runtime.
+_INJECTED_RE = re.compile(r"https://www\.(?:clarity\.ms/tag/|googletagmanager\.com/gtag/js)")
+
+
+# ===================================================================
+# Measurement
+# ===================================================================
+
+class _ResourceParser(HTMLParser):
+    """Collects referenced resources and counts elements."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.resources = []  # (kind, url)
+        self.dom_nodes = 0
+        self._icon_seen = False
+        self._in_script = False
+        self.inline_scripts = []
+
+    def handle_starttag(self, tag, attrs):
+        self.dom_nodes += 1
+        a = dict(attrs)
+        if tag == "link":
+            rel = (a.get("rel") or "").lower().split()
+            href = a.get("href")
+            if not href:
+                return
+            if "stylesheet" in rel:
+                self.resources.append(("css", href))
+            elif "icon" in rel and not self._icon_seen:
+                self._icon_seen = True  # browsers fetch one favicon
+                self.resources.append(("icon", href))
+            elif "manifest" in rel:
+                self.resources.append(("manifest", href))
+            elif "preload" in rel or "modulepreload" in rel:
+                self.resources.append((a.get("as") or "preload", href))
+        elif tag == "script":
+            self._in_script = True
+            if a.get("src"):
+                self.resources.append(("js", a["src"]))
+        elif tag == "img" and a.get("src"):
+            self.resources.append(("img_lazy" if a.get("loading") == "lazy" else "img", a["src"]))
+        elif a.get("style") and "url(" in a["style"]:
+            for url in _CSS_URL_RE.findall(a["style"]):
+                self.resources.append(("img", url))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag == "script":
+            self._in_script = False
+
+    def handle_endtag(self, tag):
+        if tag == "script":
+            self._in_script = False
+
+    def handle_data(self, data):
+        if self._in_script:
+            for url in _INJECTED_RE.findall(data):
+                self.resources.append(("js", url))
+
+
+def _local_path(url, base_dir):
+    """Resolve a same-site URL to a file under REPO_ROOT, or None for third-party URLs."""
+    parts = urlsplit(url)
+    if parts.scheme in ("http", "https") and parts.hostname not in (None, "elevaterepair.com", "www.elevaterepair.com"):
+        return None
+    if parts.scheme not in ("", "http", "https"):
+        return None  # data:, blob:, etc.
+    path = unquote(parts.path)
+    target = (REPO_ROOT / path.lstrip("/")) if path.startswith("/") else (base_dir / path)
+    return target.resolve()
+
+
+@lru_cache(maxsize=None)
+def file_weight(path):
+    """(raw bytes, transfer bytes) for a local file; missing files weigh (0, 0)."""
+    try:
+        data = Path(path).read_bytes()
+    except OSError:
+        return 0, 0
+    if Path(path).suffix.lower() in TEXT_EXTENSIONS:
+        return len(data), len(gzip.compress(data, GZIP_LEVEL))
+    return len(data), len(data)
+
+
+@lru_cache(maxsize=None)
+def stylesheet_assets(path):
+    """Local url() assets referenced by a stylesheet."""
+    try:
+        css = Path(path).read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return ()
+    base = Path(path).parent
+    return tuple(sorted({p for p in (_local_path(u, base) for u in _CSS_URL_RE.findall(css)) if p}))
+
+
+def third_party_weight(url):
+    parts = urlsplit(url)
+    key = f"{parts.hostname}{parts.path}".rstrip("/")
+    for prefix, weight in THIRD_PARTY_ESTIMATES.items():
+        if key.startswith(prefix):
+            return weight
+    return DEFAULT_THIRD_PARTY_ESTIMATE
+
+
+def measure_page(path):
+    """Measure one page. Returns a dict of METRICS plus breakdown details."""
+    path = Path(path)
+    page = load_page(path)
+    html = page.raw
+    parser = _ResourceParser()
+    parser.feed(page.html)
+    parser.close()
+
+    html_raw, html_gz = len(html), len(gzip.compress(html, GZIP_LEVEL))
+    seen, missing, third_party = set(), [], []
+    by_kind = {}
+
+    def add(kind, raw, gz):
+        totals = by_kind.setdefault(kind, [0, 0, 0])
+        totals[0] += raw
+        totals[1] += gz
+        totals[2] += 1
+
+    for kind, url in parser.resources:
+        local = _local_path(url, path.parent)
+        if local is None:
+            key = urlsplit(url)._replace(query="", fragment="").geturl().rstrip("/")
+            if key in seen:
+                continue
+            seen.add(key)
+            third_party.append(url)
+            add("third_party", *third_party_weight(url))
+            continue
+        if local in seen:
+            continue
+        seen.add(local)
+        if not local.exists():
+            missing.append(url)
+            continue
+        add(kind, *file_weight(local))
+        if kind == "css":
+            for asset in stylesheet_assets(local):
+                if asset not in seen and asset.exists():
+                    seen.add(asset)
+                    add("css_asset", *file_weight(asset))
+
+    return {
+        "page": path.relative_to(REPO_ROOT).as_posix(),
+        "html_raw": html_raw,
+        "html_gz": html_gz,
+        "total_raw": html_raw + sum(v[0] for v in by_kind.values()),
+        "total_gz": html_gz + sum(v[1] for v in by_kind.values()),
+        "requests": 1 + sum(v[2] for v in by_kind.values()),
+        "dom_nodes": parser.dom_nodes,
+        "by_kind": {k: {"raw": v[0], "gz": v[1], "count": v[2]} for k, v in sorted(by_kind.items())},
+        "third_party": third_party,
+        "missing": missing,
+    }
+
+
+def measure_pages(paths, workers=None):
+    """Measure pages in parallel, preserving order."""
+    paths = [str(p) for p in paths]
+    if len(paths) < 8 or workers == 1:
+        return [measure_page(p) for p in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(measure_page, paths, chunksize=max(len(paths) // ((workers or os.cpu_count() or 1) * 4), 1)))
+
+
+# ===================================================================
+# Budgets + baseline
+# ===================================================================
+
+def load_json(path, default):
+    if not path.exists():
+        return default
+    with open(path) as f:
+        return json.load(f)
+
+
+def budget_for(page, budgets):
+    """Merge the default budget with the first matching override (glob on the page path)."""
+    budget = dict(budgets.get("default", {}))
+    for pattern, override in budgets.get("overrides", {}).items():
+        if Path(page).match(pattern):
+            budget.update(override)
+            break
+    return budget
+
+
+def check_page(result, budgets, baseline):
+    """Return a list of failure strings for one measured page."""
+    failures = []
+    budget = budget_for(result["page"], budgets)
+    for metric in METRICS:
+        limit = budget.get(metric)
+        if limit is not None and result[metric] > limit:
+            failures.append(f"{metric} {_fmt(metric, result[metric])} over budget {_fmt(metric, limit)}")
+
+    previous = baseline.get(result["page"])
+    max_pct = budgets.get("max_regression_pct")
+    if previous and max_pct is not None:
+        for metric in budgets.get("regression_metrics", ["html_gz", "total_gz", "requests"]):
+            before = previous.get(metric)
+            if before and result[metric] > before * (1 + max_pct / 100):
+                growth = (result[metric] - before) / before * 100
+                failures.append(f"{metric} +{growth:.0f}% vs baseline "
+                                f"({_fmt(metric, before)} -> {_fmt(metric, result[metric])}, limit +{max_pct:g}%)")
+    if result["missing"]:
+        failures.append(f"missing resources: {', '.join(result['missing'][:5])}")
+    return failures
+
+
+def _fmt(metric, value):
+    if metric in ("requests", "dom_nodes"):
+        return str(value)
+    return f"{value / 1024:.1f} KB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit per-page transfer weight against budgets and a baseline")
+    parser.add_argument("pages", nargs="*", help="Pages to audit (default: every published page)")
+    parser.add_argument("--update-baseline", action="store_true", help="Write current weights as the new baseline")
+    parser.add_argument("--top", type=int, default=10, help="Show the N heaviest pages (default: 10)")
+    parser.add_argument("--json", default=None, metavar="PATH", help="Write every page's measurements here")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    changed_pages.add_arguments(parser)
+    args = parser.parse_args()
+
+    paths = [REPO_ROOT / p for p in args.pages] if args.pages else list(iter_site_pages())
+    paths = changed_pages.select(args, paths)
+    partial = bool(args.pages or args.since or args.staged)
+    results = measure_pages(paths, args.workers)
+    budgets = load_json(BUDGETS_PATH, {})
+    baseline = load_json(BASELINE_PATH, {})
+
+    print("=" * 60)
+    print("  Elevate Repair — Page Weight Audit")
+    print("=" * 60)
+    print(f"  Pages: {len(results)} ({changed_pages.scope_label(args)})")
+
+    print(f"\n  Heaviest {min(args.top, len(results))} (transfer size):")
+    for r in sorted(results, key=lambda r: -r["total_gz"])[:args.top]:
+        print(f"    {r['total_gz'] / 1024:7.1f} KB  {r['requests']:3d} req  {r['dom_nodes']:5d} nodes  {r['page']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n  Measurements written to {args.json}")
+
+    if args.update_baseline:
+        merged = dict(baseline) if partial else {}
+        merged.update({r["page"]: {m: r[m] for m in METRICS} for r in results})
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(dict(sorted(merged.items())), f, indent=1)
+            f.write("\n")
+        print(f"\n  Baseline updated: {BASELINE_PATH.relative_to(REPO_ROOT)} ({len(merged)} pages)")
+        return 0
+
+    failed = {}
+    for r in results:
+        failures = check_page(r, budgets, baseline)
+        if failures:
+            failed[r["page"]] = failures
+
+    if failed:
+        print(f"\n  FAILED: {len(failed)} page(s)")
+        for page, failures in sorted(failed.items()):
+            print(f"    ! {page}")
+            for failure in failures:
+                print(f"        {failure}")
+        return 1
+    print(f"\n  All pages within budget"
+          f"{' and baseline' if baseline else ''} (max regression {budgets.get('max_regression_pct', '-')}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
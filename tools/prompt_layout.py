@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+prompt_layout.py — Prefix-cache-friendly prompt layout and request ordering.
+
+Providers cache the longest previously seen prompt prefix (OpenAI: 1,024
+tokens and up, in 128-token steps) and bill/serve those tokens at a discount.
+page_prompt.txt opens with the per-page {city}/{category}/{problem} details,
+so every prompt diverges in its first lines and nothing is reusable.
+
+compile_layout() rewrites a prompt template so that everything except a short
+PAGE DETAILS block at the end is identical for every page: placeholders in the
+instructions become bracketed references ([City], [Appliance], ...) that the
+model resolves from the details block. The result is still a normal prompt
+template, so build_prompt() in generate_seo_pages.py works on it unchanged.
+
+schedule_for_cache() orders plan entries so pages sharing city and appliance
+context run back to back, which keeps the longest shared prefix warm.
+
+Usage:
+    python3 tools/prompt_layout.py                  # show compiled layout + prefix size
+    python3 tools/prompt_layout.py --write out.txt  # save compiled template
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+
+import llm_budget
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_PROMPT = REPO_ROOT / "tools" / "prompt_templates" / "page_prompt.txt"
+
+# OpenAI only caches prompts whose shared prefix is at least this long.
+MIN_CACHEABLE_PREFIX_TOKENS = 1024
+
+# placeholder -> (details label, bracketed reference used in the shared prefix).
+# Ordered from least to most page-specific: entries that share a city (and
+# then an appliance) also share the first lines of the details block.
+PLACEHOLDERS = [
+    ("{city}",           "City",        "[City]"),
+    ("{parent_page}",    "Parent page", "[Parent page]"),
+    ("{category}",       "Appliance",   "[Appliance]"),
+    ("{category_lower}", None,          "[appliance]"),
+    ("{problem}",        "Problem",     "[Problem]"),
+    ("{problem_lower}",  None,          "[problem]"),
+]
+
+LEGEND = (
+    "Bracketed references in these instructions stand for the PAGE DETAILS at the end of this message: "
+    "[City], [Appliance], [Problem] and [Parent page] are the values given there, and [appliance] / "
+    "[problem] are the same values in lowercase. Substitute the real values everywhere, including the "
+    "TITLE, DESCRIPTION and H1 lines and link URLs. Never output the bracketed references themselves."
+)
+
+_DETAILS_BLOCK_RE = re.compile(r"^PAGE DETAILS:\n(?:- .*\n?)+\n*", re.MULTILINE)
+
+
+def compile_layout(prompt_template):
+    """Rewrite a prompt template into shared-prefix + per-page-suffix form.
+
+    Returns (compiled_template, prefix). The prefix is the part that is
+    byte-identical for every page; the compiled template is the prefix
+    followed by a PAGE DETAILS block that still contains the placeholders.
+    """
+    body = _DETAILS_BLOCK_RE.sub("", prompt_template, count=1)
+    for placeholder, _, reference in PLACEHOLDERS:
+        body = body.replace(placeholder, reference)
+
+    leftover = re.findall(r"\{[a-z_]+\}", body)
+    if leftover:
+        raise ValueError(f"Prompt template uses placeholders the layout compiler doesn't know: {sorted(set(leftover))}")
+
+    prefix = body.rstrip() + "\n\n"
+    if LEGEND not in body:  # already-compiled templates compile to themselves
+        prefix += LEGEND + "\n\n"
+    details = "PAGE DETAILS:\n" + "".join(
+        f"- {label}: {placeholder}\n" for placeholder, label, _ in PLACEHOLDERS if label
+    )
+    return prefix + details, prefix
+
+
+def cacheable_tokens(prefix_tokens):
+    """How many of a shared prefix's tokens a provider cache can actually serve."""
+    if prefix_tokens < MIN_CACHEABLE_PREFIX_TOKENS:
+        return 0
+    return MIN_CACHEABLE_PREFIX_TOKENS + (prefix_tokens - MIN_CACHEABLE_PREFIX_TOKENS) // 128 * 128
+
+
+def shared_prefix_tokens(prefix, system_prompt, model=llm_budget.DEFAULT_PRICING_MODEL):
+    """Tokens identical across every request (system message + user prefix)."""
+    messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": prefix}]
+    return llm_budget.count_message_tokens(messages, model)
+
+
+def cache_group_key(entry):
+    """Entries with equal keys share city and appliance context."""
+    return (entry.get("city_slug"), entry.get("appliance_slug"))
+
+
+def schedule_for_cache(items, entry_of=lambda item: item, priority=None):
+    """Reorder items so entries sharing city + appliance run back to back.
+
+    Groups keep the order in which they first appear, and entries keep their
+    order within a group. With `priority` (a key function on the entry),
+    higher-priority groups still go first.
+    """
+    first_seen = {}
+    for index, item in enumerate(items):
+        first_seen.setdefault(cache_group_key(entry_of(item)), index)
+
+    def sort_key(indexed):
+        index, item = indexed
+        entry = entry_of(item)
+        rank = priority(entry) if priority else ()
+        return (rank, first_seen[cache_group_key(entry)], index)
+
+    return [item for _, item in sorted(enumerate(items), key=sort_key)]
+
+
+def summarize_cache_usage(usages, model):
+    """Aggregate prompt-cache stats from API `usage` objects.
+
+    Returns prompt/cached token totals, the cached ratio, and the USD saved
+    versus paying the full input rate for every prompt token.
+    """
+    prompt_tokens = cached_tokens = 0
+    saved = 0.0
+    pricing = llm_budget.get_pricing(model)
+    for usage in usages:
+        if not usage:
+            continue
+        cached = (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0) or 0
+        prompt_tokens += usage.get("prompt_tokens", 0)
+        cached_tokens += cached
+        saved += cached * (pricing["input"] - pricing["cached_input"]) / 1_000_000
+    return {
+        "prompt_tokens": prompt_tokens,
+        "cached_tokens": cached_tokens,
+        "ratio": cached_tokens / prompt_tokens if prompt_tokens else 0.0,
+        "saved": saved,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile page_prompt.txt into a prefix-cache-friendly layout")
+    parser.add_argument("--prompt", default=str(DEFAULT_PROMPT), help="Prompt template to compile")
+    parser.add_argument("--write", default=None, metavar="PATH", help="Write the compiled template here")
+    parser.add_argument("--model", default=llm_budget.DEFAULT_PRICING_MODEL)
+    args = parser.parse_args()
+
+    # Imported here: generate_seo_pages imports this module.
+    from generate_seo_pages import SYSTEM_PROMPT
+
+    with open(args.prompt, "r") as f:
+        template = f.read()
+    compiled, prefix = compile_layout(template)
+    prefix_tokens = shared_prefix_tokens(prefix, SYSTEM_PROMPT, args.model)
+
+    if args.write:
+        with open(args.write, "w") as f:
+            f.write(compiled)
+        print(f"Wrote compiled template to {args.write}")
+    else:
+        print(compiled)
+
+    print(f"\nShared prefix: {prefix_tokens} tokens ({llm_budget.tokenizer_name(args.model)})", file=sys.stderr)
+    if prefix_tokens < MIN_CACHEABLE_PREFIX_TOKENS:
+        print(f"WARNING: below the {MIN_CACHEABLE_PREFIX_TOKENS}-token minimum for provider prefix caching",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+related_links.py — Computed "related repairs" links for every problem page.
+
+Instead of hand-picking related links per page, this ranks every indexable
+page against every other one:
+
+    score = content similarity (cannibalization.py's headline + body TF-IDF,
+            place names removed)
+          + LOCATION_BOOST   same city / neighborhood
+          + APPLIANCE_BOOST  shares an appliance
+          + BRAND_BOOST      same brand
+
+and fills each page's k links by facet, the way the hand-picked sections did:
+
+    1. siblings   the best SIBLING_SLOTS pages for the same city and
+                  appliance in the same section of the site (a city's
+                  problem pages, or the guides under <appliance>-repair/),
+                  unbranded or of the page's own brand
+    2. parent     the parent hub: parents.appliance_page / brand_page /
+                  city_page from the --plan entry for the page, else the
+                  last breadcrumb ancestor (as in speculation_rules.py)
+    3. others     the best of the rest by score: other cities, brands, guides
+
+Only pages about an appliance or a brand are sibling or other targets
+(policies, the booking flow and general area pages are not). The result is a
+compact array file, tools/data/related-links.json:
+
+    {"v": 1, "k": 8,
+     "pages": [[rel_path, url, label], ...],
+     "related": [i0_0, ..., i0_k-1, i1_0, ...]}   # k indices into pages per page, -1 = none
+
+Pages carry a marked block that the render step fills from that file:
+
+    <!-- RELATED_LINKS -->
+    <section class="section-alt">...</section>
+    <!-- /RELATED_LINKS -->
+
+Pages generated from the tools/ templates start with an empty block.
+generate_seo_pages.py fills it by calling update() once its pages are
+written; after other generators, run this. --adopt turns the hand-inserted
+"related-links-inserted" sections of problem pages into marked blocks.
+Scores for the whole site are computed as blocked sparse matrix products,
+so a full rebuild takes seconds.
+
+Requires numpy and scipy.
+
+Usage:
+    python3 tools/related_links.py                  # dry run: list pages whose links would change
+    python3 tools/related_links.py --write          # recompute + re-render marked pages
+    python3 tools/related_links.py --adopt --write  # also convert hand-inserted sections
+    python3 tools/related_links.py --write --plan tools/seo_plan_authority_150.json
+    python3 tools/related_links.py --check          # exit 1 if data or pages are out of date
+"""
+
+import argparse
+import json
+import posixpath
+import re
+import sys
+from html import escape
+
+import numpy as np
+
+import cannibalization
+import speculation_rules
+from page_model import load_page, write_page
+from site_pages import REPO_ROOT, iter_site_pages
+
+DATA_PATH = REPO_ROOT / "tools" / "data" / "related-links.json"
+DATA_VERSION = 1
+
+DEFAULT_TOP_K = 12
+# Links reserved for same-city, same-appliance pages (the "other problems we fix here" list).
+SIBLING_SLOTS = 8
+# Parent hubs a page can have (plan appliance, brand and city page).
+MAX_PARENTS = 3
+LOCATION_BOOST = 0.3
+APPLIANCE_BOOST = 0.3
+BRAND_BOOST = 0.2
+# Candidates scoring below this (no shared location, appliance or content) aren't linked.
+MIN_SCORE = 0.35
+
+START_MARKER = "<!-- RELATED_LINKS -->"
+END_MARKER = "<!-- /RELATED_LINKS -->"
+_BLOCK_RE = re.compile(r"<!-- RELATED_LINKS -->.*?<!-- /RELATED_LINKS -->", re.S)
+_INSERTED_RE = re.compile(r"<!-- related-links-inserted -->\s*<section\b.*?</section>", re.S)
+_BRAND_TITLE_RE = re.compile(r"^(.+?) Appliance Repair\b")
+_HREF_RE = re.compile(r'href="/([^"#?]*)"')
+
+
+# ===================================================================
+# Recommender
+# ===================================================================
+
+def load_brands(docs):
+    """Brand names taken from the titles of the pages brands.html links to."""
+    by_url = {d["url"].strip("/"): d for d in docs}
+    html = load_page(REPO_ROOT / "brands.html").html
+    brands = set()
+    for target in _HREF_RE.findall(html):
+        doc = by_url.get(target.removesuffix(".html"))
+        m = _BRAND_TITLE_RE.match(doc["title"]) if doc else None
+        if m:
+            brands.add(m.group(1).lower())
+    return sorted(brands, key=len, reverse=True)
+
+
+def brand_ids(docs, brands):
+    """Array of brand ids (0 = no brand) from each page's title/H1."""
+    if not brands:
+        return np.zeros(len(docs), dtype=np.int64)
+    brand_re = re.compile(r"\b(?:%s)\b" % "|".join(map(re.escape, brands)))
+    ids = {}
+    return np.array([
+        ids.setdefault(m.group(0), len(ids) + 1) if (m := brand_re.search(d["headline"].lower())) else 0
+        for d in docs
+    ])
+
+
+def label_of(doc):
+    """Anchor text for a link to doc: its H1, else its title without the site suffix."""
+    text = doc["h1"] or re.split(r"\s+[|–—-]\s+Elevate", doc["title"])[0]
+    return text.strip()
+
+
+def parent_hubs(docs, parents=None):
+    """Each doc's parent hub indices: its `parents` URLs if given, else its last breadcrumb ancestor."""
+    parents = parents or {}
+    index = {d["url"]: i for i, d in enumerate(docs)}
+    hubs = []
+    for i, d in enumerate(docs):
+        urls = parents.get(d["url"])
+        if not urls:
+            urls = speculation_rules.breadcrumb_ancestors(load_page(REPO_ROOT / d["id"]).html)[:1]
+        hubs.append([index[u] for u in dict.fromkeys(urls) if u in index and index[u] != i])
+    return hubs
+
+
+def compute(docs, places, top_k=DEFAULT_TOP_K, parents=None):
+    """Rank related pages for every doc (cannibalization.page_documents). Returns the data-file object.
+
+    parents is {page URL: [parent hub URLs]} (speculation_rules.plan_parents).
+    """
+    headline, body = cannibalization.vectorize(docs, places)
+    locations, masks = cannibalization.facets(docs)
+    brands = brand_ids(docs, load_brands(docs))
+    candidate = (masks != 0) | (brands != 0)
+    sections = np.array([posixpath.dirname(d["id"]) for d in docs])
+
+    def score_block(start, stop):
+        score = cannibalization.similarity(headline, body, start, stop)
+        score += LOCATION_BOOST * (locations[start:stop, None] == locations[None, :])
+        score += APPLIANCE_BOOST * ((masks[start:stop, None] & masks[None, :]) != 0)
+        score += BRAND_BOOST * ((brands[start:stop, None] == brands[None, :]) & (brands[None, :] != 0))
+        score[:, ~candidate] = -np.inf
+        return score
+
+    def sibling_block(start, stop):
+        score = score_block(start, stop)
+        sibling = locations[start:stop, None] == locations[None, :]
+        sibling &= (masks[start:stop, None] & masks[None, :]) != 0
+        sibling &= (brands[None, :] == 0) | (brands[start:stop, None] == brands[None, :])
+        sibling &= sections[start:stop, None] == sections[None, :]
+        score[~sibling] = -np.inf
+        return score
+
+    n = len(docs)
+    top_k = min(top_k, n - 1)
+    # A hub can be a sibling too (same city and appliance); it takes the hub slot instead.
+    siblings, sibling_scores = cannibalization.top_k(n, SIBLING_SLOTS + MAX_PARENTS, sibling_block)
+    # Enough ranked candidates to fill the slots the siblings and hubs don't take.
+    others, other_scores = cannibalization.top_k(n, 2 * top_k, score_block)
+    indices = np.full((n, top_k), -1, dtype=np.int64)
+    for i, hubs in enumerate(parent_hubs(docs, parents)):
+        picked = [j for j, sc in zip(siblings[i], sibling_scores[i]) if sc >= MIN_SCORE and j not in hubs]
+        picked = picked[:SIBLING_SLOTS] + hubs + [j for j, sc in zip(others[i], other_scores[i]) if sc >= MIN_SCORE]
+        picked = list(dict.fromkeys(picked))[:top_k]
+        indices[i, :len(picked)] = picked
+    return {
+        "v": DATA_VERSION,
+        "k": top_k,
+        "pages": [[d["id"], d["url"], label_of(d)] for d in docs],
+        "related": indices.ravel().tolist(),
+    }
+
+
+def serialize(data):
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False) + "\n"
+
+
+def related_for(data):
+    """{rel_path: [(url, label), ...]} from a data-file object."""
+    pages, k, flat = data["pages"], data["k"], data["related"]
+    return {
+        rel: [(pages[j][1], pages[j][2]) for j in flat[i * k:(i + 1) * k] if j >= 0]
+        for i, (rel, _, _) in enumerate(pages)
+    }
+
+
+# ===================================================================
+# Render
+# ===================================================================
+
+def render_block(links, heading, indent=""):
+    """The marked related-links section for one page.
+
+    The links sit in a <nav>, which text extraction skips, so rendered links
+    never feed back into the similarity scores (or the search index).
+    """
+    lines = [
+        START_MARKER,
+        '<section class="section-alt">',
+        '    <div class="container">',
+        f"        <h2>{escape(heading, quote=False)}</h2>",
+        '        <nav class="footer-links" aria-label="Related repairs">',
+        *(f'            <a href="{escape(url)}">{escape(label, quote=False)}</a>' for url, label in links),
+        "        </nav>",
+        "    </div>",
+        "</section>",
+        END_MARKER,
+    ]
+    return "\n".join((indent + line if i else line) for i, line in enumerate(lines))
+
+
+def heading_for(doc_appliances):
+    if len(doc_appliances) == 1:
+        return f"Related {next(iter(doc_appliances)).title()} Repairs"
+    return "Related Repairs"
+
+
+def _indent_of(html, pos):
+    line_start = html.rfind("\n", 0, pos) + 1
+    prefix = html[line_start:pos]
+    return prefix if not prefix.strip() else ""
+
+
+def render_page(html, links, heading, adopt=False):
+    """Fill (and with adopt, first create) the page's marked block. Returns (new_html, adopted)."""
+    adopted = False
+    if adopt and START_MARKER not in html:
+        m = _INSERTED_RE.search(html)
+        if m:
+            html = html[:m.start()] + f"{START_MARKER}{END_MARKER}" + html[m.end():]
+            adopted = True
+    m = _BLOCK_RE.search(html)
+    if not m or not links:
+        return html, adopted
+    block = render_block(links, heading, _indent_of(html, m.start()))
+    return html[:m.start()] + block + html[m.end():], adopted
+
+
+def render_site(data, appliances, adopt=False, write=False):
+    """Re-render every marked page from data. Returns (changed rels, adopted rels).
+
+    `appliances` maps rel_path to the page's appliances, which pick the heading.
+    """
+    related = related_for(data)
+    changed, adopted = [], []
+    for path in iter_site_pages():
+        rel = path.relative_to(REPO_ROOT).as_posix()
+        if rel not in related or rel not in appliances:
+            continue
+        html = load_page(path).html
+        # Only single-appliance pages (problem pages and guides) give up their hand-written sections.
+        new_html, was_adopted = render_page(html, related[rel], heading_for(appliances[rel]),
+                                            adopt=adopt and len(appliances[rel]) == 1)
+        if was_adopted:
+            adopted.append(rel)
+        if new_html != html:
+            changed.append(rel)
+            if write:
+                write_page(path, new_html)
+    return changed, adopted
+
+
+def update(top_k=DEFAULT_TOP_K, adopt=False, write=False, parents=None):
+    """Recompute the whole site's links and re-render the marked pages (with write, in place).
+
+    Returns (data, serialized data, data file stale, changed rels, adopted rels).
+    Generators call update(write=True, parents=...) after adding pages.
+    """
+    places = cannibalization.load_places()
+    docs = cannibalization.page_documents(places)
+    data = compute(docs, places, top_k, parents)
+    text = serialize(data)
+    data_stale = not DATA_PATH.exists() or DATA_PATH.read_text(encoding="utf-8") != text
+    if write and data_stale:
+        DATA_PATH.write_text(text, encoding="utf-8")
+    changed, adopted = render_site(data, {d["id"]: d["appliances"] for d in docs}, adopt=adopt, write=write)
+    return data, text, data_stale, changed, adopted
+
+
+# ===================================================================
+# Main
+# ===================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute and render related links for problem pages")
+    parser.add_argument("--write", action="store_true", help="Write the data file and pages (default: dry run)")
+    parser.add_argument("--adopt", action="store_true",
+                        help="Replace hand-inserted related sections on problem pages with marked blocks")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if the data file or any page is out of date")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help=f"Links per page (default: {DEFAULT_TOP_K})")
+    parser.add_argument("--plan", default=None, metavar="PATH",
+                        help="Plan JSON whose `parents` name each generated page's parent hub")
+    args = parser.parse_args()
+    write = args.write and not args.check
+    parents = speculation_rules.plan_parents(args.plan) if args.plan else {}
+
+    print("=" * 60)
+    print("  Elevate Repair — Related Links")
+    print("=" * 60)
+    print(f"  Mode: {'WRITE' if write else 'DRY RUN'}")
+
+    data, text, data_stale, changed, adopted = update(args.top_k, adopt=args.adopt, write=write, parents=parents)
+    linked = sum(1 for j in data["related"] if j >= 0)
+    print(f"  Pages ranked: {len(data['pages'])} ({linked} links, top {data['k']} each)")
+    print(f"  Data file:    {DATA_PATH.relative_to(REPO_ROOT)} "
+          f"({len(text.encode()) / 1024:.1f} KB, {'changed' if data_stale else 'unchanged'})")
+    for rel in changed:
+        print(f"    ~ {rel}{'  [adopted]' if rel in adopted else ''}")
+    print(f"\n  {'Rewritten' if write else 'Out of date'}: {len(changed)}")
+    if args.check:
+        return 1 if changed or data_stale else 0
+    if (changed or data_stale) and not write:
+        print("  Dry run — re-run with --write to apply.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+seo_lint.py — Site-wide SEO lint: one streaming parse per page, a registry of rules.
+
+Each page is tokenized once by html.parser; every registered rule sees the
+same start-tag / end-tag / text events and reports findings when the page
+ends. Pages are linted in parallel (one process per core).
+
+Rules (see RULES; --list-rules prints them):
+
+    title-length         <title> present and TITLE_MIN-TITLE_MAX characters
+    description-length   meta description present and DESCRIPTION_MIN-DESCRIPTION_MAX characters
+    single-h1            exactly one <h1>
+    canonical            canonical and og:url present, equal, and pointing at the page's own URL
+    json-ld              every application/ld+json block parses and declares @context/@type
+    img-alt              every <img> has an alt attribute (alt="" marks decorative images)
+    balanced-tags        no unclosed or stray elements (void and optional-end tags excepted)
+
+Errors fail the run (exit 1); warnings are reported only. Findings can be
+written as JSON or as SARIF 2.1.0 for code-scanning UIs.
+
+Usage:
+    python3 tools/seo_lint.py                                # lint every published page
+    python3 tools/seo_lint.py aurora.html washer-repair/washer-wont-spin.html
+    python3 tools/seo_lint.py --sarif seo-lint.sarif --json seo-lint.json
+    python3 tools/seo_lint.py --disable img-alt --disable title-length
+    python3 tools/seo_lint.py --staged                       # only pages the staged change affects
+"""
+
+import argparse
+import html as html_lib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from pathlib import Path
+
+import changed_pages
+from page_model import load_page
+from site_pages import REPO_ROOT, SITE_URL, iter_site_pages, page_url
+
+TITLE_MIN, TITLE_MAX = 30, 60
+DESCRIPTION_MIN, DESCRIPTION_MAX = 70, 160
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+             "param", "source", "track", "wbr"}
+# Elements whose end tag HTML lets authors omit.
+OPTIONAL_END_TAGS = {"html", "head", "body", "p", "li", "dt", "dd", "option", "optgroup",
+                     "tr", "td", "th", "thead", "tbody", "tfoot", "colgroup", "caption", "rt", "rp"}
+
+RULES = {}
+
+
+def register(cls):
+    """Class decorator: add a rule to the registry under cls.id."""
+    RULES[cls.id] = cls
+    return cls
+
+
+# ===================================================================
+# Rules
+# ===================================================================
+
+class Rule:
+    """Base rule. Subclasses override the event hooks they need and call report()."""
+
+    id = ""
+    level = "warning"  # "error" fails the run
+    description = ""
+
+    def __init__(self, page):
+        self.page = page  # {"path": rel path, "url": the page's own absolute URL}
+        self.findings = []
+
+    def report(self, message, line, level=None):
+        self.findings.append({"rule": self.id, "level": level or self.level, "message": message, "line": line})
+
+    def start(self, tag, attrs, line):
+        pass
+
+    def end(self, tag, line):
+        pass
+
+    def data(self, text, line):
+        pass
+
+    def finish(self, line):
+        pass
+
+
+@register
+class TitleLength(Rule):
+    id = "title-length"
+    description = f"<title> is present and {TITLE_MIN}-{TITLE_MAX} characters"
+
+    def __init__(self, page):
+        super().__init__(page)
+        self.text, self.line, self.inside = None, None, False
+
+    def start(self, tag, attrs, line):
+        if tag == "title" and self.text is None:
+            self.text, self.line, self.inside = "", line, True
+
+    def end(self, tag, line):
+        if tag == "title":
+            self.inside = False
+
+    def data(self, text, line):
+        if self.inside:
+            self.text += text
+
+    def finish(self, line):
+        if self.text is None:
+            return self.report("missing <title>", 1, "error")
+        n = len(" ".join(self.text.split()))
+        if not TITLE_MIN <= n <= TITLE_MAX:
+            self.report(f"title is {n} characters (want {TITLE_MIN}-{TITLE_MAX})", self.line)
+
+
+@register
+class DescriptionLength(Rule):
+    id = "description-length"
+    description = f"meta description is present and {DESCRIPTION_MIN}-{DESCRIPTION_MAX} characters"
+
+    def __init__(self, page):
+        super().__init__(page)
+        self.seen = False
+
+    def start(self, tag, attrs, line):
+        if tag != "meta" or (attrs.get("name") or "").lower() != "description":
+            return
+        if self.seen:
+            return self.report("duplicate meta description", line, "error")
+        self.seen = True
+        n = len(" ".join((attrs.get("content") or "").split()))
+        if not DESCRIPTION_MIN <= n <= DESCRIPTION_MAX:
+            self.report(f"meta description is {n} characters (want {DESCRIPTION_MIN}-{DESCRIPTION_MAX})", line)
+
+    def finish(self, line):
+        if not self.seen:
+            self.report("missing meta description", 1, "error")
+
+
+@register
+class SingleH1(Rule):
+    id = "single-h1"
+    level = "error"
+    description = "exactly one <h1>"
+
+    def __init__(self, page):
+        super().__init__(page)
+        self.lines = []
+
+    def start(self, tag, attrs, line):
+        if tag == "h1":
+            self.lines.append(line)
+
+    def finish(self, line):
+        if not self.lines:
+            self.report("no <h1>", 1)
+        elif len(self.lines) > 1:
+            self.report(f"{len(self.lines)} <h1> elements (lines {', '.join(map(str, self.lines))})", self.lines[1])
+
+
+@register
+class Canonical(Rule):
+    id = "canonical"
+    level = "error"
+    description = "canonical and og:url are present, agree, and point at the page's own URL"
+
+    def __init__(self, page):
+        super().__init__(page)
+        self.canonical = self.og_url = None
+
+    def start(self, tag, attrs, line):
+        if tag == "link" and "canonical" in (attrs.get("rel") or "").lower().split():
+            self.canonical = (attrs.get("href") or "", line)
+        elif tag == "meta" and attrs.get("property") == "og:url":
+            self.og_url = (attrs.get("content") or "", line)
+
+    def finish(self, line):
+        if not self.canonical:
+            return self.report("missing <link rel=\"canonical\">", 1)
+        href, at = self.canonical
+        if not self.og_url:
+            self.report("missing og:url", at, "warning")
+        elif self.og_url[0] != href:
+            self.report(f"og:url {self.og_url[0]} disagrees with canonical {href}", self.og_url[1])
+        if href != self.page["url"]:
+            self.report(f"canonical {href} is not this page's URL {self.page['url']}", at, "warning")
+
+
+@register
+class JsonLd(Rule):
+    id = "json-ld"
+    level = "error"
+    description = "every application/ld+json block parses and declares @context and @type"
+
+    def __init__(self, page):
+        super().__init__(page)
+        self.buffer, self.line = None, None
+
+    def start(self, tag, attrs, line):
+        if tag == "script" and (attrs.get("type") or "").lower() == "application/ld+json":
+            self.buffer, self.line = [], line
+
+    def data(self, text, line):
+        if self.buffer is not None:
+            self.buffer.append(text)
+
+    def end(self, tag, line):
+        if tag != "script" or self.buffer is None:
+            return
+        raw, self.buffer = "".join(self.buffer), None
+        try:
+            doc = json.loads(raw)
+        except json.JSONDecodeError as e:
+            return self.report(f"invalid JSON-LD: {e.msg} (line {e.lineno} of the block)", self.line + e.lineno - 1)
+        for item in doc if isinstance(doc, list) else [doc]:
+            if not isinstance(item, dict) or "@type" not in item and "@graph" not in item:
+                self.report("JSON-LD item without @type", self.line)
+            elif "@context" not in item and not isinstance(doc, list):
+                self.report("JSON-LD without @context", self.line)
+
+
+@register
+class ImgAlt(Rule):
+    id = "img-alt"
+    description = "every <img> has an alt attribute"
+
+    def start(self, tag, attrs, line):
+        if tag == "img" and "alt" not in attrs:
+            self.report(f"<img src=\"{attrs.get('src') or ''}\"> has no alt attribute", line)
+
+
+@register
+class BalancedTags(Rule):
+    id = "balanced-tags"
+    level = "error"
+    description = "no unclosed or stray elements"
+
+    def __init__(self, page):
+        super().__init__(page)
+        self.stack = []  # (tag, line)
+
+    def start(self, tag, attrs, line):
+        if tag not in VOID_TAGS:
+            self.stack.append((tag, line))
+
+    def end(self, tag, line):
+        if tag in VOID_TAGS:
+            return
+        if not any(t == tag for t, _ in self.stack):
+            return self.report(f"stray </{tag}>", line)
+        while self.stack:
+            open_tag, opened = self.stack.pop()
+            if open_tag == tag:
+                return
+            if open_tag not in OPTIONAL_END_TAGS:
+                self.report(f"<{open_tag}> opened on line {opened} is closed implicitly by </{tag}>", line)
+
+    def finish(self, line):
+        for open_tag, opened in self.stack:
+            if open_tag not in OPTIONAL_END_TAGS:
+                self.report(f"<{open_tag}> opened on line {opened} is never closed", opened)
+
+
+# ===================================================================
+# Engine
+# ===================================================================
+
+class _LintParser(HTMLParser):
+    """Streams one page's tokens to every rule that handles them."""
+
+    def __init__(self, rules):
+        super().__init__(convert_charrefs=True)
+        self.rules = rules
+        self._start = [r for r in rules if type(r).start is not Rule.start]
+        self._end = [r for r in rules if type(r).end is not Rule.end]
+        self._data = [r for r in rules if type(r).data is not Rule.data]
+
+    def handle_starttag(self, tag, attrs):
+        line = self.getpos()[0]
+        a = {k: v for k, v in attrs}
+        for rule in self._start:
+            rule.start(tag, a, line)
+
+    def handle_startendtag(self, tag, attrs):
+        line = self.getpos()[0]
+        a = {k: v for k, v in attrs}
+        for rule in self._start:
+            rule.start(tag, a, line)
+        if tag not in VOID_TAGS:
+            for rule in self._end:
+                rule.end(tag, line)
+
+    def handle_endtag(self, tag):
+        line = self.getpos()[0]
+        for rule in self._end:
+            rule.end(tag, line)
+
+    def handle_data(self, data):
+        line = self.getpos()[0]
+        for rule in self._data:
+            rule.data(data, line)
+
+
+def lint_html(html, rel_path, url=None, rule_ids=None):
+    """Lint one page's HTML. Returns a list of findings sorted by line."""
+    page = {"path": rel_path, "url": url or SITE_URL + page_url(REPO_ROOT / rel_path)}
+    rules = [RULES[rid](page) for rid in (rule_ids or RULES)]
+    parser = _LintParser(rules)
+    parser.feed(html)
+    parser.close()
+    end_line = parser.getpos()[0]
+    findings = []
+    for rule in rules:
+        rule.finish(end_line)
+        findings.extend(rule.findings)
+    return sorted(findings, key=lambda f: (f["line"], f["rule"]))
+
+
+def _lint_file(args):
+    path, rule_ids = args
+    rel = Path(path).relative_to(REPO_ROOT).as_posix()
+    html = load_page(path).html
+    return rel, lint_html(html, rel, rule_ids=rule_ids)
+
+
+def lint_pages(paths, rule_ids=None, workers=None):
+    """{rel path: findings} for each page, linted in parallel."""
+    jobs = [(str(p), rule_ids) for p in paths]
+    if len(jobs) < 8 or workers == 1:
+        return dict(_lint_file(job) for job in jobs)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunk = max(len(jobs) // ((workers or os.cpu_count() or 1) * 4), 1)
+        return dict(pool.map(_lint_file, jobs, chunksize=chunk))
+
+
+def to_sarif(results, rule_ids):
+    """SARIF 2.1.0 log for {rel path: findings}."""
+    return {
+        "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+        "version": "2.1.0",
+        "runs": [{
+            "tool": {"driver": {
+                "name": "seo-lint",
+                "informationUri": "https://elevaterepair.com",
+                "rules": [{"id": rid, "shortDescription": {"text": RULES[rid].description},
+                           "defaultConfiguration": {"level": RULES[rid].level}} for rid in rule_ids],
+            }},
+            "results": [{
+                "ruleId": f["rule"],
+                "level": f["level"],
+                "message": {"text": f["message"]},
+                "locations": [{"physicalLocation": {
+                    "artifactLocation": {"uri": rel},
+                    "region": {"startLine": f["line"]},
+                }}],
+            } for rel, findings in sorted(results.items()) for f in findings],
+        }],
+    }
+
+
+# ===================================================================
+# Main
+# ===================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Lint every page for SEO and markup problems in one pass")
+    parser.add_argument("pages", nargs="*", help="Pages to lint (default: every published page)")
+    parser.add_argument("--disable", action="append", default=[], metavar="RULE", help="Skip a rule (repeatable)")
+    parser.add_argument("--json", default=None, metavar="PATH", help="Write findings as JSON")
+    parser.add_argument("--sarif", default=None, metavar="PATH", help="Write findings as SARIF 2.1.0")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--list-rules", action="store_true", help="Print the rule registry and exit")
+    parser.add_argument("--quiet", action="store_true", help="Only print the summary")
+    changed_pages.add_arguments(parser)
+    args = parser.parse_args()
+
+    if args.list_rules:
+        for rid, cls in RULES.items():
+            print(f"  {rid:20s} {cls.level:8s} {cls.description}")
+        return 0
+    unknown = set(args.disable) - set(RULES)
+    if unknown:
+        parser.error(f"unknown rule(s): {', '.join(sorted(unknown))}")
+    rule_ids = [rid for rid in RULES if rid not in args.disable]
+
+    paths = [REPO_ROOT / p for p in args.pages] if args.pages else list(iter_site_pages())
+    paths = changed_pages.select(args, paths)
+    started = time.monotonic()
+    results = lint_pages(paths, rule_ids, args.workers)
+    elapsed = time.monotonic() - started
+
+    counts = {}
+    for findings in results.values():
+        for f in findings:
+            key = (f["rule"], f["level"])
+            counts[key] = counts.get(key, 0) + 1
+    errors = sum(n for (_, level), n in counts.items() if level == "error")
+    warnings = sum(counts.values()) - errors
+
+    print("=" * 60)
+    print("  Elevate Repair — SEO Lint")
+    print("=" * 60)
+    print(f"  Pages: {len(results)} ({changed_pages.scope_label(args)})  Rules: {len(rule_ids)}  Time: {elapsed:.2f}s")
+    if not args.quiet:
+        for rel, findings in sorted(results.items()):
+            for f in findings:
+                mark = "!" if f["level"] == "error" else "-"
+                print(f"    {mark} {rel}:{f['line']}  [{f['rule']}] {html_lib.unescape(f['message'])}")
+    print()
+    for (rule, level), n in sorted(counts.items()):
+        print(f"    {rule:20s} {level:8s} {n}")
+    print(f"\n  {errors} error(s), {warnings} warning(s)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"  JSON written to {args.json}")
+    if args.sarif:
+        with open(args.sarif, "w") as f:
+            json.dump(to_sarif(results, rule_ids), f, indent=2)
+        print(f"  SARIF written to {args.sarif}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
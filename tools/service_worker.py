@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+service_worker.py — Generate the site's service worker from the dist build.
+
+build_dist.py calls this after hashing the build, so the service worker is
+derived from the same content hashes as the deploy manifest:
+
+  * Precache — the shell (styles.css, icons, web manifest, the shared
+    inline-script bundle), the hub pages and the booking flow (book,
+    thank-you and the images they show) are cached on install. Each entry
+    is stored under its URL plus its content revision, so a deploy only
+    re-downloads the entries whose hash changed; the rest stay cached.
+  * Pages — every other same-origin HTML navigation is served
+    stale-while-revalidate from a runtime cache capped at MAX_RUNTIME_PAGES.
+  * Everything else (images, third-party tags, the booking form POST) goes
+    straight to the network.
+
+The precache manifest ([url, revision] pairs) is embedded in /sw.js along
+with a version derived from it, so any precached change produces a new
+sw.js and browsers pick up the update on their next visit. Cache names
+carry CACHE_VERSION; bumping it (a change to the caching scheme itself)
+drops every old cache on activate.
+
+Pages register the worker with a small inline script that build_dist.py
+injects before </body> in the dist copy only; the repo's pages are not
+changed.
+
+Run on its own, this checks the live dist build's /sw.js against what the
+current code would generate for it (e.g. after a SHELL_FILES or template
+change). --write regenerates it in place and records its new hash in the
+build's manifest; the next build_dist.py run produces a fresh build anyway.
+
+Usage:
+    python3 tools/service_worker.py          # dry run: precache manifest of the live dist build
+    python3 tools/service_worker.py --write  # regenerate the live build's sw.js
+    python3 tools/service_worker.py --check  # exit 1 if the live build's sw.js is out of date
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+
+from site_pages import REPO_ROOT, page_url
+
+SW_PATH = "sw.js"
+CACHE_VERSION = 1
+MAX_RUNTIME_PAGES = 60
+
+# Shell assets precached on install (repo-relative; missing ones are skipped).
+SHELL_FILES = [
+    "styles.css",
+    "favicon.ico",
+    "favicon-16x16.png",
+    "favicon-32x32.png",
+    "apple-touch-icon.png",
+    "site.webmanifest",
+]
+SHELL_GLOBS = ["assets/js/shared-inline.*.js"]
+
+HUB_PAGES = [
+    "index.html",
+    "service-areas.html",
+    "brands.html",
+    "dishwasher-repair-denver.html",
+    "dryer-repair-denver.html",
+    "fridge-repair-denver.html",
+    "oven-repair-denver.html",
+    "washer-repair-denver.html",
+]
+# Precached together with the same-origin images they show.
+BOOKING_PAGES = ["book.html", "thank-you.html"]
+
+REGISTER_MARKER = "<!-- SW_REGISTER -->"
+REGISTER_SNIPPET = (
+    REGISTER_MARKER + "\n"
+    '<script>if ("serviceWorker" in navigator) addEventListener("load", function(){ '
+    'navigator.serviceWorker.register("/' + SW_PATH + '"); });</script>\n'
+)
+
+_IMG_SRC_RE = re.compile(r'<img\b[^>]*?\ssrc="(/[^"/][^"]*)"', re.S)
+
+SW_TEMPLATE = """/*
+ * Elevate Repair service worker — generated by tools/service_worker.py
+ * during tools/build_dist.py. Do not edit; edit the generator.
+ */
+const VERSION = "{version}";
+const PRECACHE = "precache-v{cache_version}";
+const PAGES = "pages-v{cache_version}";
+const MAX_PAGES = {max_pages};
+// [url, revision] — revision is the content hash from the build manifest.
+const PRECACHE_MANIFEST = {manifest};
+
+const keyOf = ([url, rev]) => new URL(url + (url.includes("?") ? "&" : "?") + "__rev=" + rev, location).href;
+const precacheKeys = new Map(PRECACHE_MANIFEST.map((entry) => [new URL(entry[0], location).href, keyOf(entry)]));
+
+self.addEventListener("install", (event) => {{
+    event.waitUntil((async () => {{
+        const cache = await caches.open(PRECACHE);
+        const missing = [];
+        for (const entry of PRECACHE_MANIFEST) {{
+            if (!(await cache.match(keyOf(entry)))) missing.push(entry);
+        }}
+        // Only entries whose revision changed since the last install are fetched.
+        await Promise.all(missing.map(async (entry) => {{
+            const response = await fetch(entry[0], {{cache: "no-cache"}});
+            if (!response.ok) throw new Error("precache " + entry[0] + ": " + response.status);
+            await cache.put(keyOf(entry), response);
+        }}));
+        await self.skipWaiting();
+    }})());
+}});
+
+self.addEventListener("activate", (event) => {{
+    event.waitUntil((async () => {{
+        for (const name of await caches.keys()) {{
+            if (name !== PRECACHE && name !== PAGES) await caches.delete(name);
+        }}
+        const wanted = new Set(precacheKeys.values());
+        const cache = await caches.open(PRECACHE);
+        for (const request of await cache.keys()) {{
+            if (!wanted.has(request.url)) await cache.delete(request);
+        }}
+        await self.clients.claim();
+    }})());
+}});
+
+async function trim(cache) {{
+    const keys = await cache.keys();
+    for (const request of keys.slice(0, Math.max(keys.length - MAX_PAGES, 0))) await cache.delete(request);
+}}
+
+async function staleWhileRevalidate(event, request) {{
+    const cache = await caches.open(PAGES);
+    const cached = await cache.match(request, {{ignoreSearch: true}});
+    const network = fetch(request).then(async (response) => {{
+        if (response.ok && response.type === "basic") {{
+            await cache.put(request.url.split("?")[0], response.clone());
+            await trim(cache);
+        }}
+        return response;
+    }});
+    if (cached) {{
+        event.waitUntil(network.catch(() => {{}}));
+        return cached;
+    }}
+    return network;
+}}
+
+self.addEventListener("fetch", (event) => {{
+    const request = event.request;
+    if (request.method !== "GET") return;
+    const url = new URL(request.url);
+    if (url.origin !== location.origin) return;
+
+    const key = precacheKeys.get(url.origin + url.pathname);
+    if (key) {{
+        event.respondWith(caches.open(PRECACHE)
+            .then((cache) => cache.match(key))
+            .then((cached) => cached || fetch(request)));
+        return;
+    }}
+    if (request.mode === "navigate" || (request.headers.get("accept") || "").includes("text/html")) {{
+        event.respondWith(staleWhileRevalidate(event, request));
+    }}
+}});
+"""
+
+
+# ===================================================================
+# Precache manifest
+# ===================================================================
+
+def _url_of(rel):
+    return page_url(REPO_ROOT / rel) if rel.endswith(".html") else "/" + rel
+
+
+def precache_files(files, pages):
+    """Repo-relative paths to precache, from the build's {path: hash} and {rel: html}."""
+    wanted = [*SHELL_FILES, *HUB_PAGES, *BOOKING_PAGES]
+    for pattern in SHELL_GLOBS:
+        regex = re.compile(re.escape(pattern).replace(r"\*", "[^/]*") + "$")
+        wanted += sorted(rel for rel in files if regex.match(rel))
+    for rel in BOOKING_PAGES:
+        for src in _IMG_SRC_RE.findall(pages.get(rel, "")):
+            wanted.append(src.lstrip("/").split("?")[0].replace("%20", " "))
+    return list(dict.fromkeys(rel for rel in wanted if rel in files))
+
+
+def precache_manifest(files, pages):
+    """[[url, revision], ...] for the precached files."""
+    return [[_url_of(rel), files[rel][:12]] for rel in precache_files(files, pages)]
+
+
+def render_sw(manifest):
+    """The sw.js source for a precache manifest."""
+    body = json.dumps(manifest, separators=(",", ":"))
+    version = hashlib.sha256(f"{CACHE_VERSION}:{body}".encode()).hexdigest()[:12]
+    return SW_TEMPLATE.format(version=version, cache_version=CACHE_VERSION,
+                              max_pages=MAX_RUNTIME_PAGES, manifest=body)
+
+
+def inject_registration(html):
+    """Add the registration snippet before </body> (once)."""
+    if REGISTER_MARKER in html:
+        return html
+    pos = html.rfind("</body>")
+    if pos < 0:
+        return html
+    return html[:pos] + REGISTER_SNIPPET + html[pos:]
+
+
+# ===================================================================
+# Main
+# ===================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the service worker of the live dist build")
+    parser.add_argument("--write", action="store_true", help="Rewrite the live build's sw.js (default: dry run)")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if sw.js is out of date (implies dry run)")
+    args = parser.parse_args()
+    write = args.write and not args.check
+
+    import build_dist
+
+    print("=" * 60)
+    print("  Elevate Repair — Service Worker")
+    print("=" * 60)
+    print(f"  Mode: {'WRITE' if write else 'DRY RUN'}")
+    build_dir = build_dist.live_build()
+    if build_dir is None:
+        print("  No live build — run tools/build_dist.py first.")
+        return 1
+    with open(build_dir / "manifest.json") as f:
+        build_manifest = json.load(f)
+    files = {rel: h for rel, h in build_manifest["files"].items() if rel != SW_PATH}
+    site = build_dir / "site"
+    pages = {rel: (site / rel).read_text(encoding="utf-8") for rel in BOOKING_PAGES if (site / rel).exists()}
+    manifest = precache_manifest(files, pages)
+    print(f"  Build: {build_dir.name}  Precached: {len(manifest)}")
+    for url, rev in manifest:
+        print(f"    {rev}  {url}")
+
+    sw = render_sw(manifest)
+    sw_path = site / SW_PATH
+    stale = not sw_path.exists() or sw_path.read_text(encoding="utf-8") != sw
+    print(f"\n  {SW_PATH}: {'out of date' if stale else 'up to date'}")
+    if write and stale:
+        sw_path.write_text(sw, encoding="utf-8")
+        build_manifest["files"][SW_PATH] = build_dist.file_hash(sw.encode())
+        with open(build_dir / "manifest.json", "w") as f:
+            json.dump(build_manifest, f, indent=1, sort_keys=True)
+            f.write("\n")
+        print(f"  Rewrote {sw_path.relative_to(build_dir)}")
+    if args.check:
+        return 1 if stale else 0
+    if stale and not write:
+        print("  Dry run — re-run with --write to apply.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
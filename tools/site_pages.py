@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+site_pages.py — Shared discovery of the site's published HTML pages.
+
+The site is a flat set of *.html files at the repo root plus the
+{appliance}-repair/ subdirectories. The legacy *-repair-denver/ directories
+are 301-redirected (see _redirects) and the tools/ templates are not pages,
+so both are left out. Every published URL is the clean form without .html.
+
+Usage:
+    python3 tools/site_pages.py            # list published pages and their URLs
+"""
+
+import re
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SITE_URL = "https://elevaterepair.com"
+
+# Directories whose HTML is not served as pages.
+EXCLUDED_DIRS = {"tools", "node_modules", "dist", ".git"}
+LEGACY_DIR_SUFFIX = "-repair-denver"
+
+# Page templates that build-time stages rewrite alongside the published pages.
+TEMPLATE_PAGES = [
+    REPO_ROOT / "tools" / "problem-page-template.html",
+    REPO_ROOT / "tools" / "template_city_base.html",
+]
+
+_NOINDEX_RE = re.compile(r'<meta\s+name="robots"\s+content="[^"]*noindex', re.IGNORECASE)
+
+
+def iter_site_pages(root=REPO_ROOT):
+    """Yield every published page as a Path, in sorted order."""
+    for path in sorted(root.glob("*.html")):
+        yield path
+    for directory in sorted(p for p in root.iterdir() if p.is_dir()):
+        if directory.name in EXCLUDED_DIRS or directory.name.startswith("."):
+            continue
+        if directory.name.endswith(LEGACY_DIR_SUFFIX):
+            continue
+        yield from sorted(directory.glob("*.html"))
+
+
+def page_url(path, root=REPO_ROOT):
+    """Clean site-relative URL for a page file (index.html -> "/")."""
+    rel = Path(path).resolve().relative_to(root).as_posix()
+    if rel == "index.html":
+        return "/"
+    return "/" + re.sub(r"(?:/index)?\.html$", "", rel)
+
+
+def is_noindex(html):
+    """True if the page asks search engines not to index it."""
+    return bool(_NOINDEX_RE.search(html))
+
+
+if __name__ == "__main__":
+    count = 0
+    for path in iter_site_pages():
+        print(f"{page_url(path):55s} {path.relative_to(REPO_ROOT)}")
+        count += 1
+    print(f"\n{count} pages", file=sys.stderr)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+speculation_rules.py — Per-page speculation rules from the internal link graph.
+
+Most visits to a problem page continue to the booking page or back up to
+the appliance hub. This stage reads each page's outgoing links and ranks
+the ones a visitor is likely to follow next:
+
+    BOOKING_WEIGHT   /book, /book-online
+    PARENT_WEIGHT    the parent hub: parents.appliance_page / city_page from
+                     the --plan entry for the page, else the last breadcrumb
+                     ancestor in the page's BreadcrumbList
+    ANCESTOR_WEIGHT  the other breadcrumb ancestors (Home, Service Areas)
+  + LINK_WEIGHT      scaled by how often the page links the target
+
+Only targets the page actually links to are kept (with conservative
+eagerness, speculation starts on pointerdown/touchstart of a matching link),
+and only the top MAX_TARGETS. The top target is prerendered when it scores
+at least PRERENDER_WEIGHT (in practice: booking); the rest are prefetched:
+
+    <!-- SPECULATION_RULES -->
+    <script type="speculationrules">{"prerender": [...], "prefetch": [...]}</script>
+    <!-- /SPECULATION_RULES -->
+
+NO_SPECULATE pages (the conversion page) are never targets. The block is
+re-rendered on each run, so the stage is idempotent.
+
+Usage:
+    python3 tools/speculation_rules.py                 # dry run: list pages that would change
+    python3 tools/speculation_rules.py --write         # rewrite pages
+    python3 tools/speculation_rules.py --write --plan tools/seo_plan_authority_150.json
+    python3 tools/speculation_rules.py --check         # exit 1 if any page is out of date
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import Counter
+from urllib.parse import urlsplit
+
+import changed_pages
+from page_model import load_page, write_page
+from site_pages import REPO_ROOT, SITE_URL, iter_site_pages, page_url
+
+BOOKING_URLS = {"/book", "/book-online"}
+NO_SPECULATE = {"/thank-you"}
+
+BOOKING_WEIGHT = 1.0
+PARENT_WEIGHT = 0.8
+ANCESTOR_WEIGHT = 0.5
+LINK_WEIGHT = 0.15
+LINK_COUNT_CAP = 3
+PRERENDER_WEIGHT = 0.9
+MAX_TARGETS = 4
+EAGERNESS = "conservative"
+
+START_MARKER = "<!-- SPECULATION_RULES -->"
+END_MARKER = "<!-- /SPECULATION_RULES -->"
+
+_BLOCK_RE = re.compile(r"[ \t]*<!-- SPECULATION_RULES -->.*?<!-- /SPECULATION_RULES -->[ \t]*\n?", re.S)
+_HREF_RE = re.compile(r'<a\b[^>]*?\shref="(/[^"]*)"', re.S)
+_LD_RE = re.compile(r'<script type="application/ld\+json">(.*?)</script>', re.S)
+
+
+# ===================================================================
+# Link graph
+# ===================================================================
+
+def normalize(href):
+    """Clean site URL for an internal href (no query, fragment or .html)."""
+    path = urlsplit(href).path or "/"
+    path = re.sub(r"(?:/index)?\.html$", "", path)
+    return path.rstrip("/") or "/"
+
+
+def outgoing_links(html):
+    """Counter of clean internal URLs the page links to."""
+    return Counter(normalize(href) for href in _HREF_RE.findall(html))
+
+
+def breadcrumb_ancestors(html):
+    """URLs of the page's BreadcrumbList ancestors, nearest first."""
+    for raw in _LD_RE.findall(html):
+        try:
+            doc = json.loads(raw)
+        except json.JSONDecodeError:
+            continue
+        for node in doc if isinstance(doc, list) else doc.get("@graph", [doc]):
+            if isinstance(node, dict) and node.get("@type") == "BreadcrumbList":
+                items = sorted(node.get("itemListElement", []), key=lambda i: i.get("position", 0))
+                urls = [i["item"] for i in items if isinstance(i.get("item"), str)]
+                return [normalize(u.removeprefix(SITE_URL)) for u in reversed(urls)]
+    return []
+
+
+def plan_parents(plan_path):
+    """{page URL: [parent URLs]} from a plan's `parents` (appliance hub first)."""
+    with open(plan_path) as f:
+        plan = json.load(f)
+    entries = plan["pages"] if isinstance(plan, dict) else plan
+    parents = {}
+    for entry in entries:
+        p = entry.get("parents") or {}
+        urls = [p.get(k) for k in ("appliance_page", "brand_page", "city_page")]
+        parents[page_url(REPO_ROOT / entry["output_filename"])] = [normalize(u) for u in urls if u]
+    return parents
+
+
+def rank_targets(url, html, site_urls, parents=None):
+    """[(target URL, weight)] best first, limited to linked pages."""
+    links = outgoing_links(html)
+    ancestors = breadcrumb_ancestors(html)
+    hubs = parents if parents else ancestors[:1]
+    weights = {}
+    for target, count in links.items():
+        if target == url or target not in site_urls or target in NO_SPECULATE:
+            continue
+        if target in BOOKING_URLS:
+            weight = BOOKING_WEIGHT
+        elif target in hubs:
+            weight = PARENT_WEIGHT
+        elif target in ancestors:
+            weight = ANCESTOR_WEIGHT
+        else:
+            weight = 0.0
+        weights[target] = weight + LINK_WEIGHT * min(count, LINK_COUNT_CAP) / LINK_COUNT_CAP
+    ranked = sorted(weights.items(), key=lambda kv: (-kv[1], kv[0]))
+    return [(t, w) for t, w in ranked if w > LINK_WEIGHT][:MAX_TARGETS]
+
+
+# ===================================================================
+# Render
+# ===================================================================
+
+def render_rules(targets):
+    """The speculation rules object for ranked targets."""
+    rules = {}
+    if targets and targets[0][1] >= PRERENDER_WEIGHT:
+        rules["prerender"] = [{"source": "list", "urls": [targets[0][0]], "eagerness": EAGERNESS}]
+        targets = targets[1:]
+    if targets:
+        rules["prefetch"] = [{"source": "list", "urls": [t for t, _ in targets], "eagerness": EAGERNESS}]
+    return rules
+
+
+def transform_page(rel_path, html, site_urls, parents=None):
+    """Apply the stage to one page. Returns (new_html, report_entry)."""
+    url = page_url(REPO_ROOT / rel_path)
+    new_html = _BLOCK_RE.sub("", html)
+    targets = rank_targets(url, new_html, site_urls, parents)
+    entry = {"page": rel_path, "targets": [[t, round(w, 3)] for t, w in targets]}
+    head_end = re.search(r"[ \t]*</head>", new_html)
+    if targets and head_end:
+        indent = re.match(r"[ \t]*", head_end.group(0)).group(0) + "    "
+        script = json.dumps(render_rules(targets), separators=(",", ":"))
+        block = (f"{indent}{START_MARKER}\n"
+                 f'{indent}<script type="speculationrules">{script}</script>\n'
+                 f"{indent}{END_MARKER}\n")
+        new_html = new_html[:head_end.start()] + block + new_html[head_end.start():]
+    entry["action"] = "unchanged" if new_html == html else ("updated" if targets else "rules removed")
+    return new_html, entry
+
+
+def site_url_set():
+    return {page_url(p) for p in iter_site_pages()}
+
+
+# ===================================================================
+# Main
+# ===================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Emit per-page speculation rules from the internal link graph")
+    parser.add_argument("pages", nargs="*", help="Pages to process (default: every published page)")
+    parser.add_argument("--write", action="store_true", help="Rewrite pages (default: dry run)")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if any page is out of date (implies dry run)")
+    parser.add_argument("--plan", default=None, metavar="PATH",
+                        help="Plan JSON whose `parents` name each generated page's parent hub")
+    parser.add_argument("--report", default=None, metavar="PATH", help="Write the per-page report as JSON")
+    changed_pages.add_arguments(parser)
+    args = parser.parse_args()
+    write = args.write and not args.check
+
+    paths = [REPO_ROOT / p for p in args.pages] if args.pages else list(iter_site_pages())
+    paths = changed_pages.select(args, paths)
+    site_urls = site_url_set()
+    parents = plan_parents(args.plan) if args.plan else {}
+
+    print("=" * 60)
+    print("  Elevate Repair — Speculation Rules")
+    print("=" * 60)
+    print(f"  Mode: {'WRITE' if write else 'DRY RUN'}")
+    if args.plan:
+        print(f"  Plan parents: {len(parents)} pages")
+
+    report, counts = [], {}
+    for path in paths:
+        rel = path.resolve().relative_to(REPO_ROOT).as_posix()
+        html = load_page(path).html
+        new_html, entry = transform_page(rel, html, site_urls, parents.get(page_url(path)))
+        report.append(entry)
+        counts[entry["action"]] = counts.get(entry["action"], 0) + 1
+        if new_html != html:
+            if write:
+                write_page(path, new_html)
+            print(f"    ~ {rel}  [{', '.join(t for t, _ in entry['targets']) or 'none'}]")
+
+    print(f"\n  Files: {len(report)}")
+    for action, n in sorted(counts.items()):
+        print(f"    {action:26s} {n}")
+    changed = counts.get("updated", 0) + counts.get("rules removed", 0)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n  Report written to {args.report}")
+    if args.check:
+        return 1 if changed else 0
+    if changed and not write:
+        print("\n  Dry run — re-run with --write to apply.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""asset_graph.py keeps the lightest adequate duplicate and the size variants of used images.
+
+Run from the repo root:
+    python3 -m unittest discover tools/tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import asset_graph  # noqa: E402
+
+
+def fingerprint(rel, dims, size):
+    return {"rel": rel, "sha1": rel, "bytes": size, "dims": dims, "phash": 0, "color": (0.0, 0.0, 0.0)}
+
+
+class ChooseKeeperTest(unittest.TestCase):
+    def test_smaller_file_wins_when_wide_enough(self):
+        cluster = [fingerprint("a/oven.jpeg", (1024, 768), 89_700),
+                   fingerprint("b/oven.webp", (1600, 1200), 135_200)]
+        self.assertEqual(asset_graph.choose_keeper(cluster, {}), "a/oven.jpeg")
+
+    def test_resolution_decides_when_smaller_file_would_be_upscaled(self):
+        cluster = [fingerprint("a/oven.jpeg", (400, 300), 20_000),
+                   fingerprint("b/oven.webp", (1600, 1200), 135_200)]
+        self.assertEqual(asset_graph.choose_keeper(cluster, {}), "b/oven.webp")
+
+
+class UnusedImagesTest(unittest.TestCase):
+    def test_size_variant_of_referenced_image_is_used(self):
+        files = ["assets/hero-desktop.webp", "assets/hero-mobile.webp", "assets/orphan.webp"]
+        graph = {"assets/hero-desktop.webp": {"index.html": 1}}
+        _, unused, _ = asset_graph.plan(graph, set(), [], files)
+        self.assertEqual(unused, ["assets/orphan.webp"])
+
+    def test_city_banners_are_kept(self):
+        files = ["assets/images/cities banner/aurora-desktop.webp",
+                 "assets/images/cities banner/aurora-mobile.webp"]
+        _, unused, _ = asset_graph.plan({}, set(), [], files)
+        self.assertEqual(unused, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
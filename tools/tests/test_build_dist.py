@@ -0,0 +1,38 @@
+"""build_dist.py publishes what the site serves, dotfiles included.
+
+Run from the repo root:
+    python3 -m unittest discover tools/tests
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import build_dist  # noqa: E402
+from site_pages import REPO_ROOT  # noqa: E402
+
+
+class PublishedDotfilesTest(unittest.TestCase):
+    def test_source_files_include_htaccess(self):
+        files = build_dist.source_files()
+        self.assertIn(".htaccess", files)
+        self.assertFalse([rel for rel in files if rel.startswith(".") and rel not in build_dist.PUBLISHED_DOTFILES])
+
+    def test_dist_htaccess_matches_source(self):
+        # Build into a scratch directory: the real dist symlink and .dist/ builds stay untouched.
+        contents = {rel: REPO_ROOT / rel for rel in build_dist.source_files()}
+        files = {rel: build_dist.file_hash(path.read_bytes()) for rel, path in contents.items()}
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(build_dist, "BUILDS_DIR", Path(tmp)):
+            build_dir, reused = build_dist.write_build(contents, files)
+            self.assertFalse(reused)
+            published = build_dir / "site" / ".htaccess"
+            self.assertTrue(published.is_file(), "dist/.htaccess is missing")
+            self.assertEqual(published.read_bytes(), (REPO_ROOT / ".htaccess").read_bytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
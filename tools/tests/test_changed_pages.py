@@ -0,0 +1,42 @@
+"""changed_pages.py selects the pages that reference a changed asset.
+
+Run from the repo root:
+    python3 -m unittest discover tools/tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import changed_pages  # noqa: E402
+from site_pages import REPO_ROOT  # noqa: E402
+
+BANNER = "assets/images/cities banner/aurora-desktop.webp"
+
+
+class AssetDependencyTest(unittest.TestCase):
+    def matches(self, files, html, rel="page.html"):
+        return any(test(rel, html) for test in changed_pages.dependency_tests(files))
+
+    def test_url_encoded_reference_to_path_with_space(self):
+        html = '<img src="/assets/images/cities%20banner/aurora-desktop.webp" alt="">'
+        self.assertTrue(self.matches([BANNER], html))
+
+    def test_raw_reference_to_path_with_space(self):
+        html = "<div style=\"background: url('/assets/images/cities banner/aurora-desktop.webp')\"></div>"
+        self.assertTrue(self.matches([BANNER], html))
+
+    def test_other_asset_not_matched(self):
+        html = '<img src="/assets/images/cities%20banner/arvada-desktop.webp" alt="">'
+        self.assertFalse(self.matches([BANNER], html))
+
+    def test_site_page_using_banner_is_affected(self):
+        page = REPO_ROOT / "central-park.html"
+        self.assertIn("cities%20banner/aurora-desktop.webp", page.read_text(encoding="utf-8"))
+        self.assertEqual(changed_pages.affected([page], [BANNER]), [page])
+
+
+if __name__ == "__main__":
+    unittest.main()
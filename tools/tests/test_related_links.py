@@ -0,0 +1,47 @@
+"""related_links.py fills same-city siblings and the parent hub before other pages.
+
+Run from the repo root:
+    python3 -m unittest discover tools/tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import cannibalization  # noqa: E402
+import related_links  # noqa: E402
+from site_pages import REPO_ROOT  # noqa: E402
+
+PAGE = "denver-dryer-not-heating.html"
+HUB = "/dryer-repair-denver"
+
+
+class RelatedLinksTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        places = cannibalization.load_places()
+        docs = cannibalization.page_documents(places)
+        data = related_links.compute(docs, places)
+        cls.links = [url for url, _ in related_links.related_for(data)[PAGE]]
+
+    def test_same_city_siblings_come_first(self):
+        siblings = sorted("/" + p.stem for p in REPO_ROOT.glob("denver-dryer-*.html") if p.name != PAGE)
+        self.assertTrue(siblings)
+        self.assertEqual(sorted(self.links[:len(siblings)]), siblings)
+
+    def test_parent_hub_is_linked(self):
+        self.assertIn(HUB, self.links)
+
+    def test_plan_parents_are_linked(self):
+        places = cannibalization.load_places()
+        docs = cannibalization.page_documents(places)
+        parents = {"/" + PAGE.removesuffix(".html"): [HUB, "/lg-appliance-repair-denver"]}
+        data = related_links.compute(docs, places, parents=parents)
+        links = [url for url, _ in related_links.related_for(data)[PAGE]]
+        self.assertIn("/lg-appliance-repair-denver", links)
+
+
+if __name__ == "__main__":
+    unittest.main()